@@ -0,0 +1,136 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from deployfilegen.config.options import DEFAULT_DISCOVER_DEPTH
+from deployfilegen.utils.logger import logger
+
+# Directories never descended into: dependencies, VCS data, virtualenvs and build output.
+# Hidden directories (.git, .venv, .next, .cache, ...) are skipped as well.
+PRUNED_DIRS = frozenset({
+    "node_modules", "venv", "env", "dist", "build", "out", "coverage",
+    "__pycache__", "site-packages", "bower_components", "vendor",
+})
+
+# package.json scripts that mark a runnable app; workspace libraries usually only build
+APP_SCRIPTS = ("dev", "start")
+
+# Compose service names already used by the generated files
+RESERVED_SERVICE_NAMES = ("backend", "frontend", "db", "proxy")
+
+
+@dataclass(frozen=True)
+class ServiceLayout:
+    """Service directories found under a project root, sorted by path."""
+    root: Path
+    django: Tuple[Path, ...] = ()
+    node: Tuple[Path, ...] = ()
+    # Every manage.py / package.json looked at, services or not (cache inputs)
+    manifests: Tuple[Path, ...] = ()
+
+
+def _is_node_app(package_json: str) -> bool:
+    try:
+        with open(package_json, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {package_json}: {e}")
+        return False
+    if not isinstance(data, dict) or "workspaces" in data:
+        # A workspace root: its packages are the services
+        return False
+    scripts = data.get("scripts")
+    return isinstance(scripts, dict) and any(name in scripts for name in APP_SCRIPTS)
+
+
+def _scan(directory: str) -> Tuple[str, List[str]]:
+    """
+    Lists one directory. Returns (kind, subdirectories) where kind is
+    'django', 'node', 'package' (a non-app package.json) or ''.
+    Service directories are not descended into.
+    """
+    if os.path.isfile(os.path.join(directory, "manage.py")):
+        return "django", []
+    try:
+        with os.scandir(directory) as entries:
+            # d_type from the listing: no stat() per entry
+            dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return "", []
+    subdirs = [entry.path for entry in dirs if entry.name[0] != "." and entry.name not in PRUNED_DIRS]
+    package_json = os.path.join(directory, "package.json")
+    if os.path.isfile(package_json):
+        if _is_node_app(package_json):
+            return "node", []
+        return "package", subdirs
+    return "", subdirs
+
+
+def discover_services(project_root: Path, max_depth: int = DEFAULT_DISCOVER_DEPTH) -> ServiceLayout:
+    """
+    Finds every Django service (a directory with manage.py) and Node app (a
+    package.json with a dev or start script) up to max_depth levels below
+    project_root. The root itself is never a service.
+
+    The tree is walked breadth-first with os.scandir, one listing per
+    directory; PRUNED_DIRS, hidden directories and the inside of services
+    are never listed, which keeps dependency trees out of the walk.
+    """
+    django: List[str] = []
+    node: List[str] = []
+    manifests: List[str] = []
+    try:
+        with os.scandir(project_root) as entries:
+            level = [entry.path for entry in entries
+                     if entry.is_dir(follow_symlinks=False)
+                     and entry.name[0] != "." and entry.name not in PRUNED_DIRS]
+    except OSError:
+        level = []
+    for _depth in range(max_depth):
+        next_level = []
+        for directory in level:
+            kind, subdirs = _scan(directory)
+            if kind == "django":
+                django.append(directory)
+                manifests.append(os.path.join(directory, "manage.py"))
+            elif kind:
+                if kind == "node":
+                    node.append(directory)
+                manifests.append(os.path.join(directory, "package.json"))
+            next_level.extend(subdirs)
+        level = next_level
+
+    return ServiceLayout(
+        root=project_root,
+        django=tuple(Path(path) for path in sorted(django)),
+        node=tuple(Path(path) for path in sorted(node)),
+        manifests=tuple(Path(path) for path in sorted(manifests)),
+    )
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9_-]+", "-", text.lower()).strip("-_") or "service"
+
+
+def service_names(paths: Iterable[Path], project_root: Path,
+                  reserved: Iterable[str] = RESERVED_SERVICE_NAMES) -> Dict[Path, str]:
+    """
+    Compose service names for service directories: the directory name, or
+    the whole relative path joined with '-' when that is taken.
+    """
+    taken = set(reserved)
+    names = {}
+    for path in paths:
+        parts = path.relative_to(project_root).parts
+        name = _slug(parts[-1])
+        if name in taken:
+            name = _slug("-".join(parts))
+        base, counter = name, 2
+        while name in taken:
+            name, counter = f"{base}-{counter}", counter + 1
+        taken.add(name)
+        names[path] = name
+    return names
@@ -0,0 +1,217 @@
+import fnmatch
+import os
+import shlex
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from deployfilegen.exceptions import DeployFileGenError
+
+# Approximate uncompressed sizes (MB) of the base images the generators use.
+# Used for estimates only; pass a built image to the report for real numbers.
+BASE_IMAGE_SIZES_MB = (
+    ("python:*-slim*", 125),
+    ("python:*-alpine*", 55),
+    ("gcr.io/distroless/python3-*", 53),
+    ("node:*-alpine*", 160),
+    ("node:*-slim*", 230),
+    ("nginxinc/nginx-unprivileged:*alpine*", 50),
+)
+
+# Instructions that add a filesystem layer to the image.
+LAYER_INSTRUCTIONS = ("RUN", "COPY", "ADD", "WORKDIR")
+
+
+@dataclass(frozen=True)
+class Instruction:
+    keyword: str
+    args: str
+
+
+@dataclass
+class Stage:
+    base: str
+    name: Optional[str] = None
+    instructions: List[Instruction] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class LayerEstimate:
+    instruction: str
+    # Bytes added by the layer, None when it cannot be known without building
+    size_bytes: Optional[int]
+    note: str = ""
+
+
+@dataclass(frozen=True)
+class ImageEstimate:
+    dockerfile: str
+    base: str
+    base_mb: Optional[int]
+    layers: Tuple[LayerEstimate, ...]
+
+    @property
+    def known_bytes(self) -> int:
+        known = sum(layer.size_bytes or 0 for layer in self.layers)
+        return known + (self.base_mb or 0) * 1024 * 1024
+
+    @property
+    def unknown_layers(self) -> int:
+        return sum(1 for layer in self.layers if layer.size_bytes is None)
+
+
+def parse_dockerfile(text: str) -> List[Stage]:
+    """Splits a Dockerfile into stages, joining continuation lines and dropping comments."""
+    stages: List[Stage] = []
+    logical = ""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.endswith("\\"):
+            logical += line[:-1].strip() + " "
+            continue
+        logical += line
+        keyword, _, args = logical.partition(" ")
+        keyword, args = keyword.upper(), args.strip()
+        logical = ""
+        if keyword == "FROM":
+            parts = args.split()
+            name = parts[2] if len(parts) >= 3 and parts[1].lower() == "as" else None
+            stages.append(Stage(base=parts[0], name=name))
+        elif stages:
+            stages[-1].instructions.append(Instruction(keyword, args))
+    return stages
+
+
+def base_image_size_mb(image: str) -> Optional[int]:
+    for pattern, size in BASE_IMAGE_SIZES_MB:
+        if fnmatch.fnmatch(image, pattern):
+            return size
+    return None
+
+
+def read_dockerignore(context: Path) -> List[str]:
+    try:
+        lines = (context / ".dockerignore").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    return [line.strip().rstrip("/") for line in lines if line.strip() and not line.startswith("#")]
+
+
+def _ignored(relpath: str, patterns: List[str]) -> bool:
+    parts = relpath.split("/")
+    for pattern in patterns:
+        # A pattern matches the path itself or any parent directory
+        for depth in range(1, len(parts) + 1):
+            if fnmatch.fnmatch("/".join(parts[:depth]), pattern):
+                return True
+        if "/" not in pattern and fnmatch.fnmatch(parts[-1], pattern):
+            return True
+    return False
+
+
+def context_size(context: Path, sources: List[str], ignore: List[str]) -> int:
+    """Bytes sent for COPY sources from the build context, honouring .dockerignore."""
+    total = 0
+    for source in sources:
+        root = (context / source).resolve()
+        if root.is_file():
+            if not _ignored(os.path.relpath(root, context).replace(os.sep, "/"), ignore):
+                total += root.stat().st_size
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, context).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir + "/"
+            dirnames[:] = [d for d in dirnames if not _ignored(rel_dir + d, ignore)]
+            for filename in filenames:
+                if not _ignored(rel_dir + filename, ignore):
+                    try:
+                        total += os.stat(os.path.join(dirpath, filename)).st_size
+                    except OSError:
+                        pass
+    return total
+
+
+def _copy_sources(args: str) -> Tuple[List[str], Optional[str]]:
+    """Returns (sources, --from stage) for a COPY/ADD instruction."""
+    tokens = shlex.split(args)
+    from_stage = None
+    positional = []
+    for token in tokens:
+        if token.startswith("--from="):
+            from_stage = token.split("=", 1)[1]
+        elif not token.startswith("--"):
+            positional.append(token)
+    return positional[:-1], from_stage
+
+
+def estimate_image(dockerfile: Path) -> ImageEstimate:
+    """
+    Estimates the layers of the final stage of a generated Dockerfile:
+    base image size from a table, COPY sizes from the build context, and
+    RUN/COPY --from layers marked unknown (they depend on the build).
+    """
+    try:
+        text = dockerfile.read_text(encoding="utf-8")
+    except OSError as e:
+        raise DeployFileGenError(f"Could not read {dockerfile}: {e}")
+    stages = parse_dockerfile(text)
+    if not stages:
+        raise DeployFileGenError(f"No FROM instruction in {dockerfile}")
+
+    context = dockerfile.parent.resolve()
+    ignore = read_dockerignore(context)
+    final = stages[-1]
+    layers = []
+    for instruction in final.instructions:
+        if instruction.keyword not in LAYER_INSTRUCTIONS:
+            continue
+        label = f"{instruction.keyword} {instruction.args}"
+        if instruction.keyword in ("COPY", "ADD"):
+            sources, from_stage = _copy_sources(instruction.args)
+            if from_stage:
+                layers.append(LayerEstimate(label, None, f"from stage '{from_stage}'"))
+            else:
+                layers.append(LayerEstimate(label, context_size(context, sources, ignore), "build context"))
+        elif instruction.keyword == "WORKDIR":
+            layers.append(LayerEstimate(label, 0))
+        else:
+            layers.append(LayerEstimate(label, None, "depends on the build"))
+
+    return ImageEstimate(
+        dockerfile=dockerfile.as_posix(),
+        base=final.base,
+        base_mb=base_image_size_mb(final.base),
+        layers=tuple(layers),
+    )
+
+
+def format_size(size_bytes: Optional[int]) -> str:
+    if size_bytes is None:
+        return "?"
+    size = float(size_bytes)
+    for unit in ("B", "kB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def image_history(image: str) -> List[Tuple[str, str]]:
+    """Actual layer sizes of a built image: [(size, created_by)], newest first."""
+    try:
+        result = subprocess.run(
+            ["docker", "image", "history", "--no-trunc", "--format", "{{.Size}}\t{{.CreatedBy}}", image],
+            capture_output=True, text=True, check=True,
+        )
+    except FileNotFoundError:
+        raise DeployFileGenError("docker is not installed; run the report without --image for estimates.")
+    except subprocess.CalledProcessError as e:
+        raise DeployFileGenError(f"docker image history failed for {image}: {e.stderr.strip()}")
+    rows = []
+    for line in result.stdout.splitlines():
+        size, _, created_by = line.partition("\t")
+        rows.append((size, created_by))
+    return rows
@@ -0,0 +1,511 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from deployfilegen.analyzer.detector import detect_django_backend, detect_react_frontend
+from deployfilegen.analyzer.discovery import ServiceLayout, discover_services, service_names
+from deployfilegen.analyzer.requirements import analyze_toolchain
+from deployfilegen.analyzer.runtimes import (
+    DEFAULT_NODE_VERSION,
+    DEFAULT_PYTHON_VERSION,
+    NODE_VERSION_FILES,
+    PYTHON_VERSION_FILES,
+    detect_native_modules,
+    detect_node_version,
+    detect_python_version,
+    package_section,
+)
+from deployfilegen.config.options import DEFAULT_DISCOVER_DEPTH
+from deployfilegen.exceptions import DeployFileGenError
+from deployfilegen.utils.logger import logger
+
+DJANGO_SETTINGS_PATTERN = re.compile(
+    r"os\.environ\.setdefault\(['\"]DJANGO_SETTINGS_MODULE['\"],\s*['\"](.+?)\.settings['\"]\)"
+)
+
+# Files read when analyzing one service, relative to its directory.
+# Version pins are also read from the directory above (see analyzer.runtimes).
+BACKEND_INPUTS = (
+    "manage.py",
+    "requirements.txt",
+    "pyproject.toml",
+    "poetry.lock",
+    "uv.lock",
+    "Pipfile.lock",
+    ".python-version",
+    "runtime.txt",
+    "*/asgi.py",
+    "*/settings.py",
+    "*/settings/*.py",
+)
+FRONTEND_INPUTS = (
+    "package.json",
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lock",
+    "bun.lockb",
+    ".npmrc",
+    ".yarnrc.yml",
+    "next.config.*",
+    ".nvmrc",
+    ".node-version",
+)
+
+# Project-relative files whose content determines the analysis result.
+# The generation cache keys on these, so anything analysis reads must be listed here.
+# Entries may contain glob wildcards.
+PROFILE_INPUTS = (
+    *(f"backend/{name}" for name in BACKEND_INPUTS),
+    *PYTHON_VERSION_FILES,
+    *(f"frontend/{name}" for name in FRONTEND_INPUTS),
+    *NODE_VERSION_FILES,
+    ".env",
+    "backend/.env",
+    "frontend/.env",
+)
+
+# Lockfile -> package manager, in detection priority order.
+LOCKFILES = (
+    ("pnpm-lock.yaml", "pnpm"),
+    ("yarn.lock", "yarn"),
+    ("bun.lock", "bun"),
+    ("bun.lockb", "bun"),
+    ("package-lock.json", "npm"),
+    ("npm-shrinkwrap.json", "npm"),
+)
+
+# Requirements that mean the project is served over ASGI.
+ASGI_PACKAGES = ("channels", "uvicorn", "uvicorn-worker", "daphne")
+
+# Static files storage backends named in Django settings (STORAGES or STATICFILES_STORAGE).
+STATIC_STORAGE_PATTERN = re.compile(r"['\"]((?:whitenoise|django\.contrib\.staticfiles)\.storage\.\w+)['\"]")
+
+# Environment variables settings read without a default: os.environ["X"], and
+# django-environ env("X") / env.int("X") or python-decouple config("X") called
+# with the name only. env.db() reads DATABASE_URL.
+REQUIRED_ENV_PATTERN = re.compile(
+    r"os\.environ\[\s*['\"](\w+)['\"]\s*\]"
+    r"|\b(?:env|config)(?:\.\w+)?\(\s*['\"](\w+)['\"]\s*\)"
+    r"|\benv\.db(?:_url)?\(\s*\)"
+)
+
+# Package manager config files that must be present at install time (COPY'd with the lockfile).
+INSTALL_CONFIG_FILES = (".npmrc", ".yarnrc.yml")
+
+# Next.js config files, in the order Next resolves them.
+NEXT_CONFIG_FILES = ("next.config.js", "next.config.mjs", "next.config.ts", "next.config.cjs")
+NEXT_STANDALONE_PATTERN = re.compile(r"output\s*:\s*['\"`]standalone['\"`]")
+
+
+@dataclass(frozen=True)
+class BackendProfile:
+    """Everything the generators need to know about the Django backend."""
+    path: Optional[Path]
+    project_name: str = "config"
+    # 'wsgi' or 'asgi'
+    server: str = "wsgi"
+    # Normalized distribution names from requirements.txt
+    requirements: Tuple[str, ...] = ()
+    # Debian packages for the builder / runner stages (see analyzer.requirements).
+    # None when the dependencies were not analyzed: images keep gcc/libpq.
+    build_packages: Optional[Tuple[str, ...]] = None
+    runtime_packages: Optional[Tuple[str, ...]] = None
+    # Static files storage backend from settings, e.g. whitenoise.storage.CompressedManifestStaticFilesStorage
+    static_storage: Optional[str] = None
+    # Environment variables the settings read without a default (needed to import them)
+    settings_env: Tuple[str, ...] = ()
+    # Python minor version for the python:<version>-slim-bookworm images
+    python_version: str = DEFAULT_PYTHON_VERSION
+    # Compose service name
+    service: str = "backend"
+
+
+@dataclass(frozen=True)
+class FrontendProfile:
+    """Everything the generators need to know about the JS frontend."""
+    path: Optional[Path]
+    framework: str = "unknown"
+    dev_cmd: str = "dev"
+    dev_port: int = 3000
+    scripts: Tuple[str, ...] = ()
+    # Package manager: 'npm', 'pnpm', 'yarn' (classic), 'yarn-berry' or 'bun'
+    package_manager: str = "npm"
+    lockfile: Optional[str] = None
+    install_config_files: Tuple[str, ...] = ()
+    # Next.js only: next.config sets output: 'standalone'
+    next_standalone: bool = False
+    # Node.js major for the node:<version> images
+    node_version: str = DEFAULT_NODE_VERSION
+    # Native npm modules (see analyzer.runtimes); when present the images use Debian-slim
+    native_modules: Tuple[str, ...] = ()
+    # Compose service name
+    service: str = "frontend"
+
+    @property
+    def node_variant(self) -> str:
+        """'slim' (glibc) when native modules are present, otherwise 'alpine'."""
+        return "slim" if self.native_modules else "alpine"
+
+
+@dataclass(frozen=True)
+class ProjectProfile:
+    """
+    Immutable result of analyzing a project once.
+    Generators read from this instead of re-parsing manifests.
+    """
+    root: Path
+    backend: Optional[BackendProfile] = None
+    frontend: Optional[FrontendProfile] = None
+    env_files: Tuple[Path, ...] = ()
+    # Monorepos: services discovered outside backend/ and frontend/, each with its own image
+    extra_backends: Tuple[BackendProfile, ...] = ()
+    extra_frontends: Tuple[FrontendProfile, ...] = ()
+
+    @property
+    def backends(self) -> Tuple[BackendProfile, ...]:
+        return ((self.backend,) if self.backend else ()) + self.extra_backends
+
+    @property
+    def frontends(self) -> Tuple[FrontendProfile, ...]:
+        return ((self.frontend,) if self.frontend else ()) + self.extra_frontends
+
+
+def parse_django_project_name(manage_py_content: str) -> Optional[str]:
+    """Extracts the project package from DJANGO_SETTINGS_MODULE in manage.py content."""
+    match = DJANGO_SETTINGS_PATTERN.search(manage_py_content)
+    return match.group(1) if match else None
+
+
+def read_django_project_name(manage_py_path: Path) -> str:
+    """
+    Reads manage.py to find the Django project name from DJANGO_SETTINGS_MODULE.
+    Defaults to 'config' if not found.
+    """
+    try:
+        project_name = parse_django_project_name(manage_py_path.read_text(encoding="utf-8"))
+        if project_name:
+            logger.info(f"Detected Django project name: {project_name}")
+            return project_name
+    except Exception as e:
+        logger.warning(f"Failed to parse manage.py: {e}")
+
+    logger.warning("Could not detect Django project name. Defaulting to 'config'.")
+    return "config"
+
+
+def normalize_requirement_name(name: str) -> str:
+    """PEP 503 style normalization: lower case, runs of -_. become '-'."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirements(content: str) -> Tuple[str, ...]:
+    """
+    Extracts normalized distribution names from requirements.txt content.
+    Options (-r, -e, --hash ...), comments, URLs and local paths are skipped.
+    """
+    names = []
+    for raw_line in content.splitlines():
+        line = raw_line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-", ".", "/")) or "://" in line and "@" not in line:
+            continue
+        match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", line)
+        if match:
+            names.append(normalize_requirement_name(match.group(0)))
+    return tuple(dict.fromkeys(names))
+
+
+def read_requirements(requirements_path: Path) -> Tuple[str, ...]:
+    """Reads requirements.txt; returns () if it is missing or unreadable."""
+    try:
+        return parse_requirements(requirements_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return ()
+    except Exception as e:
+        logger.warning(f"Could not read {requirements_path}: {e}")
+        return ()
+
+
+def detect_server_interface(backend_path: Path, project_name: str, requirements: Tuple[str, ...]) -> str:
+    """
+    Returns 'asgi' when the project ships an asgi.py and depends on an ASGI
+    server or Channels; otherwise 'wsgi'. Django generates asgi.py for every
+    project, so the file alone is not enough.
+    """
+    if not any(pkg in requirements for pkg in ASGI_PACKAGES):
+        return "wsgi"
+    asgi_py = backend_path.joinpath(*project_name.split("."), "asgi.py")
+    if asgi_py.is_file():
+        logger.info("Detected ASGI application (asgi.py + async server in requirements)")
+        return "asgi"
+    logger.warning(f"ASGI packages found in requirements but {asgi_py} is missing; using WSGI.")
+    return "wsgi"
+
+
+def analyze_settings(backend_path: Path, project_name: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """
+    Reads the project's settings (settings.py or a settings/ package) and
+    returns (static files storage backend or None, environment variables read
+    without a default, in order of appearance).
+    """
+    storage = None
+    env_names = []
+    try:
+        package = backend_path.joinpath(*project_name.split("."))
+        candidates = [package / "settings.py"] + sorted((package / "settings").glob("*.py"))
+        for settings_path in candidates:
+            try:
+                source = settings_path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            match = STATIC_STORAGE_PATTERN.search(source)
+            if match and storage is None:
+                logger.info(f"Detected static files storage: {match.group(1)}")
+                storage = match.group(1)
+            for match in REQUIRED_ENV_PATTERN.finditer(source):
+                env_names.append(match.group(1) or match.group(2) or "DATABASE_URL")
+    except Exception as e:
+        logger.warning(f"Failed to read Django settings: {e}")
+    return storage, tuple(dict.fromkeys(env_names))
+
+
+def read_package_json(frontend_path: Path) -> Optional[dict]:
+    """Reads frontend/package.json. Returns None (with a warning) if it is not a parsable JSON object."""
+    try:
+        data = json.loads((frontend_path / "package.json").read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Could not read package.json: {e}")
+        return None
+    if not isinstance(data, dict):
+        logger.warning(f"Ignoring package.json: expected a JSON object, got {type(data).__name__}")
+        return None
+    return data
+
+
+def frontend_info_from_package(pkg_json: Optional[dict],
+                               override_port: int = None,
+                               override_cmd: str = None) -> dict:
+    """
+    Detects the frontend framework from parsed package.json with support for explicit overrides.
+    Returns a dict with: framework, dev_cmd, dev_port, scripts
+    """
+    result = {"framework": "unknown", "dev_cmd": override_cmd or "dev",
+              "dev_port": override_port or 3000, "scripts": ()}
+    if pkg_json is None:
+        return result
+
+    all_deps = {}
+    all_deps.update(package_section(pkg_json, "dependencies"))
+    all_deps.update(package_section(pkg_json, "devDependencies"))
+    scripts = package_section(pkg_json, "scripts")
+    result["scripts"] = tuple(scripts)
+
+    # Detect framework
+    if "vite" in all_deps:
+        result["framework"] = "vite"
+        result["dev_port"] = override_port or 5173
+        result["dev_cmd"] = override_cmd or "dev"
+        logger.info("Detected Vite frontend framework")
+    elif "next" in all_deps:
+        result["framework"] = "next"
+        result["dev_port"] = override_port or 3000
+        result["dev_cmd"] = override_cmd or "dev"
+        logger.info("Detected Next.js frontend framework")
+    elif "react-scripts" in all_deps:
+        result["framework"] = "cra"
+        result["dev_port"] = override_port or 3000
+        result["dev_cmd"] = override_cmd or "start"
+        logger.info("Detected Create React App frontend framework")
+    else:
+        # Fallback: check scripts logic only if no override provided
+        if not override_cmd:
+            if "dev" in scripts:
+                result["dev_cmd"] = "dev"
+            elif "start" in scripts:
+                result["dev_cmd"] = "start"
+
+    # VALIDATION: Check if the final command exists in scripts
+    # We check both the detected and the overridden command
+    final_cmd = result["dev_cmd"]
+    if final_cmd not in scripts:
+        logger.warning(f"⚠️  Command '{final_cmd}' NOT found in package.json scripts! The container might fail to start.")
+        logger.warning(f"Available scripts: {', '.join(scripts.keys())}")
+
+    return result
+
+
+def detect_package_manager(frontend_path: Optional[Path], pkg_json: Optional[dict] = None) -> dict:
+    """
+    Detects the package manager from the lockfile in frontend_path, falling back
+    to the package.json "packageManager" field and finally to npm.
+    Returns a dict with: package_manager, lockfile, install_config_files
+    """
+    result = {"package_manager": "npm", "lockfile": None, "install_config_files": ()}
+    if frontend_path is None:
+        return result
+
+    try:
+        # One directory listing instead of a stat() per candidate file.
+        present = set(os.listdir(frontend_path))
+    except Exception as e:
+        logger.warning(f"Could not list {frontend_path}: {e}")
+        present = set()
+
+    declared = (pkg_json or {}).get("packageManager")
+    declared = (declared if isinstance(declared, str) else "").split("@")
+    declared_name = declared[0]
+    declared_major = declared[1].split(".")[0] if len(declared) > 1 else ""
+
+    for lockfile, manager in LOCKFILES:
+        if lockfile in present:
+            result["package_manager"] = manager
+            result["lockfile"] = lockfile
+            break
+    else:
+        if declared_name in ("npm", "pnpm", "yarn", "bun"):
+            result["package_manager"] = declared_name
+        logger.warning(f"No lockfile found in {frontend_path.name}/; installs will not be reproducible.")
+
+    result["install_config_files"] = tuple(
+        name for name in INSTALL_CONFIG_FILES if name in present
+    )
+
+    # Yarn 2+ ("berry") is identified by .yarnrc.yml or an explicit packageManager version.
+    if result["package_manager"] == "yarn" and (
+        ".yarnrc.yml" in result["install_config_files"]
+        or (declared_name == "yarn" and declared_major.isdigit() and int(declared_major) >= 2)
+    ):
+        result["package_manager"] = "yarn-berry"
+
+    logger.info(f"Detected package manager: {result['package_manager']}"
+                + (f" ({result['lockfile']})" if result["lockfile"] else ""))
+    return result
+
+
+def detect_next_standalone(frontend_path: Optional[Path]) -> bool:
+    """
+    Returns True when the Next.js config enables output: 'standalone',
+    which the production Dockerfile relies on.
+    """
+    if frontend_path is None:
+        return False
+    for name in NEXT_CONFIG_FILES:
+        config_path = frontend_path / name
+        try:
+            source = config_path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        if NEXT_STANDALONE_PATTERN.search(source):
+            return True
+        logger.warning(f"{name} does not set output: 'standalone'; the production image needs it. "
+                       "Add it to your Next.js config.")
+        return False
+    logger.warning("No next.config found. Create one with output: 'standalone' for the production image.")
+    return False
+
+
+def analyze_backend(backend_path: Optional[Path], override_project_name: str = None,
+                    service: str = "backend") -> BackendProfile:
+    """Builds the backend profile, reading manage.py only when no override is given."""
+    if backend_path is None:
+        return BackendProfile(path=None, project_name=override_project_name or "config", service=service)
+    project_name = override_project_name or read_django_project_name(backend_path / "manage.py")
+    requirements = read_requirements(backend_path / "requirements.txt")
+    toolchain = analyze_toolchain(backend_path)
+    static_storage, settings_env = analyze_settings(backend_path, project_name)
+    return BackendProfile(
+        path=backend_path,
+        project_name=project_name,
+        server=detect_server_interface(backend_path, project_name, requirements),
+        requirements=requirements,
+        build_packages=toolchain.build_packages,
+        runtime_packages=toolchain.runtime_packages,
+        python_version=detect_python_version(backend_path),
+        static_storage=static_storage,
+        settings_env=settings_env,
+        service=service,
+    )
+
+
+def analyze_frontend(frontend_path: Optional[Path],
+                     override_port: int = None,
+                     override_cmd: str = None,
+                     service: str = "frontend") -> FrontendProfile:
+    """Builds the frontend profile from a single read of package.json."""
+    pkg_json = read_package_json(frontend_path) if frontend_path else None
+    info = frontend_info_from_package(pkg_json, override_port, override_cmd)
+    info.update(detect_package_manager(frontend_path, pkg_json))
+    if info["framework"] == "next":
+        info["next_standalone"] = detect_next_standalone(frontend_path)
+    info["node_version"] = detect_node_version(frontend_path, pkg_json)
+    info["native_modules"] = detect_native_modules(frontend_path, pkg_json, info["lockfile"])
+    return FrontendProfile(path=frontend_path, service=service, **info)
+
+
+def _extra_services(project_root: Path, layout: ServiceLayout) -> Tuple[Tuple[Path, ...], Tuple[Path, ...]]:
+    """Discovered service directories other than the conventional backend/ and frontend/."""
+    conventional = (project_root / "backend", project_root / "frontend")
+    django = tuple(path for path in layout.django if path not in conventional)
+    node = tuple(path for path in layout.node if path not in conventional)
+    return django, node
+
+
+def profile_inputs(project_root: Path, discover_depth: int = DEFAULT_DISCOVER_DEPTH) -> Tuple[str, ...]:
+    """
+    PROFILE_INPUTS plus the inputs of every discovered extra service, so the
+    generation cache notices services being added, removed or changed.
+    """
+    if not discover_depth:
+        return PROFILE_INPUTS
+    layout = discover_services(project_root, discover_depth)
+    django, node = _extra_services(project_root, layout)
+    inputs = list(PROFILE_INPUTS)
+    inputs.extend(path.relative_to(project_root).as_posix() for path in layout.manifests)
+    for paths, names, pins in ((django, BACKEND_INPUTS, PYTHON_VERSION_FILES),
+                               (node, FRONTEND_INPUTS, NODE_VERSION_FILES)):
+        for path in paths:
+            relative = path.relative_to(project_root)
+            inputs.extend((relative / name).as_posix() for name in names)
+            if relative.parent != Path("."):
+                inputs.extend((relative.parent / name).as_posix() for name in pins)
+    return tuple(dict.fromkeys(inputs))
+
+
+def analyze_project(project_root: Path,
+                    env_files: Iterable[Path] = (),
+                    override_project_name: str = None,
+                    override_port: int = None,
+                    override_cmd: str = None,
+                    discover_depth: int = DEFAULT_DISCOVER_DEPTH) -> ProjectProfile:
+    """
+    Detects the backend and frontend and reads each manifest exactly once.
+    Components that are not detected are left as None. Other Django and Node
+    services up to discover_depth levels deep become extra services; the
+    overrides only apply to backend/ and frontend/.
+    """
+    try:
+        backend = analyze_backend(detect_django_backend(project_root), override_project_name)
+    except DeployFileGenError:
+        backend = None
+
+    try:
+        frontend = analyze_frontend(detect_react_frontend(project_root), override_port, override_cmd)
+    except DeployFileGenError:
+        frontend = None
+
+    extra_backends, extra_frontends = (), ()
+    if discover_depth:
+        django, node = _extra_services(project_root, discover_services(project_root, discover_depth))
+        names = service_names(django + node, project_root)
+        for path in django + node:
+            logger.info(f"Discovered service '{names[path]}' in {path.relative_to(project_root).as_posix()}/")
+        extra_backends = tuple(analyze_backend(path, service=names[path]) for path in django)
+        extra_frontends = tuple(analyze_frontend(path, service=names[path]) for path in node)
+
+    return ProjectProfile(root=project_root, backend=backend, frontend=frontend,
+                          env_files=tuple(env_files),
+                          extra_backends=extra_backends, extra_frontends=extra_frontends)
@@ -0,0 +1,189 @@
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from deployfilegen.utils.logger import logger
+
+# Python dependency manifests read by the toolchain analysis, relative to the backend.
+PYTHON_MANIFESTS = ("requirements.txt", "pyproject.toml", "poetry.lock", "uv.lock", "Pipfile.lock")
+
+# Extras that pull in a separate binary distribution: (name, extra) -> distribution.
+EXTRA_DISTRIBUTIONS = {
+    ("psycopg", "binary"): "psycopg-binary",
+    ("psycopg", "c"): "psycopg-c",
+}
+
+
+@dataclass(frozen=True)
+class NativeDependency:
+    """Debian packages a distribution needs when it is installed in a slim image."""
+    # Compiler and headers for building it from source (builder stage only)
+    build: Tuple[str, ...] = ()
+    # Shared libraries it loads at runtime (runner stage)
+    runtime: Tuple[str, ...] = ()
+    # Binary-wheel replacement worth suggesting, if any
+    alternative: Optional[str] = None
+    # Other distributions that already provide what this one needs
+    provided_by: Tuple[str, ...] = ()
+
+
+# Debian release of the generated python:<version>-slim-<release> images. Package
+# names below are this release's (e.g. libldap-2.5-0 is libldap2 in trixie), and
+# it matches the distroless python3-debian12 runner.
+DEBIAN_RELEASE = "bookworm"
+
+# Distributions without manylinux wheels (or that load system libraries),
+# keyed by normalized name. Anything not listed is assumed to ship a wheel.
+NATIVE_DEPENDENCIES = {
+    "psycopg2": NativeDependency(("gcc", "libpq-dev"), ("libpq5",), "psycopg2-binary or psycopg[binary]"),
+    "psycopg-c": NativeDependency(("gcc", "libpq-dev"), ("libpq5",), "psycopg[binary]"),
+    # Pure-Python psycopg 3 loads libpq through ctypes
+    "psycopg": NativeDependency((), ("libpq5",), "psycopg[binary]", provided_by=("psycopg-binary", "psycopg-c")),
+    "mysqlclient": NativeDependency(("gcc", "pkg-config", "default-libmysqlclient-dev"), ("libmariadb3",),
+                                    "PyMySQL (with pymysql.install_as_MySQLdb())"),
+    "python-ldap": NativeDependency(("gcc", "libldap2-dev", "libsasl2-dev"), ("libldap-2.5-0", "libsasl2-2")),
+    "pygraphviz": NativeDependency(("gcc", "libgraphviz-dev"), ("libgvc6", "libcgraph6")),
+    "uwsgi": NativeDependency(("gcc",), (), "gunicorn (the generated images already run it)"),
+}
+
+# Debian packages needed to install VCS requirements (git+https://...)
+VCS_BUILD_PACKAGES = ("git",)
+
+REQUIREMENT_PATTERN = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[([^\]]*)\])?")
+LOCK_PACKAGE_PATTERN = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ToolchainReport:
+    """What the backend images must apt-get install for the project's dependencies."""
+    build_packages: Tuple[str, ...] = ()
+    runtime_packages: Tuple[str, ...] = ()
+    # (distribution, alternative) pairs for dependencies that force a source build
+    suggestions: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def needs_compiler(self) -> bool:
+        return "gcc" in self.build_packages
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _requirement_names(spec: str) -> List[str]:
+    """Distribution names a PEP 508 requirement brings in, extras included."""
+    match = REQUIREMENT_PATTERN.match(spec.strip())
+    if not match:
+        return []
+    name = _normalize(match.group(1))
+    names = [name]
+    for extra in (match.group(2) or "").split(","):
+        distribution = EXTRA_DISTRIBUTIONS.get((name, extra.strip().lower()))
+        if distribution:
+            names.append(distribution)
+    return names
+
+
+def parse_requirement_lines(content: str) -> Tuple[Set[str], bool]:
+    """Returns (distribution names, has VCS requirements) for requirements.txt content."""
+    names: Set[str] = set()
+    vcs = False
+    for raw_line in content.splitlines():
+        line = raw_line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if re.match(r"(-e\s+)?(git|hg|svn|bzr)\+", line) or re.search(r"@\s*(git|hg|svn|bzr)\+", line):
+            vcs = True
+        if line.startswith(("-", ".", "/")) or "://" in line and "@" not in line:
+            continue
+        names.update(_requirement_names(line))
+    return names, vcs
+
+
+def _pyproject_requirements(content: str) -> List[str]:
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        logger.debug("tomllib unavailable; skipping pyproject.toml in the toolchain analysis")
+        return []
+    data = tomllib.loads(content)
+    specs = list(data.get("project", {}).get("dependencies", []))
+    for group in data.get("project", {}).get("optional-dependencies", {}).values():
+        specs.extend(group)
+    poetry = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+    for name, constraint in poetry.items():
+        if name.lower() == "python":
+            continue
+        extras = constraint.get("extras", []) if isinstance(constraint, dict) else []
+        specs.append(f"{name}[{','.join(extras)}]" if extras else name)
+    return specs
+
+
+def _lockfile_names(filename: str, content: str) -> Iterable[str]:
+    if filename == "Pipfile.lock":
+        data = json.loads(content)
+        return [name for section in ("default", "develop") for name in data.get(section, {})]
+    # poetry.lock and uv.lock: one [[package]] table per locked distribution
+    return LOCK_PACKAGE_PATTERN.findall(content)
+
+
+def read_dependency_names(backend_path: Path) -> Tuple[Set[str], bool]:
+    """Collects distribution names from every manifest present in the backend directory."""
+    names: Set[str] = set()
+    vcs = False
+    for filename in PYTHON_MANIFESTS:
+        path = backend_path / filename
+        try:
+            content = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"Could not read {path}: {e}")
+            continue
+        try:
+            if filename == "requirements.txt":
+                found, has_vcs = parse_requirement_lines(content)
+                names.update(found)
+                vcs = vcs or has_vcs
+            elif filename == "pyproject.toml":
+                for spec in _pyproject_requirements(content):
+                    names.update(_requirement_names(spec))
+                    vcs = vcs or bool(re.search(r"@\s*(git|hg|svn|bzr)\+", spec))
+            else:
+                names.update(_normalize(name) for name in _lockfile_names(filename, content))
+        except Exception as e:
+            logger.warning(f"Could not parse {path}: {e}")
+    return names, vcs
+
+
+def analyze_toolchain(backend_path: Path) -> ToolchainReport:
+    """
+    Decides which Debian packages the backend images need from the declared
+    dependencies: a compiler and headers only when something builds from
+    source, and the shared libraries native extensions load at runtime.
+    """
+    names, vcs = read_dependency_names(backend_path)
+    build: List[str] = list(VCS_BUILD_PACKAGES) if vcs else []
+    runtime: List[str] = []
+    suggestions = []
+    for name in sorted(names):
+        native = NATIVE_DEPENDENCIES.get(name)
+        if native is None or any(other in names for other in native.provided_by):
+            continue
+        build.extend(native.build)
+        runtime.extend(native.runtime)
+        if native.alternative:
+            suggestions.append((name, native.alternative))
+
+    report = ToolchainReport(
+        build_packages=tuple(dict.fromkeys(build)),
+        runtime_packages=tuple(dict.fromkeys(runtime)),
+        suggestions=tuple(suggestions),
+    )
+    if report.needs_compiler:
+        logger.info(f"Builder needs a C toolchain: {' '.join(report.build_packages)}")
+    for name, alternative in report.suggestions:
+        logger.info(f"{name} needs system packages in the image; {alternative} ships a binary wheel.")
+    return report
@@ -0,0 +1,269 @@
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from deployfilegen.utils.logger import logger
+
+# Python minor versions considered when resolving requires-python, oldest first.
+# A pinned version (.python-version, runtime.txt) is used as-is if it is not
+# older than the first entry: every released minor has a python:<version>-slim image.
+PYTHON_VERSIONS = ("3.9", "3.10", "3.11", "3.12", "3.13", "3.14")
+DEFAULT_PYTHON_VERSION = "3.11"
+
+# Node.js LTS majors considered when resolving engines.node, oldest first.
+# Pinned majors (.nvmrc, .node-version) from the first entry on are used as-is.
+NODE_VERSIONS = ("18", "20", "22", "24")
+DEFAULT_NODE_VERSION = "22"
+
+# .nvmrc LTS aliases -> major
+NODE_LTS_CODENAMES = {"hydrogen": "18", "iron": "20", "jod": "22", "krypton": "24"}
+
+# npm packages that compile a native addon (or ship glibc-only prebuilds).
+# On Alpine (musl) they fall back to a source build, so the image uses Debian-slim.
+NATIVE_NODE_MODULES = (
+    "bcrypt", "canvas", "node-sass", "better-sqlite3", "sqlite3", "bufferutil",
+    "utf-8-validate", "re2", "node-pty", "zeromq", "leveldown", "usb", "serialport",
+    "@tensorflow/tfjs-node", "@serialport/bindings-cpp",
+)
+
+# Files consulted for a pinned version, highest priority first
+PYTHON_VERSION_FILES = (".python-version", "runtime.txt")
+NODE_VERSION_FILES = (".nvmrc", ".node-version")
+
+PEP440_CLAUSE = re.compile(r"(~=|==|!=|<=|>=|<|>)\s*v?(\d+(?:\.\d+)*)(\.\*)?")
+NPM_CLAUSE = re.compile(r"(>=|<=|>|<|\^|~|=)?\s*v?(\d+)(?:\.(\d+|x|\*))?(?:\.(\d+|x|\*))?")
+
+
+def package_section(pkg_json: Optional[dict], name: str) -> dict:
+    """A package.json object section (dependencies, scripts, ...); {} when missing or not an object."""
+    section = (pkg_json or {}).get(name)
+    return section if isinstance(section, dict) else {}
+
+
+def _read_first_line(directories: Iterable[Path], names: Iterable[str]) -> Optional[Tuple[Path, str]]:
+    for directory in directories:
+        for name in names:
+            try:
+                lines = (directory / name).read_text(encoding="utf-8").split()
+            except OSError:
+                continue
+            if lines:
+                return directory / name, lines[0].strip()
+    return None
+
+
+def _pick(candidates: Tuple[str, ...], default: str, allowed) -> Optional[str]:
+    """The default when it is allowed, otherwise the newest allowed candidate."""
+    matching = [version for version in candidates if allowed(version)]
+    if not matching:
+        return None
+    return default if default in matching else matching[-1]
+
+
+def _python_tuple(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+def _python_clause_allows(op: str, version: str, wildcard: bool, candidate: Tuple[int, int]) -> bool:
+    target = _python_tuple(version)
+    minor = target[:2]
+    if op == "==":
+        return candidate == minor
+    if op == "!=":
+        # Only "!=3.10.*" (or "!=3.10") excludes a whole minor release
+        return candidate != minor or len(target) > 2 and not wildcard
+    if op == "~=":
+        if len(target) > 2:
+            return candidate == minor
+        return candidate >= minor and candidate[0] == target[0]
+    if op == ">=":
+        return candidate >= minor
+    if op == ">":
+        return candidate > minor
+    if op == "<=":
+        return candidate <= minor
+    # "<3.12" excludes 3.12; "<3.12.4" still allows 3.12
+    return candidate < minor or len(target) > 2 and candidate == minor and any(target[2:])
+
+
+def python_from_specifier(specifier: str) -> Optional[str]:
+    """Picks a Python minor version satisfying a PEP 440 specifier like '>=3.10,<3.13'."""
+    clauses = PEP440_CLAUSE.findall(specifier)
+    if not clauses:
+        return None
+
+    def allowed(version: str) -> bool:
+        candidate = _python_tuple(version)
+        return all(_python_clause_allows(op, v, bool(star), candidate) for op, v, star in clauses)
+
+    return _pick(PYTHON_VERSIONS, DEFAULT_PYTHON_VERSION, allowed)
+
+
+def _normalize_python_pin(pin: str) -> Optional[str]:
+    """'3.12.1', 'python-3.12.1' or 'cpython-3.12' -> '3.12'."""
+    match = re.search(r"(\d+)\.(\d+)", pin)
+    return f"{match.group(1)}.{match.group(2)}" if match else None
+
+
+def detect_python_version(backend_path: Optional[Path]) -> str:
+    """
+    Python minor version for the backend images: .python-version, then
+    runtime.txt (backend directory first, then the project root), then
+    requires-python in pyproject.toml. Defaults to DEFAULT_PYTHON_VERSION.
+    """
+    if backend_path is None:
+        return DEFAULT_PYTHON_VERSION
+    try:
+        return _python_version_from_files(backend_path)
+    except Exception as e:
+        logger.warning(f"Failed to detect the Python version: {e}")
+        return DEFAULT_PYTHON_VERSION
+
+
+def _python_version_from_files(backend_path: Path) -> str:
+    directories = (backend_path, backend_path.parent)
+
+    pinned = _read_first_line(directories, PYTHON_VERSION_FILES)
+    if pinned:
+        source, pin = pinned
+        version = _normalize_python_pin(pin)
+        if version is not None and version.startswith("3.") and \
+                _python_tuple(version) >= _python_tuple(PYTHON_VERSIONS[0]):
+            logger.info(f"Detected Python {version} from {source.name}")
+            return version
+        logger.warning(f"{source} pins Python '{pin}', older than the oldest supported "
+                       f"({PYTHON_VERSIONS[0]}) or not Python 3; using {DEFAULT_PYTHON_VERSION}.")
+        return DEFAULT_PYTHON_VERSION
+
+    try:
+        pyproject = (backend_path / "pyproject.toml").read_text(encoding="utf-8")
+    except OSError:
+        return DEFAULT_PYTHON_VERSION
+    match = re.search(r"^requires-python\s*=\s*['\"]([^'\"]+)['\"]", pyproject, re.MULTILINE)
+    if not match:
+        return DEFAULT_PYTHON_VERSION
+    version = python_from_specifier(match.group(1))
+    if version is None:
+        logger.warning(f"No supported Python image satisfies requires-python '{match.group(1)}'; "
+                       f"using {DEFAULT_PYTHON_VERSION}.")
+        return DEFAULT_PYTHON_VERSION
+    if version != DEFAULT_PYTHON_VERSION:
+        logger.info(f"Detected Python {version} from requires-python '{match.group(1)}'")
+    return version
+
+
+def _npm_clause_allows(op: str, major: str, rest: List[str], candidate: int) -> bool:
+    target = int(major)
+    # A bare major or an x-range ("20", "20.x") covers the whole major
+    partial = not rest or rest[0] in ("", "x", "*")
+    exact = all(part in ("", "x", "*", "0") for part in rest)
+    if op in ("", "=", "^", "~"):
+        return candidate == target
+    if op == ">=":
+        return candidate >= target
+    if op == ">":
+        return candidate > target if partial else candidate >= target
+    if op == "<=":
+        return candidate <= target
+    # "<20" / "<20.0.0" exclude 20; "<20.5" still allows 20
+    return candidate < target if exact else candidate <= target
+
+
+def node_from_range(node_range: str) -> Optional[str]:
+    """Picks a Node.js major satisfying an npm semver range like '>=18 <21 || ^22'."""
+    alternatives = []
+    for alternative in node_range.split("||"):
+        # Hyphen ranges: "18 - 20" means >=18 <=20
+        alternative = re.sub(r"(\S+)\s+-\s+(\S+)", r">=\1 <=\2", alternative)
+        clauses = NPM_CLAUSE.findall(alternative)
+        if clauses:
+            alternatives.append(clauses)
+    if not alternatives:
+        return None
+
+    def allowed(version: str) -> bool:
+        candidate = int(version)
+        return any(
+            all(_npm_clause_allows(op, major, [minor, patch], candidate) for op, major, minor, patch in clauses)
+            for clauses in alternatives
+        )
+
+    return _pick(NODE_VERSIONS, DEFAULT_NODE_VERSION, allowed)
+
+
+def _normalize_node_pin(pin: str) -> Optional[str]:
+    """'v20.11.0', '20', 'lts/iron' -> major; 'lts/*' and 'node' -> the default."""
+    pin = pin.lower()
+    if pin in ("node", "stable", "lts/*") or pin.startswith("lts/") and pin[4:] not in NODE_LTS_CODENAMES:
+        return DEFAULT_NODE_VERSION
+    if pin.startswith("lts/"):
+        return NODE_LTS_CODENAMES[pin[4:]]
+    match = re.match(r"v?(\d+)", pin)
+    return match.group(1) if match else None
+
+
+def detect_node_version(frontend_path: Optional[Path], pkg_json: Optional[dict] = None) -> str:
+    """
+    Node.js major for the frontend images: .nvmrc / .node-version (frontend
+    directory first, then the project root), then engines.node in
+    package.json. Defaults to DEFAULT_NODE_VERSION.
+    """
+    if frontend_path is None:
+        return DEFAULT_NODE_VERSION
+    try:
+        return _node_version_from_files(frontend_path, pkg_json)
+    except Exception as e:
+        logger.warning(f"Failed to detect the Node.js version: {e}")
+        return DEFAULT_NODE_VERSION
+
+
+def _node_version_from_files(frontend_path: Path, pkg_json: Optional[dict]) -> str:
+    pinned = _read_first_line((frontend_path, frontend_path.parent), NODE_VERSION_FILES)
+    if pinned:
+        source, pin = pinned
+        version = _normalize_node_pin(pin)
+        if version is not None and int(version) >= int(NODE_VERSIONS[0]):
+            logger.info(f"Detected Node.js {version} from {source.name}")
+            return version
+        logger.warning(f"{source} pins Node.js '{pin}', older than the oldest supported "
+                       f"({NODE_VERSIONS[0]}); using {DEFAULT_NODE_VERSION}.")
+        return DEFAULT_NODE_VERSION
+
+    engines = package_section(pkg_json, "engines").get("node")
+    if not isinstance(engines, str):
+        return DEFAULT_NODE_VERSION
+    version = node_from_range(engines)
+    if version is None:
+        logger.warning(f"No supported Node.js image satisfies engines.node '{engines}'; "
+                       f"using {DEFAULT_NODE_VERSION}.")
+        return DEFAULT_NODE_VERSION
+    if version != DEFAULT_NODE_VERSION:
+        logger.info(f"Detected Node.js {version} from engines.node '{engines}'")
+    return version
+
+
+def detect_native_modules(frontend_path: Optional[Path], pkg_json: Optional[dict],
+                          lockfile: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Native npm modules the frontend depends on, directly (package.json) or
+    transitively (found in the lockfile).
+    """
+    declared = {}
+    for section in ("dependencies", "devDependencies", "optionalDependencies"):
+        declared.update(package_section(pkg_json, section))
+    found = [name for name in NATIVE_NODE_MODULES if name in declared]
+
+    if frontend_path is not None and lockfile and lockfile != "bun.lockb":
+        try:
+            content = (frontend_path / lockfile).read_text(encoding="utf-8")
+        except OSError:
+            content = ""
+        for name in NATIVE_NODE_MODULES:
+            # node_modules/<name>" (npm), /<name>@ (pnpm), <name>@ at a line start (yarn)
+            pattern = rf"(?:node_modules/|[\s\"'/]|^){re.escape(name)}(?:@|\")"
+            if name not in found and re.search(pattern, content, re.MULTILINE):
+                found.append(name)
+
+    if found:
+        logger.info(f"Native npm modules found ({', '.join(found)}); using Debian-slim Node images.")
+    return tuple(found)
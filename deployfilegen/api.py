@@ -0,0 +1,122 @@
+"""
+Library API: render a project's deployment files in memory.
+
+Nothing here writes to disk, changes the working directory or prints.
+Warnings from detection are passed to an optional callback instead of being
+logged to stdout. The CLI commands and ``deployfilegen.batch`` are layers on
+top of these functions.
+
+    from deployfilegen.api import render
+    from deployfilegen.config.options import GenerationOptions
+
+    artifacts = render("/srv/repos/shop", GenerationOptions(deploy="registry"))
+    artifacts["backend/Dockerfile"]
+"""
+import os
+from collections import ChainMap
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.utils.logger import capture_warnings
+
+if TYPE_CHECKING:
+    from deployfilegen.utils.cache import GenerationCache
+
+WarningCallback = Optional[Callable[[str], None]]
+
+
+def resolve_config(project_root: Path, options: GenerationOptions,
+                   env: Optional[Mapping[str, str]] = None) -> Tuple[Tuple[Path, ...], dict]:
+    """
+    Returns (.env files, validated config) for a project. With env, those
+    variables are validated as given and no .env file is read; otherwise the
+    project's .env layers are used on top of the process environment.
+    """
+    from deployfilegen.config.env_loader import load_env_layers, validate_environment
+
+    if env is not None:
+        return (), validate_environment(mode=options.mode, deploy=options.deploy, env=env)
+    layers = load_env_layers(project_root)
+    config = validate_environment(mode=options.mode, deploy=options.deploy,
+                                  env=ChainMap(layers.values, os.environ))
+    return layers.files, config
+
+
+def analyze(project_root: Path, options: GenerationOptions, env_files: Sequence[Path] = ()) -> ProjectProfile:
+    """Runs project detection with the overrides from options."""
+    from deployfilegen.analyzer.profile import analyze_project
+
+    return analyze_project(project_root, env_files=env_files,
+                           override_project_name=options.project_name,
+                           override_port=options.frontend_port,
+                           override_cmd=options.start_command,
+                           discover_depth=options.discover_depth)
+
+
+def render_cached(project_root: Path, options: GenerationOptions, cache: "GenerationCache",
+                  env: Optional[Mapping[str, str]] = None,
+                  progress: Optional[Callable[[str], None]] = None) -> Tuple[Dict[str, str], bool]:
+    """
+    The pipeline shared by init, batch and the render server: config, a cache
+    lookup keyed on the project's inputs, then analysis and rendering on a
+    miss. Returns (artifacts, cached). The cache is only updated in memory;
+    cache.save() persists it.
+    """
+    from deployfilegen.analyzer.profile import profile_inputs
+    from deployfilegen.generators.bundle import render_artifacts
+
+    env_files, config = resolve_config(project_root, options, env)
+    key = cache.key(profile_inputs(project_root, options.discover_depth), options, config)
+    artifacts = cache.get(key)
+    if artifacts is not None:
+        return artifacts, True
+    artifacts = render_artifacts(analyze(project_root, options, env_files), config, options, progress)
+    cache.put(key, artifacts)
+    return artifacts, False
+
+
+def _forward(messages, on_warning: WarningCallback) -> None:
+    if on_warning is not None:
+        for message in messages:
+            on_warning(message)
+
+
+def render(project_root: Union[str, Path], options: Optional[GenerationOptions] = None,
+           env: Optional[Mapping[str, str]] = None, on_warning: WarningCallback = None) -> Dict[str, str]:
+    """
+    Renders every artifact selected by options for the project at project_root.
+    Returns an ordered mapping of project-relative POSIX path -> file content.
+    Raises DeployFileGenError (e.g. EnvConfigError) when the project cannot be rendered.
+    """
+    return {relpath: data.decode("utf-8") for relpath, data in iter_render(project_root, options, env, on_warning)}
+
+
+def iter_render(project_root: Union[str, Path], options: Optional[GenerationOptions] = None,
+                env: Optional[Mapping[str, str]] = None,
+                on_warning: WarningCallback = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Streaming form of render: yields (relpath, UTF-8 bytes) one artifact at a
+    time, running each generator only when the next artifact is requested.
+    Suited to writing straight into archives or HTTP responses.
+    """
+    from deployfilegen.generators.bundle import iter_artifacts
+
+    root = Path(project_root).resolve()
+    options = options or GenerationOptions()
+    with capture_warnings() as messages:
+        env_files, config = resolve_config(root, options, env)
+        profile = analyze(root, options, env_files)
+    _forward(messages, on_warning)
+
+    artifacts = iter_artifacts(profile, config, options)
+    while True:
+        # Capture per step: the caller's code between yields logs normally
+        with capture_warnings() as messages:
+            item = next(artifacts, None)
+        _forward(messages, on_warning)
+        if item is None:
+            return
+        relpath, content = item
+        yield relpath, content.encode("utf-8")
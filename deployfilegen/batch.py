@@ -0,0 +1,125 @@
+"""
+Generation across many project roots (``deployfilegen batch``).
+
+Each project runs through the same pipeline as ``init`` (env layers, cache,
+analysis, rendering, writing) but against an explicit root, never the
+working directory, so projects can be fanned out over a process pool.
+"""
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import DeployFileGenError
+from deployfilegen.utils.logger import capture_warnings
+
+
+@dataclass(frozen=True)
+class ProjectResult:
+    """Outcome of generating one project; picklable so workers can return it."""
+    root: str
+    ok: bool
+    seconds: float
+    written: Tuple[str, ...] = ()
+    unchanged: int = 0
+    # Existing files left alone because --force was not given
+    skipped: Tuple[str, ...] = ()
+    # --check: generated files that differ from the ones on disk
+    out_of_date: Tuple[str, ...] = ()
+    cached: bool = False
+    warnings: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+def generate_project(root: Path, options: GenerationOptions, force: bool = False,
+                     use_cache: bool = True, check: bool = False) -> ProjectResult:
+    """
+    Runs the init pipeline for one project root. Never raises for project
+    errors: they are reported in the result so one bad repo cannot stop a batch.
+    """
+    from deployfilegen.api import render_cached
+    from deployfilegen.utils.cache import GenerationCache
+    from deployfilegen.utils.writer import FileWriter
+
+    root = Path(root).resolve()
+    start = time.perf_counter()
+    if not root.is_dir():
+        return ProjectResult(str(root), False, 0.0, error="Not a directory")
+    with capture_warnings() as warnings:
+        try:
+            cache = GenerationCache(root, enabled=use_cache)
+            artifacts, cached = render_cached(root, options, cache)
+
+            writer = FileWriter(force=force, project_root=root, check=check)
+            written = tuple(relpath for relpath, content in artifacts.items()
+                            if writer.write(root / relpath, content))
+            out_of_date = tuple(relpath for relpath, _ in writer.diffs)
+            settled = set(written) | set(writer.unchanged) | set(out_of_date)
+            if not check:
+                writer.save_manifest()
+                cache.save()
+        except DeployFileGenError as e:
+            return ProjectResult(str(root), False, time.perf_counter() - start,
+                                 warnings=tuple(warnings), error=str(e))
+        except Exception as e:
+            return ProjectResult(str(root), False, time.perf_counter() - start,
+                                 warnings=tuple(warnings), error=f"{type(e).__name__}: {e}")
+
+    return ProjectResult(
+        root=str(root),
+        ok=not out_of_date,
+        seconds=time.perf_counter() - start,
+        written=written,
+        unchanged=len(writer.unchanged),
+        skipped=tuple(relpath for relpath in artifacts if relpath not in settled),
+        out_of_date=out_of_date,
+        cached=cached,
+        warnings=tuple(warnings),
+    )
+
+
+def expand_roots(roots: Iterable[Path] = (), patterns: Iterable[str] = ()) -> List[Path]:
+    """
+    Explicit roots (kept even if missing, so they are reported) plus the
+    directories matching the glob patterns, resolved and deduplicated.
+    """
+    candidates = [Path(root) for root in roots]
+    for pattern in patterns:
+        candidates.extend(path for path in map(Path, sorted(glob.glob(pattern))) if path.is_dir())
+    return list(dict.fromkeys(candidate.resolve() for candidate in candidates))
+
+
+def run_batch(roots: List[Path], options: GenerationOptions, jobs: Optional[int] = None,
+              force: bool = False, use_cache: bool = True, check: bool = False,
+              on_result: Optional[Callable[[ProjectResult], None]] = None) -> List[ProjectResult]:
+    """
+    Generates every root, in a process pool of `jobs` workers (CPU count by
+    default; 1 runs in-process). Results are passed to on_result as they
+    finish and returned in the order of roots.
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(roots) or 1))
+    results = {}
+    if jobs == 1:
+        for root in roots:
+            results[root] = generate_project(root, options, force, use_cache, check)
+            if on_result:
+                on_result(results[root])
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(generate_project, root, options, force, use_cache, check): root
+                       for root in roots}
+            for future in as_completed(futures):
+                root = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. killed); the project still gets a result
+                    result = ProjectResult(str(root), False, 0.0, error=f"{type(e).__name__}: {e}")
+                results[root] = result
+                if on_result:
+                    on_result(result)
+    return [results[root] for root in roots]
@@ -0,0 +1,430 @@
+"""
+Typer application behind the ``deployfilegen`` entry point.
+
+Only ``typer`` is imported at module load. Generators, the env loader and
+python-dotenv are imported inside the commands that use them, so ``--help``
+and ``template`` never pay for ``init``'s dependencies.
+"""
+import typer
+from pathlib import Path
+from typing import List, Optional
+
+from deployfilegen import __version__
+
+app = typer.Typer(no_args_is_help=True)
+
+def version_callback(value: bool):
+    if value:
+        typer.echo(__version__)
+        raise typer.Exit()
+
+@app.callback()
+def main_callback(
+    version: Optional[bool] = typer.Option(
+        None, "--version", "-v", callback=version_callback, is_eager=True, help="Show the version and exit."
+    ),
+):
+    """
+    A production-grade CLI tool to generate deployment configuration files.
+    """
+    pass
+
+# Generation options, defined once so that init and batch accept the same flags
+_MODE = typer.Option("prod", help="Generation mode: 'prod' or 'dev'")
+_FORCE = typer.Option(False, "--force", "-f", help="Overwrite existing files")
+_DOCKER_ONLY = typer.Option(False, "--docker-only", help="Generate only Dockerfiles")
+_COMPOSE_ONLY = typer.Option(False, "--compose-only", help="Generate only Docker Compose")
+_GITHUB_ONLY = typer.Option(False, "--github-only", help="Generate only GitHub Actions")
+_BACKEND_ONLY = typer.Option(False, "--backend-only", help="Generate only for Backend")
+_FRONTEND_ONLY = typer.Option(False, "--frontend-only", help="Generate only for Frontend")
+_WITH_DB = typer.Option(False, "--with-db", help="Include a Postgres database service in Docker Compose")
+_ROLLING = typer.Option(False, "--rolling", help="Zero-downtime deploys: replace containers only after the new ones are healthy (needs --proxy)")
+_PLATFORMS = typer.Option("linux/amd64", "--platforms", help="Comma-separated image platforms for --deploy registry, e.g. 'linux/amd64,linux/arm64'")
+_WITH_TESTS = typer.Option(False, "--with-tests", help="Run Django/frontend tests in CI before deploying (prod)")
+_TEST_SHARDS = typer.Option(1, "--test-shards", help="Number of parallel runners for the Django tests (with --with-tests)")
+_PROXY = typer.Option(False, "--proxy", help="Add an nginx reverse proxy that serves static/media and proxies /api and /admin (prod)")
+# Deployment Strategy
+_DEPLOY = typer.Option("ssh", "--deploy", help="Deployment strategy: 'ssh' (build on server) or 'registry' (push to registry)")
+# Explicit Overrides (Stability Hardening)
+_FRONTEND_PORT = typer.Option(None, "--frontend-port", help="Override detected frontend dev port")
+_START_COMMAND = typer.Option(None, "--start-command", help="Override detected frontend start command")
+_PROJECT_NAME = typer.Option(None, "--project-name", help="Override detected Django project name")
+# Build Speed
+_BUILD_PROFILE = typer.Option("standard", "--build-profile", help="Dockerfile build profile: 'standard' or 'fast' (BuildKit cache mounts for pip/apt)")
+_INSTALLER = typer.Option("pip", "--installer", help="Python installer used in the backend image: 'pip' or 'uv'")
+# App Server Sizing
+_RUNTIME = typer.Option("slim", "--runtime", help="Backend runtime image: 'slim' (python:slim) or 'distroless'")
+_SIZING = typer.Option("balanced", "--sizing", help="Gunicorn sizing profile: 'balanced', 'cpu' or 'memory'")
+_COLD_START = typer.Option(False, "--cold-start", help="Collect static files and compile bytecode at build time; containers start straight into gunicorn (prod)")
+# Monorepos
+_DISCOVER_DEPTH = typer.Option(4, "--discover-depth", help="Directory levels searched for more Django/Node services, each generated as its own image and compose service (0: backend/ and frontend/ only)")
+
+
+@app.command(name="init")
+def init(
+    mode: str = _MODE,
+    force: bool = _FORCE,
+    docker_only: bool = _DOCKER_ONLY,
+    compose_only: bool = _COMPOSE_ONLY,
+    github_only: bool = _GITHUB_ONLY,
+    backend_only: bool = _BACKEND_ONLY,
+    frontend_only: bool = _FRONTEND_ONLY,
+    with_db: bool = _WITH_DB,
+    rolling: bool = _ROLLING,
+    platforms: str = _PLATFORMS,
+    with_tests: bool = _WITH_TESTS,
+    test_shards: int = _TEST_SHARDS,
+    proxy: bool = _PROXY,
+    deploy: str = _DEPLOY,
+    frontend_port: int = _FRONTEND_PORT,
+    start_command: str = _START_COMMAND,
+    project_name: str = _PROJECT_NAME,
+    build_profile: str = _BUILD_PROFILE,
+    installer: str = _INSTALLER,
+    runtime: str = _RUNTIME,
+    sizing: str = _SIZING,
+    cold_start: bool = _COLD_START,
+    discover_depth: int = _DISCOVER_DEPTH,
+    # Caching
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the .deployfilegen/ generation cache"),
+    cache_stats: bool = typer.Option(False, "--cache-stats", help="Print generation cache statistics"),
+    check: bool = typer.Option(False, "--check", help="Write nothing; show a diff and exit 1 if any generated file would change"),
+):
+    """
+    Initialize deployment configuration for the current project.
+    """
+    from deployfilegen.utils.logger import logger
+    from deployfilegen.utils.writer import FileWriter
+    from deployfilegen.utils.cache import GenerationCache
+    from deployfilegen.api import render_cached
+    from deployfilegen.config.options import GenerationOptions
+    from deployfilegen.exceptions import DeployFileGenError, EnvConfigError
+
+    try:
+        project_root = Path.cwd()
+        options = GenerationOptions(
+            mode=mode, deploy=deploy, with_db=with_db, proxy=proxy, rolling=rolling, platforms=platforms,
+            with_tests=with_tests, test_shards=test_shards,
+            docker_only=docker_only, compose_only=compose_only, github_only=github_only,
+            backend_only=backend_only, frontend_only=frontend_only,
+            frontend_port=frontend_port, start_command=start_command, project_name=project_name,
+            build_profile=build_profile, installer=installer, runtime=runtime, sizing=sizing,
+            cold_start=cold_start, discover_depth=discover_depth,
+        )
+
+        # 1. Config (.env layers over the process environment), then analysis and
+        # rendering unless the cache already holds output for unchanged inputs
+        cache = GenerationCache(project_root, enabled=not no_cache)
+        artifacts, cached = render_cached(project_root, options, cache, progress=typer.echo)
+        if cached:
+            typer.echo("Project unchanged since last run; reusing cached output.")
+
+        # 2. Writing (byte-identical outputs are skipped; --check writes nothing)
+        writer = FileWriter(force=force, project_root=project_root, check=check)
+        for relpath, content in artifacts.items():
+            if writer.write(project_root / relpath, content):
+                typer.echo(f"Generated {relpath}")
+
+        if cache_stats:
+            typer.echo(cache.describe())
+
+        if check:
+            for _, diff in writer.diffs:
+                typer.echo(diff, nl=False)
+            if writer.diffs:
+                # Existing files are only replaced with --force, so say so instead of
+                # suggesting a plain re-run that would leave them as they are
+                if force or not writer.overwrites:
+                    hint = "Re-run without --check to update."
+                elif len(writer.overwrites) == len(writer.diffs):
+                    hint = "They differ from existing files; re-run with --force (without --check) to overwrite them."
+                else:
+                    hint = (
+                        f"Re-run without --check to create the missing ones; {len(writer.overwrites)} differ "
+                        "from existing files and are only overwritten with --force."
+                    )
+                typer.echo(f"{len(writer.diffs)} generated file(s) are out of date. {hint}")
+                raise typer.Exit(code=1)
+            typer.echo("All generated files are up to date.")
+            return
+
+        writer.save_manifest()
+        cache.save()
+        if writer.unchanged:
+            typer.echo(f"Unchanged: {len(writer.unchanged)} file(s) already up to date.")
+
+        typer.echo("Deployment configuration generated successfully!")
+        
+        # Runtime Success Checklist
+        typer.echo("\n--- 🏁 Deployment Success Checklist ---")
+        typer.echo("1. Connection: Ensure your server can reach the internet and your Container Registry.")
+        if with_db:
+             typer.echo("2. Database: Configured for INTERNAL Postgres service.")
+        else:
+             typer.echo("2. Database: Configured for EXTERNAL database. Ensure DATABASE_URL is set.")
+
+        typer.echo(f"3. Environment: Confirm your server's .env matches the generated template.")
+        typer.echo("4. Images: Ensure build images are pushed to your Registry before deploying.")
+        step = 5
+        if proxy and mode == "prod":
+            step += 1
+            typer.echo("5. Proxy: Set STATIC_URL=/static/ (/django-static/ with a Create React App frontend), STATIC_ROOT=/app/static and MEDIA_ROOT=/app/media; keep proxy/nginx.conf next to the compose file on the server.")
+        if cold_start and mode == "prod":
+            from deployfilegen.generators.backend import BUILD_ENV_NOTE, BUILD_SETTINGS_ARG
+
+            # The Dockerfiles list the env their settings read without a default
+            build_env = []
+            for relpath, content in artifacts.items():
+                if relpath.endswith("Dockerfile"):
+                    build_env += [line[len(BUILD_ENV_NOTE):] for line in content.splitlines()
+                                  if line.startswith(BUILD_ENV_NOTE)]
+            needed = f" Your settings read {'; '.join(build_env)} without a default." if build_env else ""
+            typer.echo(f"{step}. Build: collectstatic runs in docker build with only a placeholder SECRET_KEY.{needed} "
+                       f"Give such settings defaults, or pass --build-arg {BUILD_SETTINGS_ARG}=<build settings module>.")
+        typer.echo("--------------------------------------")
+
+    except typer.Exit:
+        raise
+    except EnvConfigError as e:
+        typer.echo(f"Error: {e}")
+        typer.echo("Tip: Run 'deployfilegen template' to generate a boilerplate .env file.")
+        raise typer.Exit(code=1)
+    except DeployFileGenError as e:
+        logger.info(f"Error: {e}")
+        raise typer.Exit(code=1)
+    except Exception as e:
+        logger.exception(f"Unexpected Error: {e}")
+        raise typer.Exit(code=1)
+
+@app.command(name="batch")
+def batch(
+    roots: Optional[List[Path]] = typer.Argument(None, help="Project roots to generate"),
+    pattern: Optional[List[str]] = typer.Option(None, "--glob", help="Add every directory matching this glob, e.g. 'repos/*' (repeatable)"),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Parallel worker processes (default: CPU count; 1 runs in-process)"),
+    mode: str = _MODE,
+    force: bool = _FORCE,
+    docker_only: bool = _DOCKER_ONLY,
+    compose_only: bool = _COMPOSE_ONLY,
+    github_only: bool = _GITHUB_ONLY,
+    backend_only: bool = _BACKEND_ONLY,
+    frontend_only: bool = _FRONTEND_ONLY,
+    with_db: bool = _WITH_DB,
+    rolling: bool = _ROLLING,
+    platforms: str = _PLATFORMS,
+    with_tests: bool = _WITH_TESTS,
+    test_shards: int = _TEST_SHARDS,
+    proxy: bool = _PROXY,
+    deploy: str = _DEPLOY,
+    frontend_port: int = _FRONTEND_PORT,
+    start_command: str = _START_COMMAND,
+    project_name: str = _PROJECT_NAME,
+    build_profile: str = _BUILD_PROFILE,
+    installer: str = _INSTALLER,
+    runtime: str = _RUNTIME,
+    sizing: str = _SIZING,
+    cold_start: bool = _COLD_START,
+    discover_depth: int = _DISCOVER_DEPTH,
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update each project's generation cache"),
+    check: bool = typer.Option(False, "--check", help="Write nothing; exit 1 if any project's generated files would change"),
+    json_output: bool = typer.Option(False, "--json", help="Print per-project results as JSON"),
+):
+    """
+    Generate deployment configuration for many projects in parallel.
+    """
+    import json
+    import time
+    from dataclasses import asdict
+
+    from deployfilegen.batch import expand_roots, run_batch
+    from deployfilegen.config.options import GenerationOptions
+    from deployfilegen.exceptions import DeployFileGenError
+    from deployfilegen.utils.logger import logger
+
+    try:
+        options = GenerationOptions(
+            mode=mode, deploy=deploy, with_db=with_db, proxy=proxy, rolling=rolling, platforms=platforms,
+            with_tests=with_tests, test_shards=test_shards,
+            docker_only=docker_only, compose_only=compose_only, github_only=github_only,
+            backend_only=backend_only, frontend_only=frontend_only,
+            frontend_port=frontend_port, start_command=start_command, project_name=project_name,
+            build_profile=build_profile, installer=installer, runtime=runtime, sizing=sizing,
+            cold_start=cold_start, discover_depth=discover_depth,
+        )
+    except DeployFileGenError as e:
+        logger.info(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+    project_roots = expand_roots(roots or [], pattern or [])
+    if not project_roots:
+        typer.echo("No project directories given (pass paths or --glob).")
+        raise typer.Exit(code=1)
+
+    def show(result):
+        if json_output:
+            return
+        if result.ok:
+            detail = f"{len(result.written)} written, {result.unchanged} unchanged"
+            if result.skipped:
+                detail += f", {len(result.skipped)} existing (use --force)"
+            if result.cached:
+                detail += ", cached"
+            typer.echo(f"OK    {result.root}  ({result.seconds:.2f}s, {detail})")
+        elif result.out_of_date:
+            typer.echo(f"STALE {result.root}  ({result.seconds:.2f}s, {len(result.out_of_date)} file(s) out of date)")
+        else:
+            typer.echo(f"FAIL  {result.root}  ({result.seconds:.2f}s): {result.error}")
+        for warning in result.warnings:
+            typer.echo(f"      warning: {warning}")
+
+    started = time.perf_counter()
+    results = run_batch(project_roots, options, jobs=jobs or None, force=force,
+                        use_cache=not no_cache, check=check, on_result=show)
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results if not result.ok]
+
+    if json_output:
+        typer.echo(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        typer.echo(f"\n{len(results) - len(failed)}/{len(results)} project(s) succeeded in {elapsed:.1f}s")
+        for result in failed:
+            reason = result.error or f"{len(result.out_of_date)} file(s) out of date"
+            typer.echo(f"  {result.root}: {reason}")
+    if failed:
+        raise typer.Exit(code=1)
+
+@app.command(name="serve")
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8765, "--port", "-p", help="TCP port to listen on (0 picks a free one)"),
+    unix_socket: Optional[Path] = typer.Option(None, "--socket", help="Listen on this Unix socket instead of TCP"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Requests rendered concurrently"),
+    max_pending: Optional[int] = typer.Option(None, "--max-pending", help="Connections allowed to wait for a worker before new ones get 503 (default: 4 per worker)"),
+):
+    """
+    Run a local render server that keeps generators and detection caches warm.
+    """
+    from deployfilegen.exceptions import DeployFileGenError
+    from deployfilegen.server import create_server
+    from deployfilegen.utils.logger import logger
+
+    try:
+        server = create_server(host=host, port=port, unix_socket=unix_socket,
+                               workers=workers, max_pending=max_pending)
+    except DeployFileGenError as e:
+        logger.info(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+    if unix_socket is not None:
+        address = f"unix:{unix_socket}"
+    else:
+        address = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    typer.echo(f"Serving on {address} ({workers} workers). POST /render, GET /metrics. Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("Shutting down.")
+    finally:
+        server.server_close()
+
+@app.command(name="report")
+def report(
+    image: Optional[List[str]] = typer.Option(None, "--image", help="Show real layer sizes of a built image: SERVICE=IMAGE (repeatable)"),
+    json_output: bool = typer.Option(False, "--json", help="Print the estimates as JSON (for tracking size regressions)"),
+):
+    """
+    List the layers of the generated Dockerfiles with estimated sizes.
+    """
+    import json
+    from dataclasses import asdict
+
+    from deployfilegen.analyzer.dockerfile import estimate_image, format_size, image_history
+    from deployfilegen.analyzer.profile import analyze_project
+    from deployfilegen.exceptions import DeployFileGenError
+    from deployfilegen.utils.logger import capture_warnings, logger
+
+    try:
+        project_root = Path.cwd()
+        images = dict(entry.split("=", 1) for entry in (image or []) if "=" in entry)
+        # Detection output would end up in --json; the Dockerfiles are what matter here
+        with capture_warnings():
+            profile = analyze_project(project_root)
+        service_dirs = {"backend": project_root / "backend", "frontend": project_root / "frontend"}
+        service_dirs.update((service.service, service.path)
+                            for service in profile.backends + profile.frontends if service.path)
+        services = {(path / "Dockerfile").as_posix(): name for name, path in service_dirs.items()}
+        estimates = [estimate_image(Path(dockerfile)) for dockerfile in services if Path(dockerfile).is_file()]
+        if not estimates:
+            typer.echo("No generated Dockerfiles found. Run 'deployfilegen init' first.")
+            raise typer.Exit(code=1)
+
+        if json_output:
+            typer.echo(json.dumps([
+                {**asdict(estimate), "known_bytes": estimate.known_bytes,
+                 "dockerfile": Path(estimate.dockerfile).relative_to(project_root).as_posix()}
+                for estimate in estimates
+            ], indent=2))
+            return
+
+        for estimate in estimates:
+            relpath = Path(estimate.dockerfile).relative_to(project_root).as_posix()
+            service = services[estimate.dockerfile]
+            base_size = f"~{estimate.base_mb} MB" if estimate.base_mb is not None else "size unknown"
+            typer.echo(f"\n{relpath}  (runtime base: {estimate.base}, {base_size})")
+            if service in images:
+                for size, created_by in image_history(images[service]):
+                    typer.echo(f"  {size:>10}  {created_by[:90]}")
+                continue
+            for layer in estimate.layers:
+                note = f"  ({layer.note})" if layer.note else ""
+                typer.echo(f"  {format_size(layer.size_bytes):>10}  {layer.instruction[:70]}{note}")
+            unknown = f" + {estimate.unknown_layers} layer(s) that depend on the build" if estimate.unknown_layers else ""
+            typer.echo(f"  Estimated: {format_size(estimate.known_bytes)}{unknown}")
+
+    except typer.Exit:
+        raise
+    except DeployFileGenError as e:
+        logger.info(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+@app.command(name="template")
+def generate_template(
+    force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing .env file"),
+    deploy: str = typer.Option("ssh", "--deploy", help="Deployment strategy: 'ssh' or 'registry'"),
+):
+    """
+    Generate a boilerplate .env file with required placeholders.
+    """
+    from deployfilegen.utils.logger import logger
+    from deployfilegen.utils.writer import FileWriter
+    from deployfilegen.exceptions import DeployFileGenError
+
+    try:
+        project_root = Path.cwd()
+        env_path = project_root / ".env"
+        
+        # Base template (always needed for prod)
+        template_content = """# deployfilegen Environment Template
+
+# Deployment Server (SSH)
+DEPLOY_HOST=your_server_ip
+DEPLOY_USER=your_ssh_user
+"""
+        
+        if deploy == "registry":
+            template_content += """
+# Container Registry (required for --deploy registry)
+DOCKER_USERNAME=your_username
+BACKEND_IMAGE_NAME=your_docker_username/backend_image
+FRONTEND_IMAGE_NAME=your_docker_username/frontend_image
+"""
+        
+        writer = FileWriter(force=force)
+        writer.write(env_path, template_content)
+        typer.echo(f"Generated boilerplate .env file for '{deploy}' deployment. Please fill in the values.")
+        
+    except DeployFileGenError as e:
+        logger.info(f"Error: {e}")
+        raise typer.Exit(code=1)
+    except Exception as e:
+        logger.exception(f"Unexpected Error: {e}")
+        raise typer.Exit(code=1)
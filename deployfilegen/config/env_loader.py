@@ -1,7 +1,13 @@
+import hashlib
+import io
 import os
+import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from dotenv import load_dotenv
-from typing import List, Dict
+from types import MappingProxyType
+from dotenv import dotenv_values
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from deployfilegen.exceptions import EnvConfigError
 from deployfilegen.utils.logger import logger
@@ -19,6 +25,81 @@ REGISTRY_REQUIRED_VARS = SSH_REQUIRED_VARS + [
 ]
 
 
+# .env layers relative to the project root, lowest precedence first
+ENV_LAYERS = (".env", "backend/.env", "frontend/.env")
+
+# ${NAME} and ${NAME:-default}, the expansions python-dotenv supports
+_VARIABLE_PATTERN = re.compile(r"\$\{(?P<name>[^}:]*)(?::-(?P<default>[^}]*))?\}")
+
+# Parsed (uninterpolated) .env files keyed by content hash; shared by every caller
+_parsed_files: Dict[str, Mapping[str, str]] = {}
+_parsed_files_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class EnvLayers:
+    """The .env layers found for a project and their merged, read-only values."""
+    files: Tuple[Path, ...]
+    values: Mapping[str, str]
+
+
+def parse_env_file(path: Path) -> Mapping[str, str]:
+    """
+    Parses one .env file without touching os.environ. Results are cached by
+    content hash, so unchanged files are parsed once per process.
+    """
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    with _parsed_files_lock:
+        cached = _parsed_files.get(digest)
+    if cached is not None:
+        return cached
+
+    raw = dotenv_values(stream=io.StringIO(data.decode("utf-8-sig")), interpolate=False)
+    # A bare "KEY" line has no value; load_dotenv never set those either
+    parsed = MappingProxyType({key: value for key, value in raw.items() if value is not None})
+    with _parsed_files_lock:
+        return _parsed_files.setdefault(digest, parsed)
+
+
+def _interpolate(value: str, known: Mapping[str, str], environ: Mapping[str, str]) -> str:
+    def replace(match):
+        name = match.group("name")
+        resolved = known.get(name, environ.get(name))
+        return resolved if resolved is not None else (match.group("default") or "")
+    return _VARIABLE_PATTERN.sub(replace, value)
+
+
+def load_env_layers(project_root: Path, environ: Optional[Mapping[str, str]] = None) -> EnvLayers:
+    """
+    Reads the .env layers (project root, backend/, frontend/) into one
+    immutable mapping in which later files override earlier ones.
+    ${VAR} references resolve against the layers read so far, then environ
+    (os.environ by default, read only). Nothing global is modified, so
+    several projects can be loaded concurrently.
+    """
+    environ = os.environ if environ is None else environ
+    files = []
+    merged: Dict[str, str] = {}
+    for relpath in ENV_LAYERS:
+        env_file = project_root / relpath
+        try:
+            parsed = parse_env_file(env_file)
+        except FileNotFoundError:
+            continue
+        except (OSError, UnicodeDecodeError) as e:
+            raise EnvConfigError(f"Could not read {env_file}: {e}")
+        for key, value in parsed.items():
+            merged[key] = _interpolate(value, merged, environ)
+        logger.info(f"Loaded environment from: {env_file}")
+        files.append(env_file)
+
+    if not files:
+        raise EnvConfigError("No .env files found in likely locations.")
+
+    return EnvLayers(files=tuple(files), values=MappingProxyType(merged))
+
+
 def load_environment(project_root: Path) -> List[Path]:
     """
     Loads .env files in layered order:
@@ -26,31 +107,20 @@ def load_environment(project_root: Path) -> List[Path]:
     2. backend/.env
     3. frontend/.env
     
-    Later files override earlier ones.
+    Later files override earlier ones. The merged values are exported to
+    os.environ; use load_env_layers() for a side-effect-free load.
     Returns a list of .env file paths that were found and loaded.
     """
-    env_files = [
-        project_root / ".env",
-        project_root / "backend" / ".env",
-        project_root / "frontend" / ".env",
-    ]
-    
-    loaded_files = []
-    for env_file in env_files:
-        if env_file.exists():
-            load_dotenv(env_file, override=True)
-            logger.info(f"Loaded environment from: {env_file}")
-            loaded_files.append(env_file)
-            
-    if not loaded_files:
-        raise EnvConfigError("No .env files found in likely locations.")
-    
-    return loaded_files
+    layers = load_env_layers(project_root)
+    os.environ.update(layers.values)
+    return list(layers.files)
 
 
-def validate_environment(mode: str = "prod", deploy: str = "ssh") -> Dict[str, str]:
+def validate_environment(mode: str = "prod", deploy: str = "ssh",
+                         env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
     """
-    Validates that required environment variables are set.
+    Validates that required environment variables are set in env
+    (os.environ when not given).
     
     - dev mode: no deployment variables required.
     - prod mode + ssh deploy: only DEPLOY_HOST, DEPLOY_USER required.
@@ -58,12 +128,13 @@ def validate_environment(mode: str = "prod", deploy: str = "ssh") -> Dict[str, s
     
     Returns a dictionary of the variables found.
     """
+    env = os.environ if env is None else env
     config = {}
     
     if mode == "dev":
         # Dev mode: no strict requirements. Collect whatever is available.
         for var in REGISTRY_REQUIRED_VARS:
-            value = os.getenv(var)
+            value = env.get(var)
             if value:
                 config[var] = value
         
@@ -76,7 +147,7 @@ def validate_environment(mode: str = "prod", deploy: str = "ssh") -> Dict[str, s
     
     missing = []
     for var in required_vars:
-        value = os.getenv(var)
+        value = env.get(var)
         if not value:
             missing.append(var)
         else:
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from deployfilegen.exceptions import GenerationError
+
+BUILD_PROFILES = ("standard", "fast")
+INSTALLERS = ("pip", "uv")
+SIZING_PROFILES = ("balanced", "cpu", "memory")
+RUNTIMES = ("slim", "distroless")
+PLATFORMS = ("linux/amd64", "linux/arm64", "linux/arm/v7")
+MAX_TEST_SHARDS = 32
+# Directory levels below the project root searched for extra services (0: backend/ and frontend/ only)
+DEFAULT_DISCOVER_DEPTH = 4
+MAX_DISCOVER_DEPTH = 8
+
+
+@dataclass(frozen=True)
+class GenerationOptions:
+    """
+    User-selected generation options, independent of the project being analyzed.
+    Frozen so it can be hashed into cache keys and shared between workers.
+    """
+    mode: str = "prod"
+    deploy: str = "ssh"
+    with_db: bool = False
+    # Scope Control
+    docker_only: bool = False
+    compose_only: bool = False
+    github_only: bool = False
+    backend_only: bool = False
+    frontend_only: bool = False
+    # Explicit Overrides (Stability Hardening)
+    frontend_port: Optional[int] = None
+    start_command: Optional[str] = None
+    project_name: Optional[str] = None
+    # Build speed
+    build_profile: str = "standard"
+    installer: str = "pip"
+    # Backend runtime base image: python:slim or distroless
+    runtime: str = "slim"
+    # Static files and bytecode built into the image; the entrypoint only execs the server
+    cold_start: bool = False
+    # App server sizing (gunicorn workers/threads derived at container start)
+    sizing: str = "balanced"
+    # Put an nginx reverse proxy in front (serves static/media, proxies the rest)
+    proxy: bool = False
+    # Health-gated rolling replacement of backend/frontend behind the proxy
+    rolling: bool = False
+    # Comma-separated image platforms for --deploy registry
+    platforms: str = "linux/amd64"
+    # CI test stage (gates the deploy); Django tests are split across test_shards runners
+    with_tests: bool = False
+    test_shards: int = 1
+    # Monorepos: every other manage.py / package.json app this deep gets its own image and service
+    discover_depth: int = DEFAULT_DISCOVER_DEPTH
+
+    def __post_init__(self):
+        _check_choice("--build-profile", self.build_profile, BUILD_PROFILES)
+        _check_choice("--installer", self.installer, INSTALLERS)
+        _check_choice("--runtime", self.runtime, RUNTIMES)
+        _check_choice("--sizing", self.sizing, SIZING_PROFILES)
+        if self.rolling and not self.proxy:
+            raise GenerationError("--rolling needs --proxy: traffic is switched between containers by the proxy")
+        if not 1 <= self.test_shards <= MAX_TEST_SHARDS:
+            raise GenerationError(f"--test-shards must be between 1 and {MAX_TEST_SHARDS}")
+        if not 0 <= self.discover_depth <= MAX_DISCOVER_DEPTH:
+            raise GenerationError(f"--discover-depth must be between 0 and {MAX_DISCOVER_DEPTH}")
+        if not self.platform_list:
+            raise GenerationError("--platforms needs at least one platform")
+        for platform in self.platform_list:
+            _check_choice("--platforms", platform, PLATFORMS)
+
+    @property
+    def fast_build(self) -> bool:
+        return self.build_profile == "fast"
+
+    @property
+    def platform_list(self) -> Tuple[str, ...]:
+        """--platforms as an ordered tuple without blanks or duplicates."""
+        names = (name.strip() for name in self.platforms.split(","))
+        return tuple(dict.fromkeys(name for name in names if name))
+
+    @property
+    def do_docker(self) -> bool:
+        return self.docker_only or not (self.compose_only or self.github_only)
+
+    @property
+    def do_compose(self) -> bool:
+        return self.compose_only or not (self.docker_only or self.github_only)
+
+    @property
+    def do_github(self) -> bool:
+        return self.github_only or not (self.docker_only or self.compose_only)
+
+    @property
+    def do_backend(self) -> bool:
+        return self.backend_only or not self.frontend_only
+
+    @property
+    def do_frontend(self) -> bool:
+        return self.frontend_only or not self.backend_only
+
+
+def _check_choice(flag: str, value: str, choices) -> None:
+    if value not in choices:
+        raise GenerationError(f"Invalid value for {flag}: '{value}'. Choose from: {', '.join(choices)}")
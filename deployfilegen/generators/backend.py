@@ -1,77 +1,448 @@
-import re
 from pathlib import Path
+from typing import Optional, Tuple
+
+from deployfilegen.analyzer.profile import BackendProfile, analyze_backend, read_django_project_name
+from deployfilegen.analyzer.requirements import DEBIAN_RELEASE
+from deployfilegen.analyzer.runtimes import DEFAULT_PYTHON_VERSION
+from deployfilegen.config.options import GenerationOptions
 from deployfilegen.utils.logger import logger
 
+# Pinned minor release of the uv installer image (used with --installer uv)
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.5"
+
+# apt packages used when the dependencies were not analyzed (no backend directory):
+# enough to build and run psycopg2, the most common source-built Django dependency.
+DEFAULT_BUILD_PACKAGES = ("gcc", "libpq-dev")
+DEFAULT_RUNTIME_PACKAGES = ("libpq5",)
+
+# gcr.io/distroless/python3-debian12 ships Debian 12's Python
+DISTROLESS_PYTHON_VERSION = "3.11"
+
+# Gunicorn sizing profiles. Workers = cpus * workers_per_cpu + extra_workers,
+# capped by the container memory limit / worker_memory_mb. All values can be
+# overridden at container start through GUNICORN_* environment variables.
+SIZING_PROFILES = {
+    # Mixed I/O: a few processes per core, each with a small thread pool
+    "balanced": {"workers_per_cpu": 1, "extra_workers": 1, "threads": 4, "worker_memory_mb": 256, "preload": False},
+    # CPU-bound views: more processes, no threads (GIL-free parallelism)
+    "cpu": {"workers_per_cpu": 2, "extra_workers": 1, "threads": 1, "worker_memory_mb": 256, "preload": False},
+    # Memory-constrained hosts: fewer processes, more threads, shared preloaded app
+    "memory": {"workers_per_cpu": 0.5, "extra_workers": 1, "threads": 8, "worker_memory_mb": 384, "preload": True},
+}
+
+
 def get_django_project_name(manage_py_path: Path) -> str:
     """
     Parses manage.py to find the Django project name from DJANGO_SETTINGS_MODULE.
     Defaults to 'config' if not found.
     """
-    try:
-        content = manage_py_path.read_text(encoding="utf-8")
-        match = re.search(r"os\.environ\.setdefault\(['\"]DJANGO_SETTINGS_MODULE['\"],\s*['\"](.+?)\.settings['\"]\)", content)
-        if match:
-            project_name = match.group(1)
-            logger.info(f"Detected Django project name: {project_name}")
-            return project_name
-    except Exception as e:
-        logger.warning(f"Failed to parse manage.py: {e}")
-    
-    logger.warning("Could not detect Django project name. Defaulting to 'config'.")
-    return "config"
-
-def generate_backend_dockerfile(mode: str, backend_path: Path, override_project_name: str = None) -> str:
+    return read_django_project_name(manage_py_path)
+
+def generate_backend_dockerfile(mode: str, backend_path: Path = None, override_project_name: str = None,
+                                profile: Optional[BackendProfile] = None,
+                                options: Optional[GenerationOptions] = None) -> str:
     """
     Generates a production-ready or dev Dockerfile for Django.
+    Uses the pre-built profile when given; otherwise analyzes backend_path.
+    options selects the build profile (BuildKit cache mounts) and the installer (pip/uv).
     """
+    options = options or GenerationOptions()
     if mode == "dev":
-        return _generate_dev_dockerfile()
+        return _generate_dev_dockerfile(options, profile)
+    else:
+        if profile is None:
+            profile = analyze_backend(backend_path, override_project_name)
+        return _generate_prod_dockerfile(profile, options)
+
+
+def get_worker_class(profile: BackendProfile, sizing: str = "balanced") -> str:
+    """Picks the gunicorn worker class for the app type and sizing profile."""
+    if profile.server == "asgi":
+        if "uvicorn-worker" in profile.requirements:
+            return "uvicorn_worker.UvicornWorker"
+        return "uvicorn.workers.UvicornWorker"
+    return "gthread" if SIZING_PROFILES[sizing]["threads"] > 1 else "sync"
+
+
+def generate_gunicorn_config(profile: BackendProfile, options: Optional[GenerationOptions] = None) -> str:
+    """
+    Generates gunicorn.conf.py, which sizes workers and threads from the
+    CPU quota and memory limit visible inside the container at start-up.
+    """
+    options = options or GenerationOptions()
+    sizing = SIZING_PROFILES[options.sizing]
+    worker_class = get_worker_class(profile, options.sizing)
+    # Async workers multiplex connections themselves; threads only apply to gthread.
+    threads = sizing["threads"] if worker_class == "gthread" else 1
+    if profile.server == "asgi" and not any(pkg in profile.requirements for pkg in ("uvicorn", "uvicorn-worker")):
+        logger.warning("ASGI app detected but uvicorn is not in requirements.txt. Add 'uvicorn[standard]' for the UvicornWorker.")
+
+    return f"""# Gunicorn configuration generated by deployfilegen ({options.sizing} sizing, {profile.server.upper()})
+# Every value can be overridden at container start with the GUNICORN_* variables below.
+import math
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+def _cpu_limit():
+    # CPUs available to this container: cgroup v2 quota, then affinity, then host count
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+def _memory_limit_mb():
+    # Container memory limit in MB (cgroup v2, then v1), or None when unlimited
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:
+            return int(raw) // (1024 * 1024)
+    return None
+
+
+cpus = _cpu_limit()
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "{worker_class}")
+threads = _env_int("GUNICORN_THREADS", {threads})
+workers = _env_int("GUNICORN_WORKERS", _env_int("WEB_CONCURRENCY", max(1, int(cpus * {sizing["workers_per_cpu"]}) + {sizing["extra_workers"]})))
+
+# Never start more workers than the memory limit can hold
+worker_memory_mb = _env_int("GUNICORN_WORKER_MEMORY_MB", {sizing["worker_memory_mb"]})
+memory_limit_mb = _memory_limit_mb()
+if memory_limit_mb and not (os.getenv("GUNICORN_WORKERS") or os.getenv("WEB_CONCURRENCY")):
+    workers = max(1, min(workers, memory_limit_mb // worker_memory_mb))
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Latency & memory knobs
+preload_app = _env_bool("GUNICORN_PRELOAD", {sizing["preload"]})
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+worker_tmp_dir = "/dev/shm"
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+accesslog = "-"
+errorlog = "-"
+{_health_hook(profile)}"""
+
+
+# Path answered by every worker before Django is involved (used by the HEALTHCHECK)
+HEALTH_PATH = "/healthz"
+
+# HEALTHCHECK probe: stdlib urllib, so the runtime image needs no curl/wget
+HEALTH_PROBE = (
+    'CMD ["python3", "-c", "import urllib.request; '
+    f"urllib.request.urlopen('http://127.0.0.1:8000{HEALTH_PATH}', timeout=2)\"]"
+)
+
+
+def _health_hook(profile: BackendProfile) -> str:
+    """
+    gunicorn post_worker_init hook that wraps the loaded app: requests for
+    HEALTH_PATH get a constant 200 without touching Django middleware, URL
+    resolution or the database. Nothing has to change in the Django project.
+    """
+    if profile.server == "asgi":
+        wrapper = """async def _health_app(scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == HEALTH_PATH:
+            await send({"type": "http.response.start", "status": 200, "headers": HEALTH_HEADERS})
+            await send({"type": "http.response.body", "body": b"ok"})
+            return
+        await app(scope, receive, send)"""
     else:
-        project_name = override_project_name or get_django_project_name(backend_path / "manage.py")
-        return _generate_prod_dockerfile(project_name)
+        wrapper = """def _health_app(environ, start_response):
+        if environ.get("PATH_INFO") == HEALTH_PATH:
+            start_response("200 OK", [(k.decode(), v.decode()) for k, v in HEALTH_HEADERS])
+            return [b"ok"]
+        return app(environ, start_response)"""
+    return f"""
+# Health endpoint answered in front of Django ({profile.server.upper()}); probed by the image HEALTHCHECK
+HEALTH_PATH = "{HEALTH_PATH}"
+HEALTH_HEADERS = [(b"content-type", b"text/plain"), (b"content-length", b"2"), (b"cache-control", b"no-store")]
+
+
+def _with_health(app):
+    {wrapper}
+
+    return _health_app
+
+
+def post_worker_init(worker):
+    worker.wsgi = _with_health(worker.wsgi)
+"""
+
+
+# ─── BUILD SNIPPETS ───────────────────────────────────────────
+
+def _syntax_header(options: GenerationOptions) -> str:
+    """Cache mounts need the BuildKit Dockerfile frontend."""
+    return "# syntax=docker/dockerfile:1\n" if options.fast_build else ""
+
+
+def _apt_install(packages: str, options: GenerationOptions) -> str:
+    if options.fast_build:
+        # Keep the apt index and downloaded .debs in cache mounts instead of the image.
+        return f"""RUN --mount=type=cache,target=/var/cache/apt,sharing=locked \\
+    --mount=type=cache,target=/var/lib/apt,sharing=locked \\
+    rm -f /etc/apt/apt.conf.d/docker-clean \\
+    && apt-get update && apt-get install -y --no-install-recommends {packages}"""
+    return f"""RUN apt-get update && apt-get install -y --no-install-recommends {packages} \\
+    && rm -rf /var/lib/apt/lists/*"""
+
+
+def _build_packages(profile: Optional[BackendProfile]) -> Tuple[str, ...]:
+    if profile is None or profile.build_packages is None:
+        return DEFAULT_BUILD_PACKAGES
+    return profile.build_packages
+
+
+def _runtime_packages(profile: Optional[BackendProfile]) -> Tuple[str, ...]:
+    if profile is None or profile.runtime_packages is None:
+        return DEFAULT_RUNTIME_PACKAGES
+    return profile.runtime_packages
+
+
+def _builder_toolchain(profile: BackendProfile, options: GenerationOptions) -> str:
+    """Compiler and headers, only when a dependency builds from source."""
+    packages = _build_packages(profile)
+    if not packages:
+        return "# Every dependency ships a binary wheel: no compiler toolchain needed"
+    return f"""# Needed to build dependencies from source
+{_apt_install(" ".join(packages), options)}"""
+
+
+# Settings may require secrets at import time; collectstatic at build time gets a placeholder.
+# The image never keeps it: it only exists in the environment of that one RUN.
+BUILD_SECRET_KEY = "collectstatic-build-only"
+
+# Build arg naming a settings module for that collectstatic (settings that need
+# more runtime env than SECRET_KEY), and the Dockerfile comment listing that env.
+BUILD_SETTINGS_ARG = "COLLECTSTATIC_SETTINGS"
+BUILD_ENV_NOTE = "# Settings read without a default at build time: "
+
+# Storage that hashes file names and precompresses them when collected at build time
+RECOMMENDED_STATIC_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+
+def _python_image(profile: Optional[BackendProfile]) -> str:
+    return _slim_image(profile.python_version if profile else DEFAULT_PYTHON_VERSION)
+
+
+def _slim_image(python_version: str) -> str:
+    # Pinned to a Debian release: the apt package names depend on it
+    return f"python:{python_version}-slim-{DEBIAN_RELEASE}"
+
+
+def _uv_setup() -> str:
+    return f"""COPY --from={UV_IMAGE} /uv /usr/local/bin/uv
+ENV UV_LINK_MODE=copy
+"""
+
 
-def _generate_prod_dockerfile(project_name: str) -> str:
-    return f"""# Production Dockerfile for Django
+def _builder_dependencies(options: GenerationOptions) -> str:
+    """Resolves requirements.txt in the builder stage (wheels for pip, a venv for uv)."""
+    if options.installer == "uv":
+        if options.fast_build:
+            install = """RUN --mount=type=cache,target=/root/.cache/uv \\
+    uv venv /opt/venv && uv pip install --python /opt/venv/bin/python -r requirements.txt"""
+        else:
+            install = "RUN uv venv /opt/venv && uv pip install --no-cache --python /opt/venv/bin/python -r requirements.txt"
+        return f"""{_uv_setup()}
+COPY requirements.txt .
+{install}"""
+
+    if options.fast_build:
+        return """COPY requirements.txt .
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip wheel --no-deps --wheel-dir /app/wheels -r requirements.txt"""
+    return """COPY requirements.txt .
+RUN pip wheel --no-cache-dir --no-deps --wheel-dir /app/wheels -r requirements.txt"""
+
+
+def _runner_dependencies(options: GenerationOptions) -> str:
+    """Installs the builder's output into the runner stage."""
+    if options.installer == "uv":
+        return """COPY --from=builder /opt/venv /opt/venv
+COPY --from=builder /app/requirements.txt .
+ENV PATH="/opt/venv/bin:$PATH\""""
+
+    # Bind-mount the wheels so they never become an image layer.
+    return """COPY --from=builder /app/requirements.txt .
+
+RUN --mount=type=bind,from=builder,source=/app/wheels,target=/wheels \\
+    pip install --no-cache-dir /wheels/*"""
+
+
+def _dev_dependencies(options: GenerationOptions) -> str:
+    if options.installer == "uv":
+        if options.fast_build:
+            install = """RUN --mount=type=cache,target=/root/.cache/uv \\
+    uv pip install --system -r requirements.txt"""
+        else:
+            install = "RUN uv pip install --system --no-cache -r requirements.txt"
+        return f"""{_uv_setup()}
+COPY requirements.txt .
+{install}"""
+
+    if options.fast_build:
+        return """COPY requirements.txt .
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip install -r requirements.txt"""
+    return """COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt"""
+
+
+def _check_cold_start_static(profile: BackendProfile) -> None:
+    """Static files baked into the image are served by the app, which needs WhiteNoise."""
+    if "whitenoise" not in profile.requirements:
+        logger.warning("--cold-start serves static files from the image, but whitenoise is not in "
+                       "requirements.txt. Add it and whitenoise.middleware.WhiteNoiseMiddleware.")
+    elif profile.static_storage is None or "Manifest" not in profile.static_storage:
+        logger.info(f"Tip: set STORAGES['staticfiles'] to {RECOMMENDED_STATIC_STORAGE} so static "
+                    "files are hashed and compressed once, at build time.")
+
+
+def _build_env(profile: BackendProfile) -> Tuple[str, ...]:
+    """Env the settings require at import that the build-time collectstatic does not get."""
+    return tuple(name for name in profile.settings_env if name != "SECRET_KEY")
+
+
+def _check_cold_start_env(profile: BackendProfile) -> None:
+    """collectstatic imports the settings during the build, with only a placeholder SECRET_KEY."""
+    missing = _build_env(profile)
+    if missing:
+        logger.warning(f"--cold-start runs collectstatic during the image build with only a placeholder "
+                       f"SECRET_KEY, but the settings read {', '.join(missing)} without a default, so the "
+                       f"build fails. Add defaults or build with --build-arg {BUILD_SETTINGS_ARG}=<settings module>.")
+
+
+def _build_env_comment(profile: BackendProfile) -> str:
+    """Dockerfile comment on the environment the build-time collectstatic runs with."""
+    missing = _build_env(profile)
+    listed = f"{BUILD_ENV_NOTE}{', '.join(missing)}\n" if missing else ""
+    return f"""# collectstatic imports the settings with a placeholder SECRET_KEY and no other runtime
+# env. Settings that need more must provide defaults, or build with
+# --build-arg {BUILD_SETTINGS_ARG}=<module> to use a build-only settings module.
+{listed}"""
+
+
+def _cold_start_step(profile: BackendProfile, options: GenerationOptions) -> str:
+    """collectstatic and compileall as a single build step of the slim runner."""
+    _check_cold_start_static(profile)
+    _check_cold_start_env(profile)
+    compile_paths = "/app /opt/venv" if options.installer == "uv" else "/app"
+    return f"""# Cold start: static files and bytecode are produced once here instead of in every
+# new container. PYTHONDONTWRITEBYTECODE only stops writing .pyc files; these are read.
+# (unchecked-hash: the image is immutable, so sources are never re-checked)
+{_build_env_comment(profile)}ARG {BUILD_SETTINGS_ARG}
+RUN env SECRET_KEY={BUILD_SECRET_KEY} ${{{BUILD_SETTINGS_ARG}:+DJANGO_SETTINGS_MODULE=${BUILD_SETTINGS_ARG}}} \\
+    python manage.py collectstatic --noinput \\
+    && python -m compileall -q -j 0 --invalidation-mode unchecked-hash {compile_paths}
+
+"""
+
+
+def _distroless_cold_start_step(profile: BackendProfile) -> str:
+    """Exec-form variant of _cold_start_step for the shell-less distroless runner."""
+    _check_cold_start_static(profile)
+    _check_cold_start_env(profile)
+    collectstatic = (
+        "import os, runpy, sys; "
+        f"os.environ.setdefault('SECRET_KEY', '{BUILD_SECRET_KEY}'); "
+        f"os.environ.get('{BUILD_SETTINGS_ARG}') and "
+        f"os.environ.update(DJANGO_SETTINGS_MODULE=os.environ['{BUILD_SETTINGS_ARG}']); "
+        "sys.argv = ['manage.py', 'collectstatic', '--noinput']; "
+        "runpy.run_path('manage.py', run_name='__main__')"
+    )
+    return f"""# Cold start: static files and bytecode are produced once here instead of in every new container
+{_build_env_comment(profile)}ARG {BUILD_SETTINGS_ARG}
+USER root
+RUN ["python3", "-c", "{collectstatic}"]
+RUN ["python3", "-m", "compileall", "-q", "-j", "0", "--invalidation-mode", "unchecked-hash", "/app", "/opt/deps"]
+
+"""
+
+
+# ─── DOCKERFILES ──────────────────────────────────────────────
+
+def _generate_prod_dockerfile(profile: BackendProfile, options: Optional[GenerationOptions] = None) -> str:
+    options = options or GenerationOptions()
+    distroless = options.runtime == "distroless"
+    builder_extra = f"\n\n{_distroless_dependencies(options)}" if distroless else ""
+    # The builder's Python must match the runner's for the compiled wheels to load
+    builder_image = _slim_image(DISTROLESS_PYTHON_VERSION) if distroless else _python_image(profile)
+    if distroless and profile.python_version != DISTROLESS_PYTHON_VERSION:
+        logger.warning(f"distroless python3-debian12 ships Python {DISTROLESS_PYTHON_VERSION}, not "
+                       f"{profile.python_version}; dependencies are built for {DISTROLESS_PYTHON_VERSION}. "
+                       "Use --runtime slim to run the pinned version.")
+    return f"""{_syntax_header(options)}# Production Dockerfile for Django
 
 # Stage 1: Builder
-FROM python:3.11-slim as builder
+FROM {builder_image} as builder
 
 WORKDIR /app
 
 ENV PYTHONDONTWRITEBYTECODE 1
 ENV PYTHONUNBUFFERED 1
 
-RUN apt-get update && apt-get install -y --no-install-recommends gcc libpq-dev \\
-    && rm -rf /var/lib/apt/lists/*
+{_builder_toolchain(profile, options)}
 
-COPY requirements.txt .
-RUN pip wheel --no-cache-dir --no-deps --wheel-dir /app/wheels -r requirements.txt
+{_builder_dependencies(options)}{builder_extra}
+
+{_distroless_runner(profile, options) if distroless else _slim_runner(profile, options)}"""
 
-# Stage 2: Runner
-FROM python:3.11-slim
+
+def _slim_runner(profile: BackendProfile, options: GenerationOptions) -> str:
+    runtime_packages = _runtime_packages(profile)
+    if runtime_packages:
+        runtime_libs = f"""# Runtime libraries only (headers and compilers stay in the builder)
+{_apt_install(" ".join(runtime_packages), options)}"""
+    else:
+        runtime_libs = "# No native runtime libraries needed"
+    return f"""# Stage 2: Runner
+FROM {_python_image(profile)}
 
 WORKDIR /app
 
 ENV PYTHONDONTWRITEBYTECODE 1
 ENV PYTHONUNBUFFERED 1
 
-RUN apt-get update && apt-get install -y --no-install-recommends libpq-dev curl \\
-    && rm -rf /var/lib/apt/lists/*
+{runtime_libs}
 
-# Create non-root user
-RUN addgroup --system appgroup && adduser --system --group appuser
+# Create non-root user; it owns the app dir and the static/media mount points
+RUN addgroup --system appgroup && adduser --system --group appuser \\
+    && mkdir -p /app/static /app/media \\
+    && chown appuser:appgroup /app /app/static /app/media
 
-COPY --from=builder /app/wheels /wheels
-COPY --from=builder /app/requirements.txt .
+{_runner_dependencies(options)}
 
-RUN pip install --no-cache-dir /wheels/*
+# Owned by the non-root user as it is copied (no second chown'd copy of the app layer)
+COPY --chown=appuser:appgroup . .
 
-COPY . .
-
-# Change ownership to non-root user
-RUN chown -R appuser:appgroup /app
-
-# Ensure entrypoint is executable
+{_cold_start_step(profile, options) if options.cold_start else ""}# Ensure entrypoint is executable
 COPY --chmod=755 ./entrypoint.sh /entrypoint.sh
 
 # Switch to non-root user
@@ -80,23 +451,86 @@ USER appuser
 # Expose port
 EXPOSE 8000
 
-# Healthcheck
+# Healthcheck: {HEALTH_PATH} is answered by gunicorn.conf.py before Django; stdlib probe
 HEALTHCHECK --interval=30s --timeout=3s --start-period=30s --retries=3 \\
-    CMD curl --silent --output /dev/null http://localhost:8000/ || exit 1
+    {HEALTH_PROBE}
 
 # Runtime Entrypoint (Handles migrations/static)
 # Ensure your Django settings define STATIC_ROOT = /app/static
 ENTRYPOINT ["/entrypoint.sh"]
 
 # Run gunicorn
-# Uses the dynamically detected project name from manage.py
-CMD ["gunicorn", "{project_name}.wsgi:application", "--bind", "0.0.0.0:8000", "--workers", "3"]
+# Uses the dynamically detected project name from manage.py.
+# Workers, threads and worker class are sized at start-up by gunicorn.conf.py.
+CMD ["gunicorn", "{profile.project_name}.{profile.server}:application", "--config", "gunicorn.conf.py"]
 """
 
-def generate_entrypoint_script() -> str:
+
+def _distroless_dependencies(options: GenerationOptions) -> str:
+    """Installs the dependencies into a plain directory the distroless runner puts on PYTHONPATH."""
+    if options.installer == "uv":
+        # Reuse the resolved venv's packages; the venv's interpreter links do not exist in distroless
+        install = f"RUN cp -r /opt/venv/lib/python{DISTROLESS_PYTHON_VERSION}/site-packages /opt/deps"
+    else:
+        install = "RUN pip install --no-cache-dir --no-deps --target /opt/deps /app/wheels/*"
+    return f"""# The distroless runner has no pip or shell: stage dependencies and writable dirs here
+{install}
+RUN mkdir -p /out/static /out/media"""
+
+
+def _distroless_runner(profile: BackendProfile, options: GenerationOptions) -> str:
+    if options.cold_start:
+        static_note = "# Static files were collected into the image above (--cold-start)"
+    else:
+        static_note = """# No shell, so no entrypoint.sh: collect static files once per release with
+#   docker compose -f docker-compose.prod.yml run --rm backend python3 manage.py collectstatic --noinput"""
+    if profile.runtime_packages:
+        logger.warning(f"distroless runtime cannot install {' '.join(profile.runtime_packages)}: "
+                       "switch to binary wheels (psycopg2-binary or psycopg[binary] instead of psycopg2).")
+    return f"""# Stage 2: Runner (distroless: Python and its runtime libraries only; no shell or package manager)
+FROM gcr.io/distroless/python3-debian12:nonroot
+
+WORKDIR /app
+
+ENV PYTHONDONTWRITEBYTECODE 1
+ENV PYTHONUNBUFFERED 1
+ENV PYTHONPATH=/opt/deps
+
+COPY --from=builder /opt/deps /opt/deps
+# Static/media mount points owned by the runtime user
+COPY --from=builder --chown=nonroot:nonroot /out/ /app/
+COPY --chown=nonroot:nonroot . .
+
+{_distroless_cold_start_step(profile) if options.cold_start else ""}USER nonroot
+
+EXPOSE 8000
+
+# Healthcheck: {HEALTH_PATH} is answered by gunicorn.conf.py before Django; stdlib probe
+HEALTHCHECK --interval=30s --timeout=3s --start-period=30s --retries=3 \\
+    {HEALTH_PROBE}
+
+{static_note}
+# Ensure your Django settings define STATIC_ROOT = /app/static
+ENTRYPOINT []
+CMD ["python3", "-m", "gunicorn", "{profile.project_name}.{profile.server}:application", "--config", "gunicorn.conf.py"]
+"""
+
+def generate_entrypoint_script(cold_start: bool = False) -> str:
     """
     Generates a production entrypoint script for Django.
+    With cold_start, static files are already in the image and it only execs the server.
     """
+    if cold_start:
+        return """#!/bin/sh
+
+# Cold-start mode: static files and bytecode were built into the image,
+# so nothing runs before the server starts.
+
+# Run migrations (Optional - caution in clustered envs)
+# python manage.py migrate --noinput
+
+exec "$@"
+"""
     return """#!/bin/sh
 
 # Exit immediately if a command exits with a non-zero status
@@ -114,20 +548,23 @@ python manage.py collectstatic --noinput
 exec "$@"
 """
 
-def _generate_dev_dockerfile() -> str:
-    return """# Development Dockerfile for Django
-FROM python:3.11-slim
+def _generate_dev_dockerfile(options: Optional[GenerationOptions] = None,
+                             profile: Optional[BackendProfile] = None) -> str:
+    options = options or GenerationOptions()
+    # Single stage: dependencies are built and run in the same image
+    packages = tuple(dict.fromkeys(_build_packages(profile) + _runtime_packages(profile)))
+    system_packages = _apt_install(" ".join(packages), options) if packages else "# No system packages needed"
+    return f"""{_syntax_header(options)}# Development Dockerfile for Django
+FROM {_python_image(profile)}
 
 WORKDIR /app
 
 ENV PYTHONDONTWRITEBYTECODE 1
 ENV PYTHONUNBUFFERED 1
 
-RUN apt-get update && apt-get install -y --no-install-recommends gcc libpq-dev \\
-    && rm -rf /var/lib/apt/lists/*
+{system_packages}
 
-COPY requirements.txt .
-RUN pip install --no-cache-dir -r requirements.txt
+{_dev_dependencies(options)}
 
 COPY . .
 
@@ -0,0 +1,105 @@
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+
+BACKEND_DOCKERIGNORE = "venv/\n__pycache__/\n*.pyc\n.git/\n.env\nstatic/\nmedia/\ntests/\ndb.sqlite3\n.coverage\n"
+FRONTEND_DOCKERIGNORE = "node_modules/\nbuild/\ndist/\n.next/\n.vite/\ncoverage/\n.git/\n.env\n.cache/\n"
+
+
+def _relative(profile: ProjectProfile, path, name: str) -> str:
+    return (path / name).relative_to(profile.root).as_posix()
+
+
+def render_artifacts(profile: ProjectProfile, config: dict, options: GenerationOptions,
+                     progress: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+    """
+    Runs every generator selected by options against the profile.
+    Returns an ordered mapping of project-relative POSIX path -> file content.
+    Nothing is written to disk.
+    """
+    return dict(iter_artifacts(profile, config, options, progress))
+
+
+def iter_artifacts(profile: ProjectProfile, config: dict, options: GenerationOptions,
+                   progress: Optional[Callable[[str], None]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Lazy form of render_artifacts: yields (relpath, content) pairs in the same
+    order, running each generator only when its output is requested.
+    """
+    say = progress or (lambda message: None)
+    mode = options.mode
+
+    # Backend Dockerfiles (backend/ first, then services discovered elsewhere)
+    if options.do_docker and options.do_backend and profile.backends:
+        from deployfilegen.generators.backend import (
+            generate_backend_dockerfile,
+            generate_entrypoint_script,
+            generate_gunicorn_config,
+        )
+
+        for backend in profile.backends:
+            say("Generating Backend Dockerfile..." if backend is profile.backend
+                else f"Generating Backend Dockerfile for service '{backend.service}'...")
+            backend_path = backend.path
+            yield _relative(profile, backend_path, "Dockerfile"), generate_backend_dockerfile(
+                mode, profile=backend, options=options)
+            yield _relative(profile, backend_path, ".dockerignore"), BACKEND_DOCKERIGNORE
+
+            # entrypoint.sh and gunicorn.conf.py for production
+            if mode == "prod":
+                # The distroless runner has no shell to run entrypoint.sh
+                if options.runtime != "distroless":
+                    yield _relative(profile, backend_path, "entrypoint.sh"), generate_entrypoint_script(options.cold_start)
+                yield _relative(profile, backend_path, "gunicorn.conf.py"), generate_gunicorn_config(
+                    backend, options)
+
+    # Frontend Dockerfiles
+    if options.do_docker and options.do_frontend and profile.frontends:
+        from deployfilegen.generators.frontend import generate_frontend_dockerfile, generate_nginx_config
+
+        for frontend in profile.frontends:
+            say("Generating Frontend Dockerfile..." if frontend is profile.frontend
+                else f"Generating Frontend Dockerfile for service '{frontend.service}'...")
+            frontend_path = frontend.path
+            yield _relative(profile, frontend_path, "Dockerfile"), generate_frontend_dockerfile(mode, profile=frontend)
+            yield _relative(profile, frontend_path, ".dockerignore"), FRONTEND_DOCKERIGNORE
+            # Next.js runs its own standalone server; nginx.conf is for static builds
+            if mode == "prod" and frontend.framework != "next":
+                yield _relative(profile, frontend_path, "nginx.conf"), generate_nginx_config(frontend)
+
+    # docker-compose.yml
+    if options.do_compose:
+        from deployfilegen.generators.compose import generate_docker_compose
+
+        say("Generating Docker Compose...")
+        compose_filename = "docker-compose.prod.yml" if mode == "prod" else "docker-compose.dev.yml"
+        yield compose_filename, generate_docker_compose(mode, config, with_db=options.with_db,
+                                                        deploy=options.deploy, profile=profile,
+                                                        proxy=options.proxy, cold_start=options.cold_start)
+        if mode == "prod" and options.proxy:
+            from deployfilegen.generators.proxy import PROXY_CONFIG_PATH, generate_proxy_config
+
+            yield PROXY_CONFIG_PATH, generate_proxy_config(profile, cold_start=options.cold_start)
+
+    # GitHub Actions (prod only)
+    if options.do_github and mode == "prod":
+        from deployfilegen.generators.github import generate_github_workflow
+
+        say(f"Generating GitHub Actions workflow ({options.deploy} strategy)...")
+        yield ".github/workflows/deploy.yml", generate_github_workflow(
+            config, deploy=options.deploy, platforms=options.platform_list, profile=profile,
+            with_tests=options.with_tests, test_shards=options.test_shards, rolling=options.rolling)
+        from deployfilegen.generators.compose import deployed_services
+        from deployfilegen.generators.scripts import (
+            BUILD_SCRIPT_PATH,
+            ROLLOUT_SCRIPT_PATH,
+            generate_build_script,
+            generate_rollout_script,
+        )
+
+        services = tuple(name for name, _ in deployed_services(profile))
+        if options.deploy == "ssh":
+            yield BUILD_SCRIPT_PATH, generate_build_script(services)
+        if options.rolling:
+            yield ROLLOUT_SCRIPT_PATH, generate_rollout_script(services)
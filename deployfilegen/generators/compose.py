@@ -1,27 +1,79 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.generators.proxy import PROXY_CONFIG_PATH
+from deployfilegen.utils.logger import logger
+
+# First host ports published for services discovered outside backend/ and frontend/
+EXTRA_BACKEND_HOST_PORT = 8001
+EXTRA_FRONTEND_HOST_PORT = 8081
+
+# (compose service, build context) of the services built when no project was analyzed
+DEFAULT_SERVICES = (("backend", "backend"), ("frontend", "frontend"))
+
+
+def deployed_services(profile: Optional[ProjectProfile]) -> Tuple[Tuple[str, str], ...]:
+    """
+    (compose service, build context relative to the project root) of every
+    service that gets an image: backend/ and frontend/ when they were
+    detected, then the discovered services. Compose, deploy/build.sh,
+    deploy/rollout.sh and the registry workflow all use this one list.
+    """
+    if profile is None:
+        return DEFAULT_SERVICES
+    services = [profile.backend, profile.frontend, *profile.extra_backends, *profile.extra_frontends]
+    return tuple((service.service, service.path.relative_to(profile.root).as_posix())
+                 for service in services if service is not None and service.path is not None)
 
 
 def generate_docker_compose(mode: str, config: dict, with_db: bool = False,
                             env_files: Optional[List[Path]] = None,
                             project_root: Optional[Path] = None,
                             frontend_port: int = 3000,
-                            deploy: str = "ssh") -> str:
+                            deploy: str = "ssh",
+                            profile: Optional[ProjectProfile] = None,
+                            proxy: bool = False,
+                            cold_start: bool = False) -> str:
     """
     Generates docker-compose.yml for production or dev.
     
+    When a profile is given, env files, project root and the frontend dev
+    port are taken from it instead of the individual arguments.
+    
     Deploy strategy only affects prod mode:
       - 'ssh': services use build: (images built on server)
       - 'registry': services use image: (images pulled from registry)
     
+    With proxy=True (prod only), an nginx 'proxy' service becomes the only
+    published port: it serves /static and /media from the shared volumes and
+    proxies the rest to backend/frontend (see generators/proxy.py).
+    
+    With cold_start (prod only), static files are part of the backend image,
+    so no static volume is mounted over them.
+    
+    Services discovered outside backend/ and frontend/ (profile.extra_*) get
+    their own compose service, built from their directory. backend and
+    frontend are only emitted when they were detected (see deployed_services).
+    
     Dev mode always uses build: with volume mounts.
     """
+    if profile is not None:
+        env_files = list(profile.env_files)
+        project_root = profile.root
+        if profile.frontend is not None:
+            frontend_port = profile.frontend.dev_port
+
     env_file_refs = _compute_env_refs(env_files, project_root)
+    extra_services = _extra_services(profile, mode, env_file_refs, deploy, with_db, proxy, frontend_port)
+    services = {name for name, _ in deployed_services(profile)}
+    primary = {"backend": "backend" in services, "frontend": "frontend" in services}
     
     if mode == "dev":
-        return _generate_dev_compose(with_db, env_file_refs, frontend_port)
+        return _generate_dev_compose(with_db, env_file_refs, frontend_port, extra_services, **primary)
     else:
-        return _generate_prod_compose(with_db, env_file_refs, deploy)
+        return _generate_prod_compose(with_db, env_file_refs, deploy, proxy=proxy, cold_start=cold_start,
+                                      extra_services=extra_services, **primary)
 
 
 def _compute_env_refs(env_files: Optional[List[Path]], project_root: Optional[Path]) -> List[str]:
@@ -45,13 +97,16 @@ def _build_env_file_block(env_file_refs: List[str]) -> str:
 
 # ─── PRODUCTION ───────────────────────────────────────────────
 
-def _generate_prod_compose(with_db: bool, env_file_refs: List[str], deploy: str) -> str:
+def _generate_prod_compose(with_db: bool, env_file_refs: List[str], deploy: str, proxy: bool = False,
+                           cold_start: bool = False, extra_services: str = "",
+                           backend: bool = True, frontend: bool = True) -> str:
     env_block = _build_env_file_block(env_file_refs)
     
     # Deploy strategy determines how services reference images
     if deploy == "registry":
-        backend_source = "    image: ${BACKEND_IMAGE_NAME}:${IMAGE_TAG:-latest}"
-        frontend_source = "    image: ${FRONTEND_IMAGE_NAME}:${IMAGE_TAG:-latest}"
+        # Per-service tags let CI redeploy one component without touching the other
+        backend_source = "    image: ${BACKEND_IMAGE_NAME}:${BACKEND_IMAGE_TAG:-${IMAGE_TAG:-latest}}"
+        frontend_source = "    image: ${FRONTEND_IMAGE_NAME}:${FRONTEND_IMAGE_TAG:-${IMAGE_TAG:-latest}}"
     else:  # ssh
         backend_source = "    build:\n      context: ./backend"
         frontend_source = "    build:\n      context: ./frontend"
@@ -79,32 +134,62 @@ def _generate_prod_compose(with_db: bool, env_file_refs: List[str], deploy: str)
       db:
         condition: service_healthy"""
 
-    return f"""services:
+    # A volume over /app/static would hide the files collected into the image
+    static_mount = "" if cold_start else "\n      - static_volume:/app/static"
+    proxy_static_mount = "" if cold_start else "\n      - static_volume:/app/static:ro"
+    static_volume = "" if cold_start else "\n  static_volume:"
+
+    # Behind the proxy only nginx publishes a port; app containers are internal.
+    if proxy:
+        backend_ports = '    expose:\n      - "8000"'
+        frontend_ports = '    expose:\n      - "8080"'
+        proxy_depends = "".join(f"\n      - {name}" for name, present in (("backend", backend), ("frontend", frontend))
+                                if present)
+        proxy_service = f"""
+  proxy:
+    image: nginxinc/nginx-unprivileged:alpine
+    restart: always
+    ports:
+      - "80:8080"
+    volumes:
+      - ./{PROXY_CONFIG_PATH}:/etc/nginx/conf.d/default.conf:ro{proxy_static_mount}
+      - media_volume:/app/media:ro
+    depends_on:{proxy_depends}
+    networks:
+      - app-network
+"""
+    else:
+        backend_ports = '    ports:\n      - "8000:8000"'
+        frontend_ports = '    ports:\n      - "80:8080"'
+        proxy_service = ""
+
+    # Backslashes are not allowed inside f-string expressions before Python 3.12.
+    db_volume = "\n  postgres_data:" if with_db else ""
+
+    backend_service = f"""
   backend:
 {backend_source}
 {env_block}
     restart: always{db_depends}
-    ports:
-      - "8000:8000"
-    volumes:
-      - static_volume:/app/static
+{backend_ports}
+    volumes:{static_mount}
       - media_volume:/app/media
     networks:
       - app-network
-{db_service}
+""" if backend else ""
+    frontend_depends = "\n    depends_on:\n      - backend" if backend else ""
+    frontend_service = f"""
   frontend:
 {frontend_source}
     restart: always
-    ports:
-      - "80:8080"
-    depends_on:
-      - backend
+{frontend_ports}{frontend_depends}
     networks:
-      - app-network
+      - app-network""" if frontend else ""
 
-volumes:
-  static_volume:
-  media_volume:{"\\n  postgres_data:" if with_db else ""}
+    return f"""services:{backend_service}{db_service}{frontend_service}{extra_services}
+{proxy_service}
+volumes:{static_volume}
+  media_volume:{db_volume}
 
 networks:
   app-network:
@@ -114,7 +199,8 @@ networks:
 
 # ─── DEVELOPMENT ──────────────────────────────────────────────
 
-def _generate_dev_compose(with_db: bool, env_file_refs: List[str], frontend_port: int = 3000) -> str:
+def _generate_dev_compose(with_db: bool, env_file_refs: List[str], frontend_port: int = 3000,
+                          extra_services: str = "", backend: bool = True, frontend: bool = True) -> str:
     env_block = _build_env_file_block(env_file_refs)
     
     db_service = ""
@@ -135,7 +221,9 @@ def _generate_dev_compose(with_db: bool, env_file_refs: List[str], frontend_port
     depends_on:
       - db"""
 
-    return f"""services:
+    db_volumes_block = "\nvolumes:\n  postgres_data:" if with_db else ""
+
+    backend_service = f"""
   backend:
     build:
       context: ./backend
@@ -146,7 +234,9 @@ def _generate_dev_compose(with_db: bool, env_file_refs: List[str], frontend_port
       - ./backend:/app
     networks:
       - app-network
-{db_service}
+""" if backend else ""
+    frontend_depends = "\n    depends_on:\n      - backend" if backend else ""
+    frontend_service = f"""
   frontend:
     build:
       context: ./frontend
@@ -154,15 +244,112 @@ def _generate_dev_compose(with_db: bool, env_file_refs: List[str], frontend_port
       - "{frontend_port}:{frontend_port}"
     volumes:
       - ./frontend:/app
-      - /app/node_modules
-    depends_on:
-      - backend
+      - /app/node_modules{frontend_depends}
     stdin_open: true
     tty: true
     networks:
-      - app-network
-{"\\nvolumes:\\n  postgres_data:" if with_db else ""}
+      - app-network""" if frontend else ""
+
+    return f"""services:{backend_service}{db_service}{frontend_service}{extra_services}
+{db_volumes_block}
 networks:
   app-network:
     driver: bridge
 """
+
+
+# ─── DISCOVERED SERVICES ──────────────────────────────────────
+
+def image_variable(service: str) -> str:
+    return service.upper().replace("-", "_")
+
+
+def _extra_services(profile: Optional[ProjectProfile], mode: str, env_file_refs: List[str], deploy: str,
+                    with_db: bool, proxy: bool, frontend_port: int) -> str:
+    """
+    Compose services for profile.extra_backends / extra_frontends, each
+    starting with a blank line. Published host ports count up from
+    EXTRA_*_HOST_PORT (prod) or the service's own dev port (dev) so they do
+    not clash; behind the proxy they are only exposed.
+    """
+    if profile is None or not (profile.extra_backends or profile.extra_frontends):
+        return ""
+    env_block = _build_env_file_block(env_file_refs)
+    used_ports = {8000, 80, frontend_port, 5432}
+
+    def host_port(preferred: int) -> int:
+        while preferred in used_ports:
+            preferred += 1
+        used_ports.add(preferred)
+        return preferred
+
+    def context(service) -> str:
+        return f"./{service.path.relative_to(profile.root).as_posix()}"
+
+    blocks = []
+    if mode == "dev":
+        db_depends = "\n    depends_on:\n      - db" if with_db else ""
+        for backend in profile.extra_backends:
+            blocks.append(f"""
+  {backend.service}:
+    build:
+      context: {context(backend)}
+{env_block}{db_depends}
+    ports:
+      - "{host_port(EXTRA_BACKEND_HOST_PORT)}:8000"
+    volumes:
+      - {context(backend)}:/app
+    networks:
+      - app-network""")
+        for frontend in profile.extra_frontends:
+            blocks.append(f"""
+  {frontend.service}:
+    build:
+      context: {context(frontend)}
+    ports:
+      - "{host_port(frontend.dev_port)}:{frontend.dev_port}"
+    volumes:
+      - {context(frontend)}:/app
+      - /app/node_modules
+    stdin_open: true
+    tty: true
+    networks:
+      - app-network""")
+        return "\n" + "\n".join(blocks)
+
+    if deploy == "registry":
+        variables = ", ".join(f"{image_variable(s.service)}_IMAGE_NAME"
+                              for s in profile.extra_backends + profile.extra_frontends)
+        logger.warning(f"Add {variables} to the repository secrets: the deploy workflow builds "
+                       f"and pushes those services too.")
+
+    def source(service) -> str:
+        if deploy == "registry":
+            variable = image_variable(service.service)
+            return f"    image: ${{{variable}_IMAGE_NAME}}:${{{variable}_IMAGE_TAG:-${{IMAGE_TAG:-latest}}}}"
+        return f"    build:\n      context: {context(service)}"
+
+    def ports(preferred: int, container_port: int) -> str:
+        if proxy:
+            return f'    expose:\n      - "{container_port}"'
+        return f'    ports:\n      - "{host_port(preferred)}:{container_port}"'
+
+    db_depends = "\n    depends_on:\n      db:\n        condition: service_healthy" if with_db else ""
+    for backend in profile.extra_backends:
+        blocks.append(f"""
+  {backend.service}:
+{source(backend)}
+{env_block}
+    restart: always{db_depends}
+{ports(EXTRA_BACKEND_HOST_PORT, 8000)}
+    networks:
+      - app-network""")
+    for frontend in profile.extra_frontends:
+        blocks.append(f"""
+  {frontend.service}:
+{source(frontend)}
+    restart: always
+{ports(EXTRA_FRONTEND_HOST_PORT, 8080)}
+    networks:
+      - app-network""")
+    return "\n" + "\n".join(blocks)
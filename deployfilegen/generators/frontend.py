@@ -1,6 +1,12 @@
-import json
 from pathlib import Path
-from deployfilegen.utils.logger import logger
+from typing import Optional
+
+from deployfilegen.analyzer.profile import (
+    FrontendProfile,
+    analyze_frontend,
+    frontend_info_from_package,
+    read_package_json,
+)
 
 
 def detect_frontend_framework(frontend_path: Path, 
@@ -8,149 +14,332 @@ def detect_frontend_framework(frontend_path: Path,
                               override_cmd: str = None) -> dict:
     """
     Detects the frontend framework from package.json with support for explicit overrides.
-    Returns a dict with: framework, dev_cmd, dev_port
+    Returns a dict with: framework, dev_cmd, dev_port, scripts
     """
-    result = {"framework": "unknown", "dev_cmd": override_cmd or "dev", "dev_port": override_port or 3000}
-    
-    try:
-        pkg_json = json.loads((frontend_path / "package.json").read_text(encoding="utf-8"))
-        all_deps = {}
-        all_deps.update(pkg_json.get("dependencies", {}))
-        all_deps.update(pkg_json.get("devDependencies", {}))
-        scripts = pkg_json.get("scripts", {})
-        
-        # Detect framework
-        if "vite" in all_deps:
-            result["framework"] = "vite"
-            result["dev_port"] = override_port or 5173
-            result["dev_cmd"] = override_cmd or "dev"
-            logger.info("Detected Vite frontend framework")
-        elif "next" in all_deps:
-            result["framework"] = "next"
-            result["dev_port"] = override_port or 3000
-            result["dev_cmd"] = override_cmd or "dev"
-            logger.info("Detected Next.js frontend framework")
-        elif "react-scripts" in all_deps:
-            result["framework"] = "cra"
-            result["dev_port"] = override_port or 3000
-            result["dev_cmd"] = override_cmd or "start"
-            logger.info("Detected Create React App frontend framework")
-        else:
-            # Fallback: check scripts logic only if no override provided
-            if not override_cmd:
-                if "dev" in scripts:
-                    result["dev_cmd"] = "dev"
-                elif "start" in scripts:
-                    result["dev_cmd"] = "start"
-
-        # VALIDATION: Check if the final command exists in scripts
-        # We check both the detected and the overridden command
-        final_cmd = result["dev_cmd"]
-        if final_cmd not in scripts:
-            logger.warning(f"⚠️  Command '{final_cmd}' NOT found in package.json scripts! The container might fail to start.")
-            logger.warning(f"Available scripts: {', '.join(scripts.keys())}")
-                
-    except Exception as e:
-        logger.warning(f"Could not read package.json: {e}")
-    
-    return result
+    return frontend_info_from_package(read_package_json(frontend_path), override_port, override_cmd)
 
 
 def generate_frontend_dockerfile(mode: str, frontend_path: Path = None, 
                                  override_port: int = None, 
-                                 override_cmd: str = None) -> str:
+                                 override_cmd: str = None,
+                                 profile: Optional[FrontendProfile] = None) -> str:
     """
     Generates a production-ready or dev Dockerfile for React/Next.js/Vite.
+    Uses the pre-built profile when given; otherwise analyzes frontend_path.
     """
-    framework_info = {"framework": "unknown", "dev_cmd": override_cmd or "dev", "dev_port": override_port or 3000}
-    if frontend_path:
-        framework_info = detect_frontend_framework(frontend_path, override_port, override_cmd)
+    if profile is None:
+        profile = analyze_frontend(frontend_path, override_port, override_cmd)
     
     if mode == "dev":
-        return _generate_dev_dockerfile(framework_info)
+        return _generate_dev_dockerfile(profile)
     else:
-        return _generate_prod_dockerfile(framework_info)
+        return _generate_prod_dockerfile(profile)
 
 
-def get_frontend_dev_port(frontend_path: Path = None, override_port: int = None) -> int:
+def get_frontend_dev_port(frontend_path: Path = None, override_port: int = None,
+                          profile: Optional[FrontendProfile] = None) -> int:
     """Public helper: returns the detected dev port for use by compose generator."""
     if override_port:
         return override_port
+    if profile is not None:
+        return profile.dev_port
     if frontend_path:
-        info = detect_frontend_framework(frontend_path)
-        return info["dev_port"]
+        return analyze_frontend(frontend_path).dev_port
     return 3000
 
 
-def _generate_prod_dockerfile(framework_info: dict) -> str:
-    # For prod, Vite outputs to 'dist', CRA outputs to 'build'
-    build_output = "dist" if framework_info["framework"] == "vite" else "build"
-    
-    return f"""# Production Dockerfile for React
+# Per package manager: extra setup, store cache directory, install commands
+# (frozen for lockfile builds) and the prefixes used to run scripts/binaries.
+PACKAGE_MANAGERS = {
+    "npm": {
+        "setup": "",
+        "store": "/root/.npm",
+        "frozen_install": "npm ci --legacy-peer-deps",
+        "install": "npm install --legacy-peer-deps",
+        "run": ["npm", "run"],
+        "exec": ["npx"],
+    },
+    "pnpm": {
+        "setup": "ENV COREPACK_ENABLE_DOWNLOAD_PROMPT=0\nRUN corepack enable\n",
+        "store": "/pnpm/store",
+        "frozen_install": "pnpm install --frozen-lockfile --store-dir /pnpm/store",
+        "install": "pnpm install --store-dir /pnpm/store",
+        "run": ["pnpm", "run"],
+        "exec": ["pnpm", "exec"],
+    },
+    "yarn": {
+        "setup": "",
+        "store": "/usr/local/share/.cache/yarn",
+        "frozen_install": "yarn install --frozen-lockfile",
+        "install": "yarn install",
+        "run": ["yarn", "run"],
+        "exec": ["yarn"],
+    },
+    "yarn-berry": {
+        "setup": "ENV COREPACK_ENABLE_DOWNLOAD_PROMPT=0\nRUN corepack enable\n",
+        "store": "/root/.yarn/berry/cache",
+        "frozen_install": "yarn install --immutable",
+        "install": "yarn install",
+        "run": ["yarn", "run"],
+        "exec": ["yarn"],
+    },
+    "bun": {
+        # {variant}: the bun build for the base image's libc (alpine/musl or slim/glibc)
+        "setup": "COPY --from=oven/bun:1-{variant} /usr/local/bin/bun /usr/local/bin/bun\n",
+        "store": "/root/.bun/install/cache",
+        "frozen_install": "bun install --frozen-lockfile",
+        "install": "bun install",
+        "run": ["bun", "run"],
+        "exec": ["bun", "x"],
+    },
+}
+
+
+def _install_block(profile: FrontendProfile, frozen: bool) -> str:
+    """COPY of the manifests plus a dependency install with the store in a BuildKit cache mount."""
+    pm = PACKAGE_MANAGERS[profile.package_manager]
+    manifests = ["package.json"]
+    if profile.lockfile:
+        manifests.append(profile.lockfile)
+    manifests.extend(profile.install_config_files)
+    install = pm["frozen_install"] if frozen and profile.lockfile else pm["install"]
+    setup = pm["setup"].replace("{variant}", profile.node_variant)
+    return f"""{setup}COPY {" ".join(manifests)} ./
+RUN --mount=type=cache,target={pm["store"]} \\
+    {install}"""
+
+
+def _node_image(profile: FrontendProfile) -> str:
+    """node:<major>-alpine, or -slim (glibc) when native modules would build from source on musl."""
+    return f"node:{profile.node_version}-{profile.node_variant}"
+
+
+def _exec_form(args) -> str:
+    return "[" + ", ".join(f'"{arg}"' for arg in args) + "]"
+
+
+# Text assets worth precompressing for gzip_static / brotli_static
+# Static file written into the Next.js image and served from public/ by the
+# standalone server; its HEALTHCHECK probes this instead of rendering a page.
+NEXT_HEALTH_PATH = "/healthz.txt"
+
+PRECOMPRESS_EXTENSIONS = ("js", "mjs", "css", "html", "svg", "json", "txt", "xml", "wasm", "map")
+
+# Directories holding content-hashed (fingerprinted) files, relative to the web root
+HASHED_ASSET_DIRS = {
+    "vite": ("assets",),
+    "cra": ("static",),
+}
+
+
+def get_build_output(profile: FrontendProfile) -> str:
+    """For prod, Vite outputs to 'dist', CRA (and the rest) to 'build'."""
+    return "dist" if profile.framework == "vite" else "build"
+
+
+def generate_nginx_config(profile: FrontendProfile) -> str:
+    """
+    Generates an nginx server block for serving the SPA build: precompressed
+    gzip/brotli files, immutable caching for fingerprinted assets and
+    index.html fallback for client-side routing.
+    """
+    asset_dirs = HASHED_ASSET_DIRS.get(profile.framework, ("assets", "static"))
+    asset_locations = "\n".join(f"""    location /{directory}/ {{
+        add_header Cache-Control "public, max-age=31536000, immutable";
+        access_log off;
+        try_files $uri =404;
+    }}
+""" for directory in asset_dirs)
+
+    return f"""# nginx config generated by deployfilegen for the {profile.framework} build
+# Installed as /etc/nginx/conf.d/default.conf in the frontend image.
+server {{
+    listen 8080;
+    server_name _;
+    root /usr/share/nginx/html;
+    index index.html;
+
+    # Serve the .gz files precompressed in the builder stage; compress anything else on the fly
+    gzip on;
+    gzip_static on;
+    gzip_vary on;
+    gzip_comp_level 5;
+    gzip_min_length 1024;
+    gzip_proxied any;
+    gzip_types text/plain text/css text/xml application/javascript application/json
+               application/xml application/wasm image/svg+xml;
+
+    # The builder also emits .br files. On an nginx image built with the
+    # ngx_brotli module, enable brotli_static to serve them:
+    # brotli_static on;
+
+    # Fingerprinted assets never change: cache them for a year
+{asset_locations}
+    # Container health probe: answered by nginx without touching the filesystem
+    location = /healthz {{
+        access_log off;
+        default_type text/plain;
+        return 200 "ok";
+    }}
+
+    # index.html must be revalidated so clients pick up new deploys
+    location = /index.html {{
+        add_header Cache-Control "no-cache";
+    }}
+
+    # SPA fallback: unknown paths are routed client-side
+    location / {{
+        try_files $uri $uri/ /index.html;
+    }}
+}}
+"""
+
+
+def _precompress_step(build_output: str, variant: str = "alpine") -> str:
+    name_filters = " -o ".join(f"-name '*.{ext}'" for ext in PRECOMPRESS_EXTENSIONS)
+    if variant == "alpine":
+        install = "apk add --no-cache brotli"
+    else:
+        install = "apt-get update && apt-get install -y --no-install-recommends brotli"
+    return f"""# Precompress text assets for gzip_static / brotli_static
+RUN {install} \\
+    && find {build_output} -type f \\( {name_filters} \\) -size +1k \\
+       -exec gzip -9 -k -f {{}} \\; -exec brotli -q 11 -f {{}} \\;"""
+
 
+def _generate_next_prod_dockerfile(profile: FrontendProfile) -> str:
+    """
+    Next.js with output: 'standalone': the runner holds only the traced server
+    (.next/standalone), the static assets and public/, and runs on plain Node.
+    Listens on 8080 like the nginx image so compose and proxy configs are shared.
+    """
+    run_build = " ".join(PACKAGE_MANAGERS[profile.package_manager]["run"] + ["build"])
+    standalone_note = "" if profile.next_standalone else (
+        "# WARNING: next.config does not set output: 'standalone'. Add it, or the\n"
+        "# COPY of .next/standalone below fails.\n"
+    )
+
+    return f"""# syntax=docker/dockerfile:1
+# Production Dockerfile for Next.js (standalone output)
+{standalone_note}
 # Stage 1: Build
-FROM node:22-alpine as builder
+FROM {_node_image(profile)} as builder
 
 WORKDIR /app
 
+{_install_block(profile, frozen=True)}
+
 # Set production environment for optimization
+# (after the install, so build tooling in devDependencies is still installed)
+ENV NODE_ENV=production
+ENV NEXT_TELEMETRY_DISABLED=1
+
+COPY . .
+# public/ is optional in Next.js; make sure the runner COPY below always has a source.
+# public{NEXT_HEALTH_PATH} is a static file for the HEALTHCHECK, so probes skip page rendering.
+RUN mkdir -p public && printf 'ok\\n' > public{NEXT_HEALTH_PATH} && {run_build}
+
+# Stage 2: Run the standalone server
+# (same base as the builder: traced node_modules may hold native binaries)
+FROM {_node_image(profile)}
+
+WORKDIR /app
+
 ENV NODE_ENV=production
+ENV NEXT_TELEMETRY_DISABLED=1
+ENV PORT=8080
+ENV HOSTNAME=0.0.0.0
+
+# Traced server + node_modules subset, then the assets it does not copy itself
+COPY --from=builder --chown=node:node /app/.next/standalone ./
+COPY --from=builder --chown=node:node /app/.next/static ./.next/static
+COPY --from=builder --chown=node:node /app/public ./public
+
+USER node
+
+EXPOSE 8080
+
+# Healthcheck (Node's built-in fetch, no curl needed) on the static public{NEXT_HEALTH_PATH}:
+# probing / would server-render the home page every 30s
+HEALTHCHECK --interval=30s --timeout=3s --start-period=20s --retries=3 \\
+    CMD ["node", "-e", "fetch('http://127.0.0.1:8080{NEXT_HEALTH_PATH}').then(r => process.exit(r.ok ? 0 : 1)).catch(() => process.exit(1))"]
 
-COPY package.json package-lock.json ./
-RUN npm ci --legacy-peer-deps
+CMD ["node", "server.js"]
+"""
+
+
+def _generate_prod_dockerfile(profile: FrontendProfile) -> str:
+    if profile.framework == "next":
+        return _generate_next_prod_dockerfile(profile)
+
+    build_output = get_build_output(profile)
+    
+    run_build = " ".join(PACKAGE_MANAGERS[profile.package_manager]["run"] + ["build"])
+    
+    return f"""# syntax=docker/dockerfile:1
+# Production Dockerfile for React
+
+# Stage 1: Build
+FROM {_node_image(profile)} as builder
+
+WORKDIR /app
+
+{_install_block(profile, frozen=True)}
+
+# Set production environment for optimization
+# (after the install, so build tooling in devDependencies is still installed)
+ENV NODE_ENV=production
 
 COPY . .
-RUN npm run build
+RUN {run_build}
+
+{_precompress_step(build_output, profile.node_variant)}
 
 # Stage 2: Serve
 FROM nginxinc/nginx-unprivileged:alpine
 
-# Install curl for healthcheck
-USER root
-RUN apk add --no-cache curl
-USER nginx
-
 COPY --from=builder /app/{build_output} /usr/share/nginx/html
 
 # Expose port 8080 (unprivileged default)
 EXPOSE 8080
 
-# Overwrite default nginx config for SPA routing (Optional but recommended)
-# COPY nginx.conf /etc/nginx/conf.d/default.conf
+# SPA routing, compression and asset caching (generated nginx.conf)
+COPY nginx.conf /etc/nginx/conf.d/default.conf
 
-# Healthcheck
-HEALTHCHECK --interval=30s --timeout=3s --start-period=30s --retries=3 \\
-    CMD curl --silent --output /dev/null http://localhost:8080/ || exit 1
+# Healthcheck: /healthz is answered by nginx itself; busybox wget ships with the image
+HEALTHCHECK --interval=30s --timeout=3s --start-period=10s --retries=3 \\
+    CMD wget -q --spider http://127.0.0.1:8080/healthz || exit 1
 
 CMD ["nginx", "-g", "daemon off;"]
 """
 
 
-def _generate_dev_dockerfile(framework_info: dict) -> str:
-    dev_cmd = framework_info["dev_cmd"]
-    dev_port = framework_info["dev_port"]
-    framework = framework_info["framework"]
+def _generate_dev_dockerfile(profile: FrontendProfile) -> str:
+    dev_cmd = profile.dev_cmd
+    dev_port = profile.dev_port
+    framework = profile.framework
+    pm = PACKAGE_MANAGERS[profile.package_manager]
     
     # Framework-specific host binding
     if framework == "vite":
         # Vite needs --host flag to bind to 0.0.0.0
-        cmd_line = f'CMD ["npx", "vite", "--host", "0.0.0.0", "--port", "{dev_port}"]'
+        cmd_line = f'CMD {_exec_form(pm["exec"] + ["vite", "--host", "0.0.0.0", "--port", str(dev_port)])}'
     elif framework == "next":
-        cmd_line = f'CMD ["npx", "next", "dev", "-H", "0.0.0.0", "-p", "{dev_port}"]'
+        cmd_line = f'CMD {_exec_form(pm["exec"] + ["next", "dev", "-H", "0.0.0.0", "-p", str(dev_port)])}'
     else:
         # CRA and others respect HOST env var
-        cmd_line = f'CMD ["npm", "run", "{dev_cmd}"]'
+        cmd_line = f'CMD {_exec_form(pm["run"] + [dev_cmd])}'
     
-    return f"""# Development Dockerfile for {framework.upper() if framework != "unknown" else "React"}
-FROM node:22-alpine
+    return f"""# syntax=docker/dockerfile:1
+# Development Dockerfile for {framework.upper() if framework != "unknown" else "React"}
+FROM {_node_image(profile)}
 
 WORKDIR /app
 
 # Bind to all interfaces so Docker port mapping works
 ENV HOST=0.0.0.0
 
-COPY package.json package-lock.json ./
-RUN npm install --legacy-peer-deps
+{_install_block(profile, frozen=False)}
 
 COPY . .
 
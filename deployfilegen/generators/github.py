@@ -1,19 +1,177 @@
-def generate_github_workflow(config: dict, deploy: str = "ssh") -> str:
+import json
+from typing import List, Optional, Tuple
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.analyzer.runtimes import DEFAULT_PYTHON_VERSION
+from deployfilegen.generators.compose import DEFAULT_SERVICES, deployed_services, image_variable
+from deployfilegen.generators.proxy import PROXY_CONFIG_PATH
+from deployfilegen.generators.scripts import BUILD_SCRIPT_PATH, ROLLOUT_SCRIPT_PATH
+
+def generate_github_workflow(config: dict, deploy: str = "ssh",
+                             platforms: Tuple[str, ...] = ("linux/amd64",),
+                             profile: Optional[ProjectProfile] = None,
+                             with_tests: bool = False,
+                             test_shards: int = 1,
+                             rolling: bool = False) -> str:
     """
     Generates a production GitHub Actions workflow.
     Strategy is determined by the deploy parameter:
-      - 'ssh': git pull + docker compose build on server (no registry needed)
-      - 'registry': build/push images + docker compose pull on server
+      - 'ssh': git pull + parallel cached build (deploy/build.sh) on server (no registry needed)
+      - 'registry': build/push changed images in parallel + pull/restart only those on server
+        (backend/, frontend/ and the services discovered in profile)
+    With with_tests, Django (sharded) and frontend test jobs run first and gate the deploy.
+    With rolling, services are replaced health-gated behind the proxy by deploy/rollout.sh.
     """
+    test_jobs, test_job_names = ("", []) if not with_tests else _test_jobs(profile, test_shards)
     if deploy == "registry":
-        return _generate_registry_workflow(config)
+        return _generate_registry_workflow(config, platforms, test_jobs, test_job_names, rolling,
+                                           _registry_services(profile))
     else:
-        return _generate_ssh_workflow(config)
+        return _generate_ssh_workflow(config, test_jobs, test_job_names, rolling)
+
+
+# Per package manager on CI runners: the setup-node cache id (None: the store is
+# cached with actions/cache instead), frozen and lockfile-less installs, script runner.
+CI_PACKAGE_MANAGERS = {
+    "npm": {"cache": "npm", "frozen_install": "npm ci --legacy-peer-deps",
+            "install": "npm install --legacy-peer-deps", "run": "npm run"},
+    "pnpm": {"cache": "pnpm", "frozen_install": "pnpm install --frozen-lockfile",
+             "install": "pnpm install", "run": "pnpm run"},
+    "yarn": {"cache": "yarn", "frozen_install": "yarn install --frozen-lockfile",
+             "install": "yarn install", "run": "yarn run"},
+    "yarn-berry": {"cache": "yarn", "frozen_install": "yarn install --immutable",
+                   "install": "yarn install", "run": "yarn run"},
+    "bun": {"cache": None, "store": "~/.bun/install/cache", "frozen_install": "bun install --frozen-lockfile",
+            "install": "bun install", "run": "bun run"},
+}
+
+
+def _test_jobs(profile: Optional[ProjectProfile], shards: int) -> Tuple[str, List[str]]:
+    """
+    Returns the test job definitions and the job names the deploy must wait for.
+    The jobs use the same Python/Node versions as the generated images.
+    """
+    jobs, names = [], []
+    if profile is None or profile.backend is not None:
+        python_version = profile.backend.python_version if profile is not None else DEFAULT_PYTHON_VERSION
+        jobs.append(_backend_test_job(shards, python_version))
+        names.append("backend-tests")
+    frontend = profile.frontend if profile is not None else None
+    if frontend is not None and "test" in frontend.scripts:
+        jobs.append(_frontend_test_job(frontend))
+        names.append("frontend-tests")
+    return "".join(jobs), names
+
+
+def _backend_test_job(shards: int, python_version: str = DEFAULT_PYTHON_VERSION) -> str:
+    shard_list = ", ".join(str(index) for index in range(shards))
+    return f"""  backend-tests:
+    runs-on: ubuntu-latest
+    strategy:
+      fail-fast: false
+      matrix:
+        shard: [{shard_list}]
+    defaults:
+      run:
+        working-directory: backend
+    env:
+      SECRET_KEY: ci-test-secret
+      DEBUG: "False"
+      TEST_SHARDS: "{shards}"
+    steps:
+    - uses: actions/checkout@v4
+
+    - name: Set up Python
+      uses: actions/setup-python@v5
+      with:
+        python-version: "{python_version}"
+        cache: pip
+        cache-dependency-path: backend/requirements.txt
+
+    - name: Install dependencies
+      run: pip install -r requirements.txt
 
+    - name: Run Django tests (shard ${{{{ matrix.shard }}}} of {shards})
+      run: |
+        # Round-robin the test modules across shards (sorted, so every runner agrees)
+        # (test*.py is Django's default discovery pattern)
+        modules=$(find . -path ./venv -prune -o -path ./.venv -prune -o -name 'test*.py' -print \\
+                  | sed 's|^\\./||; s|\\.py$||; s|/|.|g' | sort -u \\
+                  | awk -v n="$TEST_SHARDS" -v i="${{{{ matrix.shard }}}}" '(NR - 1) % n == i')
+        if [ -z "$modules" ]; then
+          echo "No test modules in this shard."
+          exit 0
+        fi
+        python manage.py test $modules --noinput --parallel auto
+
+"""
+
+
+def _frontend_test_job(frontend) -> str:
+    pm = CI_PACKAGE_MANAGERS[frontend.package_manager]
+    lockfile = f"frontend/{frontend.lockfile}" if frontend.lockfile else None
+    setup = ""
+    if frontend.package_manager in ("pnpm", "yarn-berry"):
+        # setup-node's cache needs the package manager binary up front
+        setup = """
+    - name: Enable corepack
+      run: corepack enable
+"""
+    elif frontend.package_manager == "bun":
+        setup = """
+    - name: Set up Bun
+      uses: oven-sh/setup-bun@v2
+"""
 
-def _generate_ssh_workflow(config: dict) -> str:
-    """SSH Build Mode: git pull → docker compose build → up on server."""
-    return """name: Deploy to Production (SSH Build)
+    cache = ""
+    if lockfile and pm["cache"]:
+        cache = f"""
+        cache: {pm["cache"]}
+        cache-dependency-path: {lockfile}"""
+    store_cache = ""
+    if lockfile and not pm["cache"]:
+        store_cache = f"""
+    - name: Cache package store
+      uses: actions/cache@v4
+      with:
+        path: {pm["store"]}
+        key: ${{{{ runner.os }}}}-{frontend.package_manager}-${{{{ hashFiles('{lockfile}') }}}}
+"""
+
+    return f"""  frontend-tests:
+    runs-on: ubuntu-latest
+    defaults:
+      run:
+        working-directory: frontend
+    env:
+      CI: "true"
+    steps:
+    - uses: actions/checkout@v4
+{setup}
+    - name: Set up Node.js
+      uses: actions/setup-node@v4
+      with:
+        node-version: "{frontend.node_version}"{cache}
+{store_cache}
+    - name: Install dependencies
+      run: {pm["frozen_install"] if frontend.lockfile else pm["install"]}
+
+    - name: Run frontend tests
+      run: {pm["run"]} test
+
+"""
+
+
+def _needs_line(names: List[str]) -> str:
+    return f"    needs: [{', '.join(names)}]\n" if names else ""
+
+
+def _generate_ssh_workflow(config: dict, test_jobs: str = "", test_job_names: List[str] = (),
+                           rolling: bool = False) -> str:
+    """SSH Build Mode: [tests →] git pull → deploy/build.sh (buildx bake, local cache) → up on server."""
+    start = (f"bash {ROLLOUT_SCRIPT_PATH}" if rolling
+             else "docker compose -f docker-compose.prod.yml up -d --remove-orphans")
+    return f"""name: Deploy to Production (SSH Build)
 
 on:
   push:
@@ -24,92 +182,302 @@ concurrency:
   cancel-in-progress: false
 
 jobs:
-  deploy:
-    runs-on: ubuntu-latest
+{test_jobs}  deploy:
+{_needs_line(list(test_job_names))}    runs-on: ubuntu-latest
     steps:
     - name: Deploy to Server
       uses: appleboy/ssh-action@e5bb55e85072516e05f153bd69632a2656345fa4 # v1.0.0 (pinned)
       with:
-        host: ${{ secrets.DEPLOY_HOST }}
-        username: ${{ secrets.DEPLOY_USER }}
-        key: ${{ secrets.SSH_PRIVATE_KEY }}
+        host: ${{{{ secrets.DEPLOY_HOST }}}}
+        username: ${{{{ secrets.DEPLOY_USER }}}}
+        key: ${{{{ secrets.SSH_PRIVATE_KEY }}}}
         script: |
-          cd ${{ secrets.DEPLOY_PATH }}
+          cd ${{{{ secrets.DEPLOY_PATH }}}}
           git pull origin main
-          docker compose -f docker-compose.prod.yml build
-          docker compose -f docker-compose.prod.yml up -d --remove-orphans
+          bash {BUILD_SCRIPT_PATH}
+          {start}
+"""
+
+
+# Target platform -> GitHub-hosted runner that builds it natively.
+# Platforms missing here are built on ubuntu-latest under QEMU.
+NATIVE_RUNNERS = {
+    "linux/amd64": "ubuntu-24.04",
+    "linux/arm64": "ubuntu-24.04-arm",
+}
+
+_IMAGE_NAME_ENV = """    env:
+      IMAGE_NAME: ${{ matrix.service == 'backend' && secrets.BACKEND_IMAGE_NAME || secrets.FRONTEND_IMAGE_NAME }}
+"""
+
+# (compose service, build context, image variable prefix) of the images the registry workflow builds
+RegistryService = Tuple[str, str, str]
+DEFAULT_REGISTRY_SERVICES: Tuple[RegistryService, ...] = tuple(
+    (name, context, image_variable(name)) for name, context in DEFAULT_SERVICES)
+
+
+def _registry_services(profile: Optional[ProjectProfile]) -> Tuple[RegistryService, ...]:
+    """The services of compose.deployed_services with their image variable prefix."""
+    return tuple((name, context, image_variable(name)) for name, context in deployed_services(profile))
+
+
+def _build_env(services: Tuple[RegistryService, ...]) -> Tuple[str, str]:
+    """
+    Returns the build job env block and its build context expression. Extra
+    services live outside ./<service>, so their image secret and context are
+    looked up by matrix.service.
+    """
+    if services == DEFAULT_REGISTRY_SERVICES:
+        return _IMAGE_NAME_ENV, "./${{ matrix.service }}"
+    secrets = json.dumps({name: f"{variable}_IMAGE_NAME" for name, _, variable in services}, separators=(",", ":"))
+    contexts = json.dumps({name: f"./{path}" for name, path, _ in services}, separators=(",", ":"))
+    env = f"""    env:
+      IMAGE_NAME: ${{{{ secrets[fromJSON('{secrets}')[matrix.service]] }}}}
+      BUILD_CONTEXT: ${{{{ fromJSON('{contexts}')[matrix.service] }}}}
+"""
+    return env, "${{ env.BUILD_CONTEXT }}"
+
+_BUILDX_AND_LOGIN = """    - name: Set up Docker Buildx
+      uses: docker/setup-buildx-action@v3
+
+    - name: Log in to Docker Hub
+      uses: docker/login-action@v3
+      with:
+        registry: docker.io
+        username: ${{ secrets.DOCKER_USERNAME }}
+        password: ${{ secrets.DOCKERHUB_TOKEN }}
 """
 
 
-def _generate_registry_workflow(config: dict) -> str:
-    """Registry Mode: build & push to registry → docker compose pull on server."""
-    return """name: Deploy to Production (Registry)
+# Workflow sections shared by every platform layout: change detection and the deploy job.
+def _registry_head(services: Tuple[RegistryService, ...]) -> str:
+    # Manual runs rebuild every service
+    all_services = json.dumps([name for name, _, _ in services], separators=(",", ":"))
+    filters = "".join(f"""          {name}:
+            - '{path}/**'
+""" for name, path, _ in services)
+    return f"""name: Deploy to Production (Registry)
 
 on:
   push:
     branches: [ "main" ]
+  # Manual runs rebuild and redeploy every service
+  workflow_dispatch:
 
 concurrency:
   group: production
   cancel-in-progress: false
 
 jobs:
-  build-and-push:
+  changes:
     runs-on: ubuntu-latest
+    outputs:
+      services: ${{{{ github.event_name == 'workflow_dispatch' && '{all_services}' || steps.filter.outputs.changes }}}}
     steps:
     - uses: actions/checkout@v4
 
-    - name: Set up QEMU
-      uses: docker/setup-qemu-action@v3
+    - name: Detect changed components
+      id: filter
+      uses: dorny/paths-filter@v3
+      with:
+        filters: |
+{filters}
+"""
 
-    - name: Set up Docker Buildx
-      uses: docker/setup-buildx-action@v3
 
-    - name: Log in to Docker Hub
-      uses: docker/login-action@v3
+def _registry_deploy_job(needs: str, image_exports: str, copy_files: str, restart: str) -> str:
+    return f"""  deploy:
+    needs: [{needs}]
+    if: needs.changes.outputs.services != '[]'
+    runs-on: ubuntu-latest
+    steps:
+{copy_files}    - name: Deploy to Server
+      uses: appleboy/ssh-action@e5bb55e85072516e05f153bd69632a2656345fa4 # v1.0.0 (pinned)
       with:
-        registry: docker.io
-        username: ${{ secrets.DOCKER_USERNAME }}
-        password: ${{ secrets.DOCKERHUB_TOKEN }}
+        host: ${{{{ secrets.DEPLOY_HOST }}}}
+        username: ${{{{ secrets.DEPLOY_USER }}}}
+        key: ${{{{ secrets.SSH_PRIVATE_KEY }}}}
+        script: |
+          set -e
+          cd ${{{{ secrets.DEPLOY_PATH }}}}
+          export COMPOSE_PROJECT_NAME=production
+{image_exports}          SERVICES="${{{{ join(fromJSON(needs.changes.outputs.services), ' ') }}}}"
+          # Pin each rebuilt service to this commit; others keep their recorded tag
+          touch .image-tags
+          for service in $SERVICES; do
+            var="$(echo "$service" | tr '[:lower:]-' '[:upper:]_')_IMAGE_TAG"
+            sed -i "/^$var=/d" .image-tags
+            echo "$var=${{{{ github.sha }}}}" >> .image-tags
+          done
+          set -a; . ./.image-tags; set +a
+          docker compose -f docker-compose.prod.yml pull $SERVICES
+{restart}"""
+
+
+# Restart in place: recreate the changed services, start anything else that is missing
+_REGISTRY_RESTART = """          docker compose -f docker-compose.prod.yml up -d --no-deps $SERVICES
+          # Start anything not running yet (first deploy, db/proxy) without touching the rest
+          docker compose -f docker-compose.prod.yml up -d --no-recreate --remove-orphans
+"""
 
-    - name: Build and Push Backend
+# --rolling: the server has no checkout, so ship the rollout script and the
+# files it depends on before running it
+_REGISTRY_COPY_DEPLOY_FILES = f"""    - uses: actions/checkout@v4
+
+    - name: Copy deploy files
+      uses: appleboy/scp-action@v0.1.7
+      with:
+        host: ${{{{ secrets.DEPLOY_HOST }}}}
+        username: ${{{{ secrets.DEPLOY_USER }}}}
+        key: ${{{{ secrets.SSH_PRIVATE_KEY }}}}
+        source: "docker-compose.prod.yml,{PROXY_CONFIG_PATH},{ROLLOUT_SCRIPT_PATH}"
+        target: ${{{{ secrets.DEPLOY_PATH }}}}
+
+"""
+
+
+def _generate_registry_workflow(config: dict, platforms: Tuple[str, ...] = ("linux/amd64",),
+                                test_jobs: str = "", test_job_names: List[str] = (),
+                                rolling: bool = False,
+                                services: Tuple[RegistryService, ...] = DEFAULT_REGISTRY_SERVICES) -> str:
+    """
+    Registry Mode: detect changed components → build & push them in a parallel
+    matrix → pull and restart only those services on the server.
+
+    A single platform is built directly on a native runner. Several platforms
+    are built per architecture (natively where GitHub offers a runner), pushed
+    by digest and merged into one manifest list per service.
+    """
+    if len(platforms) == 1:
+        build_jobs = _single_platform_build_job(platforms[0], services)
+        build_job_name = "build-and-push"
+    else:
+        build_jobs = _multi_platform_build_jobs(platforms, services)
+        build_job_name = "merge"
+
+    # Tests run alongside the image builds; the deploy waits for both
+    needs = ", ".join(["changes", build_job_name, *test_job_names])
+    image_exports = "".join(f"          export {variable}_IMAGE_NAME=${{{{ secrets.{variable}_IMAGE_NAME }}}}\n"
+                            for _, _, variable in services)
+    deploy = _registry_deploy_job(
+        needs=needs,
+        image_exports=image_exports,
+        copy_files=_REGISTRY_COPY_DEPLOY_FILES if rolling else "",
+        restart=f"          bash {ROLLOUT_SCRIPT_PATH} $SERVICES\n" if rolling else _REGISTRY_RESTART,
+    )
+    return _registry_head(services) + test_jobs + build_jobs + "\n" + deploy
+
+
+def _single_platform_build_job(platform: str,
+                               services: Tuple[RegistryService, ...] = DEFAULT_REGISTRY_SERVICES) -> str:
+    image_env, build_context = _build_env(services)
+    runner = NATIVE_RUNNERS.get(platform, "ubuntu-latest")
+    qemu_step = "" if platform in NATIVE_RUNNERS else _qemu_step("")
+    return f"""  build-and-push:
+    needs: changes
+    if: needs.changes.outputs.services != '[]'
+    runs-on: {runner}
+    strategy:
+      matrix:
+        service: ${{{{ fromJSON(needs.changes.outputs.services) }}}}
+{image_env}    steps:
+    - uses: actions/checkout@v4
+{qemu_step}
+{_BUILDX_AND_LOGIN}
+    - name: Build and Push ${{{{ matrix.service }}}}
       uses: docker/build-push-action@v5
       with:
-        context: ./backend
+        context: {build_context}
+        platforms: {platform}
         push: true
         tags: |
-          ${{ secrets.BACKEND_IMAGE_NAME }}:latest
-          ${{ secrets.BACKEND_IMAGE_NAME }}:${{ github.sha }}
-        cache-from: type=registry,ref=${{ secrets.BACKEND_IMAGE_NAME }}:buildcache
-        cache-to: type=registry,ref=${{ secrets.BACKEND_IMAGE_NAME }}:buildcache,mode=max
+          ${{{{ env.IMAGE_NAME }}}}:latest
+          ${{{{ env.IMAGE_NAME }}}}:${{{{ github.sha }}}}
+        cache-from: type=registry,ref=${{{{ env.IMAGE_NAME }}}}:buildcache
+        cache-to: type=registry,ref=${{{{ env.IMAGE_NAME }}}}:buildcache,mode=max
+"""
+
+
+def _qemu_step(condition: str) -> str:
+    return f"""
+    - name: Set up QEMU
+{condition}      uses: docker/setup-qemu-action@v3
+"""
+
+
+def _multi_platform_build_jobs(platforms: Tuple[str, ...],
+                               services: Tuple[RegistryService, ...] = DEFAULT_REGISTRY_SERVICES) -> str:
+    image_env, build_context = _build_env(services)
+    platform_list = ", ".join(platforms)
+    runner_includes = "".join(
+        f"""        - platform: {platform}
+          runner: {NATIVE_RUNNERS.get(platform, "ubuntu-latest")}
+          emulated: {"false" if platform in NATIVE_RUNNERS else "true"}
+""" for platform in platforms)
+    emulated = any(platform not in NATIVE_RUNNERS for platform in platforms)
+    qemu_step = _qemu_step("      if: matrix.emulated\n") if emulated else ""
 
-    - name: Build and Push Frontend
+    return f"""  build-and-push:
+    needs: changes
+    if: needs.changes.outputs.services != '[]'
+    runs-on: ${{{{ matrix.runner }}}}
+    strategy:
+      matrix:
+        service: ${{{{ fromJSON(needs.changes.outputs.services) }}}}
+        platform: [{platform_list}]
+        include:
+{runner_includes}{image_env}    steps:
+    - uses: actions/checkout@v4
+
+    - name: Platform slug
+      run: echo "PLATFORM_PAIR=$(echo '${{{{ matrix.platform }}}}' | tr '/' '-')" >> "$GITHUB_ENV"
+{qemu_step}
+{_BUILDX_AND_LOGIN}
+    - name: Build and Push ${{{{ matrix.service }}}} by digest
+      id: build
       uses: docker/build-push-action@v5
       with:
-        context: ./frontend
-        push: true
-        tags: |
-          ${{ secrets.FRONTEND_IMAGE_NAME }}:latest
-          ${{ secrets.FRONTEND_IMAGE_NAME }}:${{ github.sha }}
-        cache-from: type=registry,ref=${{ secrets.FRONTEND_IMAGE_NAME }}:buildcache
-        cache-to: type=registry,ref=${{ secrets.FRONTEND_IMAGE_NAME }}:buildcache,mode=max
+        context: {build_context}
+        platforms: ${{{{ matrix.platform }}}}
+        outputs: type=image,name=${{{{ env.IMAGE_NAME }}}},push-by-digest=true,name-canonical=true,push=true
+        cache-from: type=registry,ref=${{{{ env.IMAGE_NAME }}}}:buildcache-${{{{ env.PLATFORM_PAIR }}}}
+        cache-to: type=registry,ref=${{{{ env.IMAGE_NAME }}}}:buildcache-${{{{ env.PLATFORM_PAIR }}}},mode=max
+
+    - name: Export digest
+      run: |
+        mkdir -p /tmp/digests
+        digest="${{{{ steps.build.outputs.digest }}}}"
+        touch "/tmp/digests/${{digest#sha256:}}"
+
+    - name: Upload digest
+      uses: actions/upload-artifact@v4
+      with:
+        name: digests-${{{{ matrix.service }}}}-${{{{ env.PLATFORM_PAIR }}}}
+        path: /tmp/digests/*
+        if-no-files-found: error
+        retention-days: 1
 
-  deploy:
-    needs: build-and-push
+  merge:
+    needs: [changes, build-and-push]
     runs-on: ubuntu-latest
-    steps:
-    - name: Deploy to Server
-      uses: appleboy/ssh-action@e5bb55e85072516e05f153bd69632a2656345fa4 # v1.0.0 (pinned)
+    strategy:
+      matrix:
+        service: ${{{{ fromJSON(needs.changes.outputs.services) }}}}
+{image_env}    steps:
+    - name: Download digests
+      uses: actions/download-artifact@v4
       with:
-        host: ${{ secrets.DEPLOY_HOST }}
-        username: ${{ secrets.DEPLOY_USER }}
-        key: ${{ secrets.SSH_PRIVATE_KEY }}
-        script: |
-          cd ${{ secrets.DEPLOY_PATH }}
-          export COMPOSE_PROJECT_NAME=production
-          export BACKEND_IMAGE_NAME=${{ secrets.BACKEND_IMAGE_NAME }}
-          export FRONTEND_IMAGE_NAME=${{ secrets.FRONTEND_IMAGE_NAME }}
-          export IMAGE_TAG=${{ github.sha }}
-          docker compose -f docker-compose.prod.yml pull
-          docker compose -f docker-compose.prod.yml up -d --remove-orphans
+        path: /tmp/digests
+        pattern: digests-${{{{ matrix.service }}}}-*
+        merge-multiple: true
+
+{_BUILDX_AND_LOGIN}
+    - name: Create manifest list
+      working-directory: /tmp/digests
+      run: |
+        docker buildx imagetools create \\
+          -t "$IMAGE_NAME:latest" \\
+          -t "$IMAGE_NAME:${{{{ github.sha }}}}" \\
+          $(printf "$IMAGE_NAME@sha256:%s " *)
+        docker buildx imagetools inspect "$IMAGE_NAME:${{{{ github.sha }}}}"
 """
@@ -0,0 +1,155 @@
+from typing import Optional
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.exceptions import GenerationError
+
+# Path of the generated config, relative to the project root (bind-mounted by compose)
+PROXY_CONFIG_PATH = "proxy/nginx.conf"
+
+# Backend routes proxied to gunicorn; everything else goes to the frontend.
+BACKEND_ROUTES = ("api", "admin")
+
+# Django STATIC_URL behind the proxy. Create React App builds its bundles into
+# /static/js and /static/css, so Django's files move to a prefix that cannot collide.
+DJANGO_STATIC_URL = "/static/"
+CRA_DJANGO_STATIC_URL = "/django-static/"
+
+
+def django_static_url(profile: Optional[ProjectProfile] = None) -> str:
+    """The URL prefix the proxy routes to Django's static files."""
+    if profile is not None and profile.frontend is not None and profile.frontend.framework == "cra":
+        return CRA_DJANGO_STATIC_URL
+    return DJANGO_STATIC_URL
+
+
+def generate_proxy_config(profile: Optional[ProjectProfile] = None, cold_start: bool = False) -> str:
+    """
+    Generates the reverse-proxy nginx config used with --proxy.
+
+    nginx serves /static and /media straight from the shared volumes
+    (populated by collectstatic and Django uploads), proxies backend routes
+    to gunicorn over keepalive connections and everything else to the
+    frontend container. With cold_start the static files live in the backend
+    image, so /static is proxied to it (WhiteNoise) instead.
+
+    With a Create React App frontend, /static/ belongs to the frontend bundles
+    and Django's static files are routed under CRA_DJANGO_STATIC_URL.
+
+    Only the backend and frontend that were detected get an upstream (nginx
+    refuses to start on a host it cannot resolve); without a frontend,
+    everything goes to the backend.
+    """
+    backend = profile is None or profile.backend is not None
+    frontend = profile is None or profile.frontend is not None
+    if not (backend or frontend):
+        raise GenerationError("--proxy routes to backend/ and frontend/, and neither was found")
+    backend_routes = "|".join(BACKEND_ROUTES)
+    asgi = backend and profile is not None and profile.backend.server == "asgi"
+    static_url = django_static_url(profile)
+    static_note = "" if static_url == DJANGO_STATIC_URL else (
+        f"\n    # Set STATIC_URL = \"{static_url}\" in Django: /static/ is the React build's own assets")
+
+    if cold_start:
+        static_block = f"""    # Django static files are built into the backend image (--cold-start) and served by WhiteNoise{static_note}
+    location {static_url} {{
+        proxy_pass http://backend;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        access_log off;
+    }}"""
+    else:
+        static_block = f"""    # Django static files (collectstatic -> static_volume), served without touching gunicorn{static_note}
+    location {static_url} {{
+        alias /app/static/;
+        add_header Cache-Control "public, max-age=86400";
+        access_log off;
+    }}"""
+
+    if not backend:
+        static_block = ""
+
+    websocket_block = ""
+    if asgi:
+        websocket_block = """
+    # WebSockets (Channels): upgrade the connection, no keepalive reuse
+    location /ws/ {
+        proxy_pass http://backend;
+        proxy_http_version 1.1;
+        proxy_set_header Upgrade $http_upgrade;
+        proxy_set_header Connection "upgrade";
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_read_timeout 1h;
+    }
+"""
+
+    upstreams = ""
+    if backend:
+        upstreams += """
+upstream backend {
+    server backend:8000;
+    keepalive 32;
+}
+"""
+    if frontend:
+        upstreams += """
+upstream frontend {
+    server frontend:8080;
+    keepalive 16;
+}
+"""
+
+    backend_block = ""
+    if backend:
+        backend_block = f"""
+    # Django routes
+    location ~ ^/({backend_routes})(/|$) {{
+        proxy_pass http://backend;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+    }}
+"""
+    # Everything else: the frontend container (or Django when there is no frontend)
+    fallback = "frontend" if frontend else "backend"
+
+    return f"""# Reverse proxy config generated by deployfilegen (--proxy)
+# Mounted into the 'proxy' service of docker-compose.prod.yml.
+{upstreams}
+server {{
+    listen 8080;
+    server_name _;
+    client_max_body_size 25m;
+
+    gzip on;
+    gzip_vary on;
+    gzip_proxied any;
+    gzip_min_length 1024;
+    gzip_types text/plain text/css text/xml application/javascript application/json
+               application/xml image/svg+xml;
+
+{static_block}
+
+    # User uploads (media_volume)
+    location /media/ {{
+        alias /app/media/;
+        add_header Cache-Control "public, max-age=3600";
+        add_header X-Content-Type-Options nosniff;
+    }}
+{backend_block}{websocket_block}
+    # Everything else: the {fallback} container
+    location / {{
+        proxy_pass http://{fallback};
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+    }}
+}}
+"""
@@ -0,0 +1,179 @@
+from typing import Tuple
+
+from deployfilegen.generators.compose import DEFAULT_SERVICES
+
+# Server-side helper scripts, committed with the project and run over SSH by the workflow.
+BUILD_SCRIPT_PATH = "deploy/build.sh"
+
+# Services with a build: section in the SSH-strategy compose file when no project
+# was analyzed; otherwise the names from compose.deployed_services.
+BUILT_SERVICES = tuple(name for name, _ in DEFAULT_SERVICES)
+
+
+def generate_build_script(services: Tuple[str, ...] = BUILT_SERVICES) -> str:
+    """
+    Generates deploy/build.sh for the SSH strategy; services are the compose
+    services with a build: section.
+
+    Images are built by a persistent buildx builder (its layer store survives
+    between deploys) with `buildx bake`, which builds every compose service in
+    parallel. Each service keeps a local cache directory on the server; the
+    cache is exported to a fresh directory and swapped in so it does not grow
+    without bound. Images that are not built (postgres, the proxy) are pulled
+    in the background while the build runs.
+    """
+    cache_flags = " \\\n".join(
+        f'    --set {service}.tags="$PROJECT-{service}" \\\n'
+        f'    --set {service}.cache-from=type=local,src="$CACHE_DIR/{service}" \\\n'
+        f'    --set {service}.cache-to=type=local,dest="$CACHE_DIR/{service}.new",mode=max'
+        for service in services
+    )
+    swap_caches = "\n".join(
+        f'swap_cache {service}' for service in services
+    )
+
+    return f"""#!/usr/bin/env bash
+# Build script generated by deployfilegen (SSH strategy).
+# Run from the project root on the server: bash {BUILD_SCRIPT_PATH}
+set -euo pipefail
+
+COMPOSE_FILE="${{COMPOSE_FILE:-docker-compose.prod.yml}}"
+BUILDER="${{BUILDX_BUILDER_NAME:-deployfilegen}}"
+CACHE_DIR="${{BUILD_CACHE_DIR:-$HOME/.cache/deployfilegen/$(basename "$PWD")}}"
+# Image names compose expects for built services: <project>-<service>
+PROJECT="${{COMPOSE_PROJECT_NAME:-$(basename "$PWD" | tr '[:upper:]' '[:lower:]' | tr -cd 'a-z0-9_-')}}"
+
+mkdir -p "$CACHE_DIR"
+
+# Persistent builder: created once, reused (with its layer store) on every deploy
+if ! docker buildx inspect "$BUILDER" >/dev/null 2>&1; then
+  docker buildx create --name "$BUILDER" --driver docker-container --bootstrap
+fi
+
+# Pull images that are not built (database, proxy) while the build runs
+docker compose -f "$COMPOSE_FILE" pull --ignore-buildable --quiet &
+pull_pid=$!
+
+# Build all services in parallel, reading and refreshing the local cache
+docker buildx bake --builder "$BUILDER" -f "$COMPOSE_FILE" --load \\
+{cache_flags}
+
+wait "$pull_pid"
+
+# Replace each cache with the freshly exported one (drops stale layers)
+swap_cache() {{
+  if [ -d "$CACHE_DIR/$1.new" ]; then
+    rm -rf "$CACHE_DIR/$1"
+    mv "$CACHE_DIR/$1.new" "$CACHE_DIR/$1"
+  fi
+}}
+{swap_caches}
+"""
+
+
+ROLLOUT_SCRIPT_PATH = "deploy/rollout.sh"
+
+# Services replaced one at a time behind the proxy, in this order (by default).
+ROLLING_SERVICES = BUILT_SERVICES
+
+
+def generate_rollout_script(services: Tuple[str, ...] = ROLLING_SERVICES) -> str:
+    """
+    Generates deploy/rollout.sh: a health-gated rolling replacement used with
+    --rolling (which requires --proxy, so app containers publish no host ports).
+
+    For each service a second set of containers is started next to the old
+    ones. Once Docker reports them healthy the proxy is reloaded, which
+    re-resolves the service name and starts sending traffic to them. The old
+    containers are then disconnected from their networks and the proxy reloaded
+    again, so nginx holds no keepalive connections to them by the time they are
+    stopped. A replacement that never turns healthy is removed and the old
+    containers keep serving.
+    """
+    services = " ".join(services)
+    return f"""#!/usr/bin/env bash
+# Rolling deploy script generated by deployfilegen (--rolling).
+# Usage (from the project root on the server): bash {ROLLOUT_SCRIPT_PATH} [service ...]
+set -euo pipefail
+
+COMPOSE_FILE="${{COMPOSE_FILE:-docker-compose.prod.yml}}"
+TIMEOUT="${{ROLLOUT_TIMEOUT:-180}}"
+STOP_GRACE="${{ROLLOUT_STOP_GRACE:-30}}"
+SERVICES="${{*:-{services}}}"
+
+compose() {{
+  docker compose -f "$COMPOSE_FILE" "$@"
+}}
+
+# Blocks until the container's HEALTHCHECK passes; fails on unhealthy/exit or timeout
+wait_healthy() {{
+  local cid="$1" waited=0 status
+  while [ "$waited" -lt "$TIMEOUT" ]; do
+    status=$(docker inspect -f '{{{{if .State.Health}}}}{{{{.State.Health.Status}}}}{{{{else}}}}{{{{.State.Status}}}}{{{{end}}}}' "$cid")
+    case "$status" in
+      healthy|running) return 0 ;;
+      unhealthy|exited|dead) return 1 ;;
+    esac
+    sleep 2
+    waited=$((waited + 2))
+  done
+  return 1
+}}
+
+reload_proxy() {{
+  compose exec -T proxy nginx -s reload
+}}
+
+# Takes containers off every network, so the service name stops resolving to them
+detach() {{
+  local cid net
+  for cid in "$@"; do
+    for net in $(docker inspect -f '{{{{range $net, $_ := .NetworkSettings.Networks}}}}{{{{$net}}}} {{{{end}}}}' "$cid"); do
+      docker network disconnect "$net" "$cid"
+    done
+  done
+}}
+
+# Containers running before this deploy: only these are replaced
+declare -A previous
+for service in $SERVICES; do
+  previous[$service]=$(compose ps -q "$service")
+done
+
+# Start anything that is not running yet (first deploy, db, proxy) without touching the rest
+compose up -d --no-recreate --remove-orphans
+
+for service in $SERVICES; do
+  old="${{previous[$service]}}"
+  if [ -z "$old" ]; then
+    echo "==> $service: first start, nothing to replace"
+    continue
+  fi
+  count=$(echo "$old" | wc -l)
+
+  echo "==> $service: starting $count new container(s)"
+  compose up -d --no-deps --no-recreate --scale "$service=$((count * 2))" "$service"
+  new=$(compose ps -q "$service" | grep -vxF "$old" || true)
+
+  for cid in $new; do
+    if ! wait_healthy "$cid"; then
+      echo "==> $service: new container $cid is not healthy; rolling back" >&2
+      docker logs --tail 50 "$cid" >&2 || true
+      docker rm -f $new >/dev/null
+      exit 1
+    fi
+  done
+
+  # New containers join the upstream next to the old ones
+  reload_proxy
+  # Drop the old ones from the upstream before stopping them: otherwise nginx
+  # keeps reusing keepalive connections to a container that is shutting down (502s)
+  echo "==> $service: retiring old container(s)"
+  detach $old
+  reload_proxy
+  docker stop --time "$STOP_GRACE" $old >/dev/null
+  docker rm $old >/dev/null
+done
+
+echo "==> Rollout complete: $SERVICES"
+"""
@@ -0,0 +1,425 @@
+"""
+Local render server (``deployfilegen serve``).
+
+Keeps the generators imported and the detection caches warm between
+requests, so tools such as a developer portal can render previews without
+paying the CLI start-up and analysis cost on every click. Speaks plain
+HTTP/1.1 over localhost TCP or a Unix socket:
+
+    GET  /healthz   liveness and version
+    GET  /metrics   request latency percentiles and cache counters
+    POST /render    {"project": "/path"} or {"files": {"backend/requirements.txt": "..."}},
+                    plus optional "options" (GenerationOptions fields) and "env"
+
+Requests are handled by a bounded pool of worker threads; when every worker
+is busy and the pending queue is full, new connections get a 503.
+"""
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, fields
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path, PurePosixPath
+from typing import Dict, Mapping, Optional, Tuple
+
+from deployfilegen import __version__
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import DeployFileGenError, GenerationError
+from deployfilegen.utils.cache import GenerationCache
+from deployfilegen.utils.logger import capture_warnings, logger
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+# Connections allowed to wait for a worker, per worker
+PENDING_PER_WORKER = 4
+# Largest accepted request body (uploaded manifests included)
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_UPLOAD_FILES = 200
+# Rendered results kept in memory (project/upload + options + config)
+RESULT_CACHE_ENTRIES = 128
+# Most recent requests per endpoint used for the latency percentiles
+LATENCY_WINDOW = 2048
+# Seconds a connection may sit idle (keep-alive or a slow request) while holding a worker
+IDLE_TIMEOUT_SECONDS = 30
+
+
+class RequestError(DeployFileGenError):
+    """A malformed /render request (reported as HTTP 400)."""
+
+
+class LatencyMetrics:
+    """Thread-safe request counters and latency percentiles per endpoint."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self.started = time.time()
+        self.in_flight = 0
+        self.rejected = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+            counts = self._counts.setdefault(endpoint, {"requests": 0, "errors": 0})
+            counts["requests"] += 1
+            counts["errors"] += not ok
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @staticmethod
+    def _percentile(ordered, fraction: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            endpoints = {}
+            for endpoint, samples in self._samples.items():
+                ordered = sorted(samples)
+                endpoints[endpoint] = {
+                    **self._counts[endpoint],
+                    "p50_ms": round(self._percentile(ordered, 0.50) * 1000, 2),
+                    "p95_ms": round(self._percentile(ordered, 0.95) * 1000, 2),
+                    "p99_ms": round(self._percentile(ordered, 0.99) * 1000, 2),
+                    "max_ms": round(ordered[-1] * 1000, 2),
+                    "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                }
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+                "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+                "endpoints": endpoints,
+            }
+
+
+class RenderService:
+    """
+    The work behind POST /render, independent of the transport.
+
+    Project roots are fingerprinted with GenerationCache (mtime/size checks,
+    rehashing only changed inputs) and rendered artifacts are kept in an
+    in-memory LRU, so an unchanged project is answered without re-analysis.
+    Nothing is written to the projects.
+    """
+
+    def __init__(self, metrics: Optional[LatencyMetrics] = None, cache_entries: int = RESULT_CACHE_ENTRIES):
+        self.metrics = metrics or LatencyMetrics()
+        self._cache_entries = cache_entries
+        self._results: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._caches: Dict[Path, "_ResultCache"] = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Imports the analysis and generator modules before the first request."""
+        import deployfilegen.api  # noqa: F401
+        import deployfilegen.generators.bundle  # noqa: F401
+
+    def render(self, payload: Mapping) -> dict:
+        """Handles a decoded /render payload; returns the JSON-ready response."""
+        if not isinstance(payload, Mapping):
+            raise RequestError("Request body must be a JSON object")
+        options = options_from_json(payload.get("options") or {})
+        env = payload.get("env")
+        if env is not None and not (isinstance(env, Mapping) and all(isinstance(v, str) for v in env.values())):
+            raise RequestError("'env' must be an object of strings")
+
+        with capture_warnings() as warnings:
+            if "files" in payload:
+                artifacts, cached = self._render_upload(payload["files"], options, env)
+            elif isinstance(payload.get("project"), str):
+                artifacts, cached = self._render_project(Path(payload["project"]), options, env)
+            else:
+                raise RequestError("Pass either 'project' (a path) or 'files' (relpath -> content)")
+        return {"artifacts": artifacts, "warnings": list(warnings), "cached": cached}
+
+    def _lookup(self, key: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            artifacts = self._results.get(key)
+            if artifacts is not None:
+                self._results.move_to_end(key)
+        self.metrics.count("cache_hits" if artifacts is not None else "cache_misses")
+        return artifacts
+
+    def _store(self, key: str, artifacts: Dict[str, str]) -> None:
+        with self._lock:
+            self._results[key] = artifacts
+            self._results.move_to_end(key)
+            while len(self._results) > self._cache_entries:
+                self._results.popitem(last=False)
+
+    def _render_project(self, root: Path, options: GenerationOptions,
+                        env: Optional[Mapping[str, str]]) -> Tuple[Dict[str, str], bool]:
+        from deployfilegen.api import render_cached
+
+        root = root.expanduser().resolve()
+        if not root.is_dir():
+            raise RequestError(f"Not a directory: {root}")
+        with self._lock:
+            # One cache per root, so file fingerprints are kept across requests
+            cache = self._caches.get(root)
+            if cache is None:
+                cache = self._caches[root] = _ResultCache(root, self)
+        return render_cached(root, options, cache, env)
+
+    def _render_upload(self, files, options: GenerationOptions,
+                       env: Optional[Mapping[str, str]]) -> Tuple[Dict[str, str], bool]:
+        from deployfilegen.api import analyze
+        from deployfilegen.config.env_loader import load_env_layers, validate_environment
+        from deployfilegen.generators.bundle import render_artifacts
+
+        files = _check_upload(files)
+        digest = hashlib.sha256(json.dumps(
+            {"version": __version__, "files": files, "options": asdict(options), "env": env},
+            sort_keys=True,
+        ).encode("utf-8")).hexdigest()
+        key = f"upload:{digest}"
+        artifacts = self._lookup(key)
+        if artifacts is not None:
+            return artifacts, True
+
+        with tempfile.TemporaryDirectory(prefix="deployfilegen-serve-") as tmp:
+            root = Path(tmp)
+            for relpath, content in files.items():
+                path = root / relpath
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content, encoding="utf-8")
+            if env is None:
+                # Uploaded .env layers only: the server's own environment must not leak in
+                layers = load_env_layers(root, environ={})
+                env_files, env = layers.files, layers.values
+            else:
+                env_files = ()
+            config = validate_environment(mode=options.mode, deploy=options.deploy, env=env)
+            artifacts = render_artifacts(analyze(root, options, env_files), config, options)
+        self._store(key, artifacts)
+        return artifacts, False
+
+
+class _ResultCache(GenerationCache):
+    """
+    A project's GenerationCache as seen by the server: fingerprints stay in
+    memory and artifacts go to the service's shared result LRU, never to disk.
+    """
+
+    def __init__(self, root: Path, service: RenderService):
+        super().__init__(root, enabled=False)
+        self._service = service
+
+    def key(self, inputs, options: GenerationOptions, config: dict) -> str:
+        # Fingerprint records are shared by the worker threads
+        with self._service._lock:
+            return f"{self.project_root}:{super().key(inputs, options, config)}"
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        return self._service._lookup(key)
+
+    def put(self, key: str, artifacts: Dict[str, str]) -> None:
+        self._service._store(key, artifacts)
+
+
+def options_from_json(data) -> GenerationOptions:
+    """Builds GenerationOptions from a JSON object of its field names."""
+    if not isinstance(data, Mapping):
+        raise RequestError("'options' must be a JSON object")
+    known = {field.name for field in fields(GenerationOptions)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise RequestError(f"Unknown option(s): {', '.join(unknown)}")
+    return GenerationOptions(**data)
+
+
+def _check_upload(files) -> Dict[str, str]:
+    if not isinstance(files, Mapping) or not files:
+        raise RequestError("'files' must be a non-empty object of relpath -> content")
+    if len(files) > MAX_UPLOAD_FILES:
+        raise RequestError(f"At most {MAX_UPLOAD_FILES} files can be uploaded")
+    checked = {}
+    for relpath, content in files.items():
+        path = PurePosixPath(relpath)
+        if path.is_absolute() or ".." in path.parts or not path.parts or not isinstance(content, str):
+            raise RequestError(f"Invalid upload entry: {relpath!r}")
+        checked[path.as_posix()] = content
+    return checked
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = f"deployfilegen/{__version__}"
+    # Each connection holds a pool worker: idle keep-alive clients are dropped
+    timeout = IDLE_TIMEOUT_SECONDS
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._timed("/healthz", lambda: (200, {"status": "ok", "version": __version__}))
+        elif self.path == "/metrics":
+            self._send(200, self.server.service.metrics.snapshot())
+        else:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/render":
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._timed("/render", self._render)
+
+    def _render(self):
+        header = self.headers.get("Content-Length")
+        if header is None:
+            self.close_connection = True
+            return 411, {"error": "Content-Length is required"}
+        if not header.strip().isdigit():
+            self.close_connection = True
+            return 400, {"error": f"Invalid Content-Length: {header!r}"}
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return 413, {"error": f"Request body over {MAX_BODY_BYTES} bytes"}
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+        try:
+            return 200, self.server.service.render(payload)
+        except (RequestError, GenerationError) as e:
+            return 400, {"error": str(e)}
+        except DeployFileGenError as e:
+            return 422, {"error": str(e)}
+
+    def _timed(self, endpoint: str, handler) -> None:
+        metrics = self.server.service.metrics
+        metrics.count("in_flight")
+        start = time.perf_counter()
+        status = 500
+        try:
+            status, body = handler()
+        except Exception as e:
+            logger.warning(f"{endpoint} failed: {type(e).__name__}: {e}")
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            seconds = time.perf_counter() - start
+            metrics.count("in_flight", -1)
+            # Recorded before replying, so a client reading /metrics next sees its own request
+            metrics.record(endpoint, seconds, status < 400)
+        body.setdefault("seconds", round(seconds, 4))
+        self._send(status, body)
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+_BUSY_BODY = b'{"error": "All workers are busy"}'
+_BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+    b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(_BUSY_BODY), _BUSY_BODY)
+)
+
+
+class _PooledServerMixin:
+    """
+    Hands accepted connections to a fixed pool of worker threads instead of a
+    thread per connection, with a bounded number waiting for a worker.
+    """
+    def setup_pool(self, service: RenderService, workers: int, max_pending: int) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.service = service
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deployfilegen-serve")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.service.metrics.count("rejected")
+            try:
+                request.sendall(_BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._pool.submit(self._process_in_worker, request, client_address)
+
+    def _process_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+class RenderHTTPServer(_PooledServerMixin, HTTPServer):
+    pass
+
+
+if hasattr(socket, "AF_UNIX"):
+    class RenderUnixServer(_PooledServerMixin, socketserver.UnixStreamServer):
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: Optional[Path] = None,
+                  workers: int = DEFAULT_WORKERS, max_pending: Optional[int] = None,
+                  service: Optional[RenderService] = None):
+    """
+    Binds a render server on host:port, or on unix_socket when given (port 0
+    picks a free port). Call serve_forever() on the result; server_close()
+    stops the workers and removes the socket file.
+    """
+    service = service or RenderService()
+    service.warm_up()
+    workers = max(1, workers)
+    max_pending = workers * PENDING_PER_WORKER if max_pending is None else max(0, max_pending)
+    if unix_socket is not None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise GenerationError("Unix sockets are not supported on this platform; use --port")
+        unix_socket = Path(unix_socket)
+        if unix_socket.is_socket():
+            # A stale socket from a previous run; bind() would fail on it
+            unix_socket.unlink()
+        server = RenderUnixServer(str(unix_socket), _RenderHandler, bind_and_activate=False)
+    else:
+        server = RenderHTTPServer((host, port), _RenderHandler, bind_and_activate=False)
+    server.setup_pool(service, workers, max_pending)
+    try:
+        server.server_bind()
+        server.server_activate()
+    except OSError as e:
+        server.server_close()
+        raise GenerationError(f"Could not listen on {unix_socket or f'{host}:{port}'}: {e}")
+    return server
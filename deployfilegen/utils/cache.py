@@ -0,0 +1,171 @@
+import hashlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from deployfilegen import __version__
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.utils.logger import logger
+from deployfilegen.utils.writer import STATE_DIR_NAME, atomic_write_bytes, ensure_state_dir
+
+CACHE_FILE_NAME = "cache.json"
+CACHE_FORMAT = 1
+# Number of option/config combinations kept per project (e.g. dev + prod, ssh + registry).
+MAX_ENTRIES = 8
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class GenerationCache:
+    """
+    On-disk cache of rendered artifacts, stored in .deployfilegen/cache.json.
+
+    Entries are keyed on the content hash of every analysis input (manifests
+    and .env layers), the generation options, the validated config and the
+    deployfilegen version. File hashes are remembered together with mtime and
+    size, so unchanged inputs are only stat()ed, never re-read.
+    """
+
+    def __init__(self, project_root: Path, enabled: bool = True):
+        self.project_root = Path(project_root)
+        self.enabled = enabled
+        self.path = self.project_root / STATE_DIR_NAME / CACHE_FILE_NAME
+        self.hits = 0
+        self.misses = 0
+        self.files_checked = 0
+        self.files_hashed = 0
+        self._dirty = False
+        self._totals_recorded = False
+        self._data = self._load() if enabled else self._empty()
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"format": CACHE_FORMAT, "files": {}, "entries": {}, "totals": {"hits": 0, "misses": 0}}
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return self._empty()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache {self.path}: {e}")
+            return self._empty()
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return self._empty()
+        return data
+
+    def fingerprint(self, relpaths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Returns {relpath: sha256 or None if missing}.
+        Reuses the stored hash when mtime and size are unchanged.
+        """
+        known = self._data["files"]
+        result = {}
+        for relpath in self._expand(relpaths):
+            self.files_checked += 1
+            path = self.project_root / relpath
+            try:
+                stat = path.stat()
+            except OSError:
+                result[relpath] = None
+                if known.pop(relpath, None) is not None:
+                    self._dirty = True
+                continue
+
+            record = known.get(relpath)
+            if record and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+                result[relpath] = record["sha256"]
+                continue
+
+            self.files_hashed += 1
+            digest = file_sha256(path)
+            known[relpath] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+            self._dirty = True
+            result[relpath] = digest
+        return result
+
+    def _expand(self, relpaths: Iterable[str]):
+        """Expands glob entries to the files they currently match (a pattern may match nothing)."""
+        for relpath in relpaths:
+            if any(char in relpath for char in "*?["):
+                yield from sorted(p.relative_to(self.project_root).as_posix()
+                                  for p in self.project_root.glob(relpath))
+            else:
+                yield relpath
+
+    def key(self, inputs: Iterable[str], options: GenerationOptions, config: dict) -> str:
+        """Computes the cache key for one generation run."""
+        payload = {
+            "version": __version__,
+            "inputs": self.fingerprint(inputs),
+            "options": asdict(options),
+            "config": config,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Returns cached artifacts for key, or None on a miss (or when disabled)."""
+        if not self.enabled:
+            return None
+        entry = self._data["entries"].get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(entry["artifacts"])
+
+    def put(self, key: str, artifacts: Dict[str, str]) -> None:
+        if not self.enabled:
+            return
+        entries = self._data["entries"]
+        entries.pop(key, None)
+        entries[key] = {"artifacts": artifacts}
+        # Dicts keep insertion order, so the oldest entries come first.
+        while len(entries) > MAX_ENTRIES:
+            del entries[next(iter(entries))]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persists the cache (atomically) if anything changed during this run."""
+        if not self.enabled:
+            return
+        if not self._totals_recorded:
+            totals = self._data["totals"]
+            totals["hits"] += self.hits
+            totals["misses"] += self.misses
+            self._totals_recorded = True
+        if not (self._dirty or self.hits or self.misses):
+            return
+
+        try:
+            ensure_state_dir(self.project_root)
+            atomic_write_bytes(self.path, json.dumps(self._data, sort_keys=True).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Could not write cache {self.path}: {e}")
+        self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        totals = self._data["totals"]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "files_checked": self.files_checked,
+            "files_hashed": self.files_hashed,
+            "entries": len(self._data["entries"]),
+            "total_hits": totals["hits"],
+            "total_misses": totals["misses"],
+        }
+
+    def describe(self) -> str:
+        """One-line human readable summary of this run's cache activity."""
+        if not self.enabled:
+            return "Cache: disabled (--no-cache)"
+        s = self.stats()
+        outcome = "hit" if s["hits"] else "miss"
+        return (
+            f"Cache: {outcome} | inputs checked: {s['files_checked']}, rehashed: {s['files_hashed']} | "
+            f"entries: {s['entries']} | lifetime hits/misses: {s['total_hits']}/{s['total_misses']}"
+        )
@@ -1,5 +1,24 @@
 import logging
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+# Set while capture_warnings() is active in the current thread/context
+_capture: ContextVar[Optional[List[str]]] = ContextVar("deployfilegen_log_capture", default=None)
+
+
+class _CaptureFilter(logging.Filter):
+    """Diverts records away from the CLI handlers while a capture is active."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sink = _capture.get()
+        if sink is None:
+            return True
+        if record.levelno >= logging.WARNING:
+            sink.append(record.getMessage())
+        return False
+
 
 def setup_logger(name: str = "deployfilegen") -> logging.Logger:
     """Sets up a logger with a clean format for CLI usage."""
@@ -10,6 +29,22 @@ def setup_logger(name: str = "deployfilegen") -> logging.Logger:
         handler.setFormatter(formatter)
         logger.addHandler(handler)
         logger.setLevel(logging.INFO)
+        logger.addFilter(_CaptureFilter())
     return logger
 
+
+@contextmanager
+def capture_warnings() -> Iterator[List[str]]:
+    """
+    Collects warning messages logged in the current context into a list and
+    keeps all records off stdout. Other threads keep logging normally.
+    """
+    sink: List[str] = []
+    token = _capture.set(sink)
+    try:
+        yield sink
+    finally:
+        _capture.reset(token)
+
+
 logger = setup_logger()
@@ -1,50 +1,204 @@
+import difflib
+import hashlib
+import json
 import os
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from deployfilegen.utils.logger import logger
 from deployfilegen.exceptions import GenerationError
 
+# Per-project state directory (generation cache, output manifest).
+STATE_DIR_NAME = ".deployfilegen"
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp() creates files as 0600; new outputs get the usual umask-derived mode instead.
+DEFAULT_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def ensure_state_dir(project_root: Path) -> Path:
+    """Creates .deployfilegen/ (git-ignored by default) and returns its path."""
+    state_dir = Path(project_root) / STATE_DIR_NAME
+    state_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = state_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("# Created by deployfilegen\n*\n", encoding="utf-8")
+    return state_dir
+
+
+def atomic_write_bytes(path: Path, data: bytes, mode: int = DEFAULT_FILE_MODE) -> None:
+    """
+    Writes data to a temp file next to path and renames it into place,
+    so readers never observe a partially written file.
+    """
+    path = Path(path)
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 class FileWriter:
     """
-    Handles file writing with safety checks (overwrite protection)
-    and automatic directory creation.
+    Handles file writing with safety checks (overwrite protection),
+    automatic directory creation and atomic replacement.
+
+    When project_root is given, a manifest of generated outputs
+    (.deployfilegen/manifest.json) records the hash, size and mtime of every
+    file written. Byte-identical outputs are skipped, usually without even
+    reading the file, so mtimes (and Docker build caches) stay untouched.
+
+    In check mode nothing is written; differences are collected in
+    ``self.diffs`` instead, and ``self.overwrites`` lists the ones that are
+    existing files (a real run only replaces those with --force).
     """
-    
-    def __init__(self, force: bool = False):
+
+    def __init__(self, force: bool = False, project_root: Optional[Path] = None, check: bool = False):
         self.force = force
+        self.check = check
+        self.project_root = Path(project_root) if project_root else None
+        self.diffs: List[Tuple[str, str]] = []
+        self.overwrites: List[str] = []
+        self.unchanged: List[str] = []
+        self._manifest: Dict[str, dict] = self._load_manifest()
+        self._manifest_dirty = False
+
+    @property
+    def manifest_path(self) -> Optional[Path]:
+        if self.project_root is None:
+            return None
+        return self.project_root / STATE_DIR_NAME / MANIFEST_FILE_NAME
 
-    def write(self, path: Path, content: str) -> None:
+    def _load_manifest(self) -> Dict[str, dict]:
+        if self.manifest_path is None:
+            return {}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _key(self, path: Path) -> str:
+        if self.project_root is not None:
+            try:
+                return path.relative_to(self.project_root).as_posix()
+            except ValueError:
+                pass
+        return str(path)
+
+    def _record(self, key: str, digest: str, path: Path) -> None:
+        if self.project_root is None:
+            return
+        stat = path.stat()
+        self._manifest[key] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self._manifest_dirty = True
+
+    def _matches_manifest(self, key: str, digest: str, path: Path) -> bool:
+        """True if the manifest says path already holds exactly this content (stat-only check)."""
+        record = self._manifest.get(key)
+        if not record or record.get("sha256") != digest:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns
+
+    def write(self, path: Path, content: str) -> bool:
         """
         Writes content to path.
-        
+
         Args:
             path: Path object or string to the target file.
             content: String content to write.
-        
+
+        Returns:
+            True if the file was created or replaced, False if it was left alone
+            (identical content, existing file without --force, or check mode).
+
         Raises:
             GenerationError: If write fails (permission, etc.)
         """
         target_path = Path(path)
-        
-        # Ensure parent directory exists
+        key = self._key(target_path)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self._matches_manifest(key, digest, target_path):
+            self.unchanged.append(key)
+            return False
+
         try:
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            existing = target_path.read_bytes()
+        except FileNotFoundError:
+            existing = None
         except OSError as e:
-            raise GenerationError(f"Failed to create directory {target_path.parent}: {e}")
+            raise GenerationError(f"Failed to read {target_path}: {e}")
+
+        if existing == data:
+            # Same bytes on disk: adopt the file into the manifest without rewriting it.
+            self.unchanged.append(key)
+            if not self.check:
+                self._record(key, digest, target_path)
+            return False
 
-        # Check if file exists
-        if target_path.exists():
+        if self.check:
+            old_text = existing.decode("utf-8", errors="replace") if existing is not None else ""
+            diff = difflib.unified_diff(
+                old_text.splitlines(keepends=True), content.splitlines(keepends=True),
+                fromfile=f"a/{key}" if existing is not None else "/dev/null", tofile=f"b/{key}",
+            )
+            self.diffs.append((key, "".join(diff)))
+            if existing is not None:
+                self.overwrites.append(key)
+            return False
+
+        mode = DEFAULT_FILE_MODE
+        if existing is not None:
             if not self.force:
                 return False
-            else:
-                logger.warning(f"OVERWRITE: {target_path}")
+            logger.warning(f"OVERWRITE: {target_path}")
+            mode = target_path.stat().st_mode & 0o7777
         else:
             logger.info(f"CREATE: {target_path}")
 
-        # Write file
         try:
-            with open(target_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            return True
+            atomic_write_bytes(target_path, data, mode=mode)
         except OSError as e:
             raise GenerationError(f"Failed to write to {target_path}: {e}")
+        self._record(key, digest, target_path)
+        return True
+
+    def save_manifest(self) -> None:
+        """Persists the output manifest (no-op in check mode or without a project root)."""
+        if self.check or not self._manifest_dirty or self.manifest_path is None:
+            return
+        try:
+            ensure_state_dir(self.project_root)
+            payload = json.dumps(self._manifest, indent=2, sort_keys=True) + "\n"
+            atomic_write_bytes(self.manifest_path, payload.encode("utf-8"))
+        except OSError as e:
+            raise GenerationError(f"Failed to write manifest {self.manifest_path}: {e}")
+        self._manifest_dirty = False
@@ -0,0 +1,30 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+MANAGE_PY = "import os\nos.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shop.settings')\n"
+ENV = "DEPLOY_HOST=1.2.3.4\nDEPLOY_USER=ubuntu\n"
+
+
+@pytest.fixture
+def make_project(tmp_path):
+    """
+    Factory for a minimal project under tmp_path / name: backend/ with a
+    'shop' Django project and requirements.txt, a .env (unless env is None)
+    and, given its package.json, a frontend/.
+    """
+    def make(name: str = "", env: Optional[str] = ENV, package_json: Optional[dict] = None) -> Path:
+        root = tmp_path / name
+        (root / "backend").mkdir(parents=True)
+        (root / "backend" / "manage.py").write_text(MANAGE_PY)
+        (root / "backend" / "requirements.txt").write_text("django\n")
+        if package_json is not None:
+            (root / "frontend").mkdir()
+            (root / "frontend" / "package.json").write_text(json.dumps(package_json))
+        if env is not None:
+            (root / ".env").write_text(env)
+        return root
+
+    return make
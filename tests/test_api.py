@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from deployfilegen.api import iter_render, render
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import EnvConfigError
+
+
+def _snapshot(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*"))
+
+
+def test_render_is_pure(capsys, make_project):
+    root = make_project("shop")
+    before = _snapshot(root)
+    cwd = os.getcwd()
+
+    artifacts = render(root, GenerationOptions())
+
+    assert "backend/Dockerfile" in artifacts
+    assert _snapshot(root) == before
+    assert os.getcwd() == cwd
+    assert capsys.readouterr().out == ""
+
+
+def test_iter_render_streams_bytes_in_render_order(make_project):
+    root = make_project("shop")
+    rendered = render(root)
+    streamed = list(iter_render(str(root)))
+    assert [relpath for relpath, _ in streamed] == list(rendered)
+    assert all(isinstance(data, bytes) for _, data in streamed)
+    assert dict((relpath, data.decode()) for relpath, data in streamed) == rendered
+
+
+def test_explicit_env_skips_env_files(make_project):
+    root = make_project("shop")
+    (root / ".env").unlink()
+    artifacts = render(root, env={"DEPLOY_HOST": "5.6.7.8", "DEPLOY_USER": "deploy"})
+    assert "backend/Dockerfile" in artifacts
+
+    with pytest.raises(EnvConfigError):
+        render(root, GenerationOptions(deploy="registry"), env={})
+
+
+def test_warnings_go_to_callback(capsys, make_project):
+    root = make_project("shop")
+    (root / "backend" / ".python-version").write_text("2.7\n")
+    warnings = []
+    render(root, on_warning=warnings.append)
+    assert any("2.7" in message for message in warnings)
+    assert capsys.readouterr().out == ""
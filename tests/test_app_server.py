@@ -0,0 +1,55 @@
+from deployfilegen.analyzer.profile import BackendProfile, analyze_backend, parse_requirements
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.backend import generate_backend_dockerfile, generate_gunicorn_config
+
+
+def _backend(tmp_path, requirements):
+    (tmp_path / "manage.py").write_text("os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shop.settings')")
+    (tmp_path / "shop").mkdir()
+    (tmp_path / "shop" / "asgi.py").write_text("application = None")
+    (tmp_path / "requirements.txt").write_text(requirements)
+    return tmp_path
+
+
+def _load(config_source, env=None):
+    import os
+    from unittest.mock import patch
+    namespace = {}
+    with patch.dict(os.environ, env or {}, clear=True):
+        exec(compile(config_source, "gunicorn.conf.py", "exec"), namespace)
+    return namespace
+
+
+def test_parse_requirements_normalizes_names():
+    content = "Django>=4.2\n# comment\n-r base.txt\nchannels[daphne]==4.0  # ws\nPsycopg2_Binary\n-e git+https://x/y.git\n"
+    assert parse_requirements(content) == ("django", "channels", "psycopg2-binary")
+
+
+def test_default_django_asgi_py_stays_wsgi(tmp_path):
+    profile = analyze_backend(_backend(tmp_path, "Django\ngunicorn\n"))
+    assert profile.server == "wsgi"
+    dockerfile = generate_backend_dockerfile("prod", profile=profile)
+    assert 'CMD ["gunicorn", "shop.wsgi:application", "--config", "gunicorn.conf.py"]' in dockerfile
+
+
+def test_channels_project_uses_asgi_and_uvicorn_workers(tmp_path):
+    profile = analyze_backend(_backend(tmp_path, "Django\nchannels\nuvicorn[standard]\ngunicorn\n"))
+    assert profile.server == "asgi"
+    assert 'CMD ["gunicorn", "shop.asgi:application"' in generate_backend_dockerfile("prod", profile=profile)
+    config = _load(generate_gunicorn_config(profile))
+    assert config["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert config["threads"] == 1
+
+
+def test_gunicorn_config_sizes_from_env_and_profile():
+    profile = BackendProfile(path=None)
+    config = _load(generate_gunicorn_config(profile, GenerationOptions(sizing="memory")))
+    assert config["worker_class"] == "gthread"
+    assert config["threads"] == 8
+    assert config["preload_app"] is True
+    assert config["worker_tmp_dir"] == "/dev/shm"
+    assert config["max_requests_jitter"] == 100
+
+    overridden = _load(generate_gunicorn_config(profile), {"GUNICORN_WORKERS": "17", "GUNICORN_THREADS": "2"})
+    assert overridden["workers"] == 17
+    assert overridden["threads"] == 2
@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from deployfilegen.batch import expand_roots, generate_project, run_batch
+from deployfilegen.cli import app
+from deployfilegen.config.options import GenerationOptions
+
+runner = CliRunner()
+
+
+def test_generate_project_uses_explicit_root(make_project):
+    root = make_project("shop")
+    cwd = os.getcwd()
+    result = generate_project(root, GenerationOptions())
+    assert os.getcwd() == cwd
+    assert result.ok and not result.cached
+    assert "backend/Dockerfile" in result.written
+    assert (root / "backend" / "Dockerfile").is_file()
+
+    again = generate_project(root, GenerationOptions())
+    assert again.cached and again.written == ()
+    assert again.unchanged == len(result.written)
+
+
+def test_generate_project_reports_errors_and_warnings(tmp_path, make_project):
+    missing_env = generate_project(make_project("a", env=None), GenerationOptions())
+    assert not missing_env.ok
+    assert "No .env files" in missing_env.error
+
+    registry = generate_project(make_project("b"), GenerationOptions(deploy="registry"))
+    assert not registry.ok and "DOCKER_USERNAME" in registry.error
+
+    assert generate_project(tmp_path / "nope", GenerationOptions()).error == "Not a directory"
+
+
+def test_check_mode_flags_stale_projects(make_project):
+    root = make_project("shop")
+    result = generate_project(root, GenerationOptions(), check=True)
+    assert not result.ok
+    assert "backend/Dockerfile" in result.out_of_date
+    assert not (root / "backend" / "Dockerfile").exists()
+
+
+def test_expand_roots_globs_directories(tmp_path):
+    for name in ("one", "two"):
+        (tmp_path / "repos" / name).mkdir(parents=True)
+    (tmp_path / "repos" / "notes.txt").write_text("")
+    roots = expand_roots([tmp_path / "repos" / "one"], [str(tmp_path / "repos" / "*")])
+    assert [root.name for root in roots] == ["one", "two"]
+
+
+def test_run_batch_in_process_pool_isolates_failures(tmp_path, make_project):
+    roots = [make_project("a"), make_project("bad", env=None), make_project("c")]
+    seen = []
+    results = run_batch(roots, GenerationOptions(), jobs=2, on_result=seen.append)
+    assert [result.ok for result in results] == [True, False, True]
+    assert len(seen) == 3
+    assert (tmp_path / "c" / "docker-compose.prod.yml").is_file()
+
+
+def test_batch_command(tmp_path, make_project):
+    make_project("a")
+    make_project("b", env=None)
+    result = runner.invoke(app, ["batch", "--glob", str(tmp_path / "*"), "-j", "1", "--json"])
+    assert result.exit_code == 1
+    payload = json.loads(result.stdout)
+    assert [(Path(item["root"]).name, item["ok"]) for item in payload] == [("a", True), ("b", False)]
+
+
+def test_batch_accepts_every_init_generation_option(tmp_path, make_project):
+    import typer.main
+
+    commands = typer.main.get_command(app).commands
+    flags = {name: {opt for param in commands[name].params for opt in param.opts} for name in ("init", "batch")}
+    assert flags["init"] - flags["batch"] == {"--cache-stats"}
+
+    make_project("a")
+    result = runner.invoke(app, ["batch", str(tmp_path / "a"), "-j", "1", "--proxy", "--rolling",
+                                 "--discover-depth", "0", "--project-name", "shop"])
+    assert result.exit_code == 0
+    assert (tmp_path / "a" / "deploy" / "rollout.sh").is_file()
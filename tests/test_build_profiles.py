@@ -0,0 +1,40 @@
+import pytest
+
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import GenerationError
+from deployfilegen.generators.backend import generate_backend_dockerfile
+
+
+def test_standard_profile_has_no_buildkit_features():
+    dockerfile = generate_backend_dockerfile("prod", override_project_name="shop")
+    assert "# syntax=" not in dockerfile
+    assert "--mount=type=cache" not in dockerfile
+    assert "pip wheel --no-cache-dir" in dockerfile
+
+
+def test_fast_profile_uses_cache_mounts():
+    options = GenerationOptions(build_profile="fast")
+    dockerfile = generate_backend_dockerfile("prod", override_project_name="shop", options=options)
+    assert dockerfile.startswith("# syntax=docker/dockerfile:1\n")
+    assert "--mount=type=cache,target=/root/.cache/pip" in dockerfile
+    assert "--mount=type=cache,target=/var/lib/apt,sharing=locked" in dockerfile
+    assert "rm -rf /var/lib/apt/lists/*" not in dockerfile
+    assert "--mount=type=bind,from=builder,source=/app/wheels" in dockerfile
+    assert "COPY --from=builder /app/wheels /wheels" not in dockerfile
+
+
+def test_uv_installer_builds_a_virtualenv():
+    options = GenerationOptions(build_profile="fast", installer="uv")
+    prod = generate_backend_dockerfile("prod", override_project_name="shop", options=options)
+    assert "COPY --from=ghcr.io/astral-sh/uv" in prod
+    assert "--mount=type=cache,target=/root/.cache/uv" in prod
+    assert "COPY --from=builder /opt/venv /opt/venv" in prod
+    assert 'ENV PATH="/opt/venv/bin:$PATH"' in prod
+
+    dev = generate_backend_dockerfile("dev", options=options)
+    assert "uv pip install --system -r requirements.txt" in dev
+
+
+def test_unknown_build_profile_is_rejected():
+    with pytest.raises(GenerationError):
+        GenerationOptions(build_profile="turbo")
@@ -0,0 +1,36 @@
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.generators.github import generate_github_workflow
+from deployfilegen.generators.scripts import BUILD_SCRIPT_PATH, generate_build_script
+
+
+def test_build_script_uses_persistent_builder_and_local_cache():
+    script = generate_build_script()
+    assert script.startswith("#!/usr/bin/env bash")
+    assert "docker buildx create --name \"$BUILDER\"" in script
+    assert "docker buildx bake --builder \"$BUILDER\"" in script
+    assert 'backend.cache-from=type=local,src="$CACHE_DIR/backend"' in script
+    assert 'frontend.cache-to=type=local,dest="$CACHE_DIR/frontend.new",mode=max' in script
+    assert 'frontend.tags="$PROJECT-frontend"' in script
+
+
+def test_build_script_pulls_runtime_images_concurrently():
+    script = generate_build_script()
+    pull = script.index("pull --ignore-buildable --quiet &")
+    bake = script.index("docker buildx bake")
+    assert pull < bake < script.index('wait "$pull_pid"')
+
+
+def test_ssh_workflow_runs_build_script():
+    workflow = generate_github_workflow({}, deploy="ssh")
+    assert f"bash {BUILD_SCRIPT_PATH}" in workflow
+    assert "docker compose -f docker-compose.prod.yml build" not in workflow
+
+
+def test_build_script_only_for_ssh_strategy(tmp_path):
+    profile = ProjectProfile(root=tmp_path)
+    ssh = render_artifacts(profile, {}, GenerationOptions(github_only=True))
+    registry = render_artifacts(profile, {}, GenerationOptions(github_only=True, deploy="registry"))
+    assert BUILD_SCRIPT_PATH in ssh
+    assert BUILD_SCRIPT_PATH not in registry
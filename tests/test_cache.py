@@ -0,0 +1,64 @@
+import os
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from deployfilegen.cli import app
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.utils.cache import GenerationCache
+
+runner = CliRunner()
+
+NEXT_APP = {"dependencies": {"next": "14"}}
+
+
+def _invoke(tmp_path, *args):
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        return runner.invoke(app, ["init", "--mode", "dev", *args])
+    finally:
+        os.chdir(old_cwd)
+
+
+def test_second_run_skips_analysis(tmp_path, make_project):
+    make_project(package_json=NEXT_APP)
+    first = _invoke(tmp_path, "--cache-stats")
+    assert first.exit_code == 0
+    assert "Cache: miss" in first.stdout
+    assert (tmp_path / ".deployfilegen" / "cache.json").exists()
+
+    with patch("deployfilegen.analyzer.profile.analyze_project") as analyze:
+        second = _invoke(tmp_path, "--cache-stats")
+    assert second.exit_code == 0
+    analyze.assert_not_called()
+    assert "reusing cached output" in second.stdout
+    assert "Cache: hit" in second.stdout
+    assert "rehashed: 0" in second.stdout
+
+
+def test_manifest_change_invalidates_cache(tmp_path, make_project):
+    make_project(package_json=NEXT_APP)
+    _invoke(tmp_path)
+    (tmp_path / "frontend" / "package.json").write_text('{"devDependencies": {"vite": "5"}}')
+
+    result = _invoke(tmp_path, "--force", "--cache-stats")
+    assert "Cache: miss" in result.stdout
+    assert '"5173:5173"' in (tmp_path / "docker-compose.dev.yml").read_text()
+
+
+def test_no_cache_leaves_no_cache_file(tmp_path, make_project):
+    make_project(package_json=NEXT_APP)
+    result = _invoke(tmp_path, "--no-cache", "--cache-stats")
+    assert result.exit_code == 0
+    assert "Cache: disabled" in result.stdout
+    assert not (tmp_path / ".deployfilegen" / "cache.json").exists()
+
+
+def test_cache_key_depends_on_options(tmp_path, make_project):
+    make_project(package_json=NEXT_APP)
+    cache = GenerationCache(tmp_path)
+    dev_key = cache.key([".env"], GenerationOptions(mode="dev"), {})
+    prod_key = cache.key([".env"], GenerationOptions(mode="prod"), {})
+    assert dev_key != prod_key
+    assert cache.files_hashed == 1  # second lookup reused the stored hash
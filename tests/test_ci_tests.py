@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from deployfilegen.analyzer.profile import BackendProfile, FrontendProfile, ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import GenerationError
+from deployfilegen.generators.github import generate_github_workflow
+
+
+def _profile(package_manager="pnpm", lockfile="pnpm-lock.yaml", scripts=("build", "test")):
+    return ProjectProfile(
+        root=Path("."),
+        backend=BackendProfile(path=Path("backend")),
+        frontend=FrontendProfile(path=Path("frontend"), scripts=scripts,
+                                 package_manager=package_manager, lockfile=lockfile),
+    )
+
+
+def test_no_test_stage_by_default():
+    workflow = generate_github_workflow({}, deploy="ssh", profile=_profile())
+    assert "backend-tests" not in workflow
+    assert "needs:" not in workflow
+
+
+def test_backend_tests_are_sharded_with_pip_cache():
+    workflow = generate_github_workflow({}, deploy="ssh", profile=_profile(), with_tests=True, test_shards=4)
+    assert "shard: [0, 1, 2, 3]" in workflow
+    assert 'TEST_SHARDS: "4"' in workflow
+    assert "cache: pip" in workflow
+    assert "cache-dependency-path: backend/requirements.txt" in workflow
+    assert "python manage.py test $modules" in workflow
+
+
+def test_frontend_tests_cache_on_detected_lockfile():
+    workflow = generate_github_workflow({}, deploy="ssh", profile=_profile(), with_tests=True)
+    assert "cache: pnpm" in workflow
+    assert "cache-dependency-path: frontend/pnpm-lock.yaml" in workflow
+    assert "run: corepack enable" in workflow
+    assert "run: pnpm run test" in workflow
+
+
+def test_frontend_tests_skipped_without_test_script():
+    workflow = generate_github_workflow({}, deploy="ssh", profile=_profile(scripts=("build",)),
+                                        with_tests=True)
+    assert "frontend-tests" not in workflow
+    assert "needs: [backend-tests]" in workflow
+
+
+def test_deploy_is_gated_on_tests():
+    ssh = generate_github_workflow({}, deploy="ssh", profile=_profile(), with_tests=True)
+    assert "needs: [backend-tests, frontend-tests]" in ssh
+    registry = generate_github_workflow({}, deploy="registry", profile=_profile(), with_tests=True)
+    assert "needs: [changes, build-and-push, backend-tests, frontend-tests]" in registry
+
+
+def test_test_shards_validated():
+    with pytest.raises(GenerationError):
+        GenerationOptions(test_shards=0)
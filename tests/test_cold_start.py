@@ -0,0 +1,121 @@
+from typer.testing import CliRunner
+
+from deployfilegen.analyzer.profile import BackendProfile, ProjectProfile, analyze_backend
+from deployfilegen.cli import app
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.backend import generate_backend_dockerfile, generate_entrypoint_script
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.generators.compose import generate_docker_compose
+from deployfilegen.generators.proxy import generate_proxy_config
+from deployfilegen.utils.logger import capture_warnings
+
+WHITENOISE = BackendProfile(path=None, requirements=("django", "whitenoise"))
+
+
+def test_default_image_collects_static_at_start():
+    dockerfile = generate_backend_dockerfile("prod", profile=WHITENOISE)
+    assert "collectstatic" not in dockerfile
+    assert "compileall" not in dockerfile
+    assert "collectstatic" in generate_entrypoint_script()
+
+
+def test_cold_start_builds_static_and_bytecode_into_image():
+    dockerfile = generate_backend_dockerfile("prod", profile=WHITENOISE, options=GenerationOptions(cold_start=True))
+    runner = dockerfile[dockerfile.index("# Stage 2"):]
+    step = runner.index("python manage.py collectstatic --noinput")
+    assert runner.index("COPY --chown=appuser:appgroup . .") < step < runner.index("USER appuser")
+    assert "compileall -q -j 0 --invalidation-mode unchecked-hash /app" in runner
+    # The placeholder key lives only in that RUN's environment
+    assert "ENV SECRET_KEY" not in runner
+
+
+def test_cold_start_uv_compiles_the_venv():
+    dockerfile = generate_backend_dockerfile("prod", profile=WHITENOISE,
+                                             options=GenerationOptions(cold_start=True, installer="uv"))
+    assert "unchecked-hash /app /opt/venv" in dockerfile
+
+
+def test_cold_start_distroless_uses_exec_form():
+    dockerfile = generate_backend_dockerfile("prod", profile=WHITENOISE,
+                                             options=GenerationOptions(cold_start=True, runtime="distroless"))
+    runner = dockerfile[dockerfile.index("# Stage 2"):]
+    assert 'RUN ["python3", "-c", "import os, runpy, sys;' in runner
+    assert '"/app", "/opt/deps"]' in runner
+    assert runner.index("USER root") < runner.index("USER nonroot")
+    assert "run --rm backend python3 manage.py collectstatic" not in runner
+
+
+def test_cold_start_entrypoint_only_execs():
+    script = generate_entrypoint_script(cold_start=True)
+    assert "collectstatic" not in script
+    assert script.rstrip().endswith('exec "$@"')
+
+
+def test_cold_start_compose_and_proxy_drop_static_volume():
+    compose = generate_docker_compose("prod", {}, proxy=True, cold_start=True)
+    assert "static_volume" not in compose
+    assert "media_volume:/app/media" in compose
+
+    proxy = generate_proxy_config(cold_start=True)
+    static = proxy[proxy.index("location /static/"):proxy.index("location /media/")]
+    assert "proxy_pass http://backend;" in static
+    assert "alias" not in static
+
+
+def test_detects_static_storage_from_settings(tmp_path):
+    backend = tmp_path / "backend"
+    (backend / "config" / "settings").mkdir(parents=True)
+    (backend / "manage.py").write_text("os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')")
+    (backend / "config" / "settings" / "base.py").write_text(
+        'STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}\n')
+    assert analyze_backend(backend).static_storage == "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+
+def test_bundle_passes_cold_start(tmp_path):
+    profile = ProjectProfile(root=tmp_path, backend=BackendProfile(path=tmp_path / "backend"))
+    artifacts = render_artifacts(profile, {}, GenerationOptions(cold_start=True, proxy=True))
+    assert "collectstatic" not in artifacts["backend/entrypoint.sh"]
+    assert "static_volume" not in artifacts["docker-compose.prod.yml"]
+    assert "built into the backend image" in artifacts["proxy/nginx.conf"]
+
+
+def test_detects_env_the_settings_require(tmp_path):
+    backend = tmp_path / "backend"
+    (backend / "config").mkdir(parents=True)
+    (backend / "manage.py").write_text("os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')")
+    (backend / "config" / "settings.py").write_text(
+        'SECRET_KEY = os.environ["SECRET_KEY"]\n'
+        'DEBUG = env.bool("DEBUG", default=False)\n'
+        'DATABASES = {"default": env.db()}\n'
+        'REDIS_URL = config("REDIS_URL")\n'
+        'SENTRY_DSN = os.environ.get("SENTRY_DSN")\n'
+        'STRIPE_KEY = env("STRIPE_KEY")\n')
+    assert analyze_backend(backend).settings_env == ("SECRET_KEY", "DATABASE_URL", "REDIS_URL", "STRIPE_KEY")
+
+
+def test_cold_start_flags_env_the_build_lacks():
+    profile = BackendProfile(path=None, requirements=("django", "whitenoise"),
+                             settings_env=("SECRET_KEY", "DATABASE_URL"))
+    with capture_warnings() as warnings:
+        dockerfile = generate_backend_dockerfile("prod", profile=profile, options=GenerationOptions(cold_start=True))
+    assert "# Settings read without a default at build time: DATABASE_URL\n" in dockerfile
+    assert "ARG COLLECTSTATIC_SETTINGS\n" in dockerfile
+    assert "${COLLECTSTATIC_SETTINGS:+DJANGO_SETTINGS_MODULE=$COLLECTSTATIC_SETTINGS}" in dockerfile
+    assert any("DATABASE_URL without a default" in w and "--build-arg COLLECTSTATIC_SETTINGS" in w
+               for w in warnings)
+
+    with capture_warnings() as warnings:
+        dockerfile = generate_backend_dockerfile("prod", profile=WHITENOISE, options=GenerationOptions(cold_start=True))
+    assert "without a default at build time" not in dockerfile
+    assert not any("without a default" in w for w in warnings)
+
+
+def test_init_checklist_lists_build_time_env(make_project, monkeypatch):
+    root = make_project()
+    (root / "backend" / "shop").mkdir()
+    (root / "backend" / "shop" / "settings.py").write_text('DATABASES = {"default": env.db()}\n')
+    monkeypatch.chdir(root)
+    result = CliRunner().invoke(app, ["init", "--mode", "prod", "--cold-start", "--no-cache"])
+    assert result.exit_code == 0, result.stdout
+    assert "5. Build: collectstatic runs in docker build" in result.stdout
+    assert "Your settings read DATABASE_URL without a default." in result.stdout
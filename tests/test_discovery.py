@@ -0,0 +1,158 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from deployfilegen.analyzer import discovery
+from deployfilegen.analyzer.discovery import discover_services, service_names
+from deployfilegen.analyzer.profile import PROFILE_INPUTS, analyze_project, profile_inputs
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import GenerationError
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.utils.logger import capture_warnings
+
+MANAGE_PY = "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shop.settings')"
+CONFIG = {"DEPLOY_HOST": "1.2.3.4", "DEPLOY_USER": "ubuntu"}
+
+
+def _write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _app(path, scripts=("dev", "build"), **extra):
+    _write(path / "package.json", json.dumps({"scripts": {name: "x" for name in scripts},
+                                              "devDependencies": {"vite": "5"}, **extra}))
+
+
+def _monorepo(root):
+    _write(root / "backend" / "manage.py", MANAGE_PY)
+    _app(root / "frontend")
+    _write(root / "services" / "billing" / "manage.py", MANAGE_PY)
+    _write(root / "services" / "billing" / "requirements.txt", "django\npsycopg2\n")
+    _app(root / "apps" / "web")
+    _app(root / "packages" / "ui", scripts=("build",))
+    _write(root / "package.json", json.dumps({"workspaces": ["apps/*", "packages/*"]}))
+    return root
+
+
+def test_discovers_services_and_skips_libraries(tmp_path):
+    root = _monorepo(tmp_path)
+    layout = discover_services(root)
+    assert layout.django == (root / "backend", root / "services" / "billing")
+    assert layout.node == (root / "apps" / "web", root / "frontend")
+    assert root / "packages" / "ui" / "package.json" in layout.manifests
+
+
+def test_prunes_dependency_and_hidden_directories(tmp_path):
+    root = _monorepo(tmp_path)
+    _app(root / "node_modules" / "some-app")
+    _write(root / ".venv" / "lib" / "manage.py")
+    _write(root / "apps" / "web" / "node_modules" / "x" / "manage.py")
+    _write(root / "services" / "billing" / "shop" / "settings.py")
+    listed = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.fspath(path))
+        return real_scandir(path)
+
+    with patch.object(discovery.os, "scandir", recording_scandir):
+        layout = discover_services(root)
+    assert len(layout.django) == 2 and len(layout.node) == 2
+    assert not any("node_modules" in path or ".venv" in path for path in listed)
+    # Services are not descended into
+    assert not any(path.startswith(str(root / "services" / "billing")) for path in listed)
+
+
+def test_depth_limit(tmp_path):
+    _write(tmp_path / "a" / "b" / "c" / "api" / "manage.py", MANAGE_PY)
+    assert discover_services(tmp_path, max_depth=3).django == ()
+    assert discover_services(tmp_path, max_depth=4).django == (tmp_path / "a" / "b" / "c" / "api",)
+    assert discover_services(tmp_path, max_depth=0).django == ()
+
+
+def test_service_names_avoid_collisions(tmp_path):
+    paths = [tmp_path / "apps" / "api", tmp_path / "services" / "api", tmp_path / "tools" / "backend"]
+    assert list(service_names(paths, tmp_path).values()) == ["api", "services-api", "tools-backend"]
+
+
+def test_each_service_gets_an_image_and_compose_service(tmp_path):
+    root = _monorepo(tmp_path)
+    profile = analyze_project(root)
+    assert [b.service for b in profile.backends] == ["backend", "billing"]
+    assert [f.service for f in profile.frontends] == ["frontend", "web"]
+    assert profile.extra_backends[0].build_packages == ("gcc", "libpq-dev")
+
+    artifacts = render_artifacts(profile, CONFIG, GenerationOptions())
+    for relpath in ("services/billing/Dockerfile", "services/billing/entrypoint.sh",
+                    "apps/web/Dockerfile", "apps/web/nginx.conf"):
+        assert relpath in artifacts
+    compose = artifacts["docker-compose.prod.yml"]
+    assert "  billing:\n    build:\n      context: ./services/billing" in compose
+    assert '"8001:8000"' in compose and '"8081:8080"' in compose
+    assert 'billing.tags="$PROJECT-billing"' in artifacts["deploy/build.sh"]
+
+    registry = render_artifacts(profile, {**CONFIG, "DOCKER_USERNAME": "u"}, GenerationOptions(deploy="registry"))
+    assert "image: ${WEB_IMAGE_NAME}:${WEB_IMAGE_TAG:-${IMAGE_TAG:-latest}}" in registry["docker-compose.prod.yml"]
+    # ...which the workflow builds and pushes like backend/ and frontend/
+    workflow = registry[".github/workflows/deploy.yml"]
+    assert "          billing:\n            - 'services/billing/**'" in workflow
+    assert '\'["backend","frontend","billing","web"]\'' in workflow
+    assert '"web":"WEB_IMAGE_NAME"' in workflow and '"web":"./apps/web"' in workflow
+    assert "context: ${{ env.BUILD_CONTEXT }}" in workflow
+    assert "export BILLING_IMAGE_NAME=${{ secrets.BILLING_IMAGE_NAME }}" in workflow
+
+    dev = render_artifacts(profile, CONFIG, GenerationOptions(mode="dev"))["docker-compose.dev.yml"]
+    # Both Vite apps listen on 5173; the extra one gets the next free host port
+    assert '"5173:5173"' in dev and '"5174:5173"' in dev
+
+
+def test_layout_without_extra_services_is_unchanged(tmp_path):
+    _write(tmp_path / "backend" / "manage.py", MANAGE_PY)
+    _app(tmp_path / "frontend")
+    with_discovery = render_artifacts(analyze_project(tmp_path), CONFIG, GenerationOptions())
+    without = render_artifacts(analyze_project(tmp_path, discover_depth=0), CONFIG, GenerationOptions())
+    assert with_discovery == without
+    assert profile_inputs(tmp_path) == PROFILE_INPUTS
+
+
+def test_cache_inputs_follow_discovered_services(tmp_path):
+    root = _monorepo(tmp_path)
+    inputs = profile_inputs(root)
+    assert "services/billing/requirements.txt" in inputs
+    assert "apps/web/package-lock.json" in inputs
+    assert "apps/.nvmrc" in inputs
+    assert profile_inputs(root, discover_depth=0) == PROFILE_INPUTS
+
+
+def test_discover_depth_is_validated():
+    with pytest.raises(GenerationError):
+        GenerationOptions(discover_depth=-1)
+
+
+def test_monorepo_without_backend_or_frontend_has_no_phantom_services(tmp_path):
+    _write(tmp_path / "services" / "api" / "manage.py", MANAGE_PY)
+    _app(tmp_path / "apps" / "web")
+    with capture_warnings() as warnings:
+        profile = analyze_project(tmp_path)
+    assert profile.backend is None and profile.frontend is None
+    assert "No lockfile found in web/; installs will not be reproducible." in warnings
+
+    ssh = render_artifacts(profile, CONFIG, GenerationOptions())
+    registry = render_artifacts(profile, {**CONFIG, "DOCKER_USERNAME": "u"}, GenerationOptions(deploy="registry"))
+    dev = render_artifacts(profile, CONFIG, GenerationOptions(mode="dev"))
+    generated = [ssh["docker-compose.prod.yml"], ssh["deploy/build.sh"], dev["docker-compose.dev.yml"],
+                 registry["docker-compose.prod.yml"], registry[".github/workflows/deploy.yml"]]
+    for content in generated:
+        assert "./backend" not in content and "./frontend" not in content
+        assert "  backend:" not in content and "  frontend:" not in content
+    assert "context: ./services/api" in ssh["docker-compose.prod.yml"]
+    assert 'api.tags="$PROJECT-api"' in ssh["deploy/build.sh"]
+    assert "backend" not in ssh["deploy/build.sh"]
+    workflow = registry[".github/workflows/deploy.yml"]
+    assert "'[\"api\",\"web\"]'" in workflow and "BACKEND_IMAGE_NAME" not in workflow
+
+    with pytest.raises(GenerationError):
+        render_artifacts(profile, CONFIG, GenerationOptions(proxy=True))
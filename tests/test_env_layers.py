@@ -0,0 +1,75 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from deployfilegen.config.env_loader import load_env_layers, parse_env_file, validate_environment
+from deployfilegen.exceptions import EnvConfigError
+
+
+def _project(root, layers):
+    for relpath, content in layers.items():
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return root
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_layers_merge_without_touching_os_environ(tmp_path):
+    _project(tmp_path, {".env": "DEPLOY_HOST=root\nDEPLOY_USER=ubuntu\n",
+                        "backend/.env": "DEPLOY_HOST=backend\n", "frontend/.env": "VITE_API=/api\n"})
+    layers = load_env_layers(tmp_path)
+    assert [path.relative_to(tmp_path).as_posix() for path in layers.files] == [
+        ".env", "backend/.env", "frontend/.env"]
+    assert dict(layers.values) == {"DEPLOY_HOST": "backend", "DEPLOY_USER": "ubuntu", "VITE_API": "/api"}
+    assert "DEPLOY_HOST" not in os.environ
+    with pytest.raises(TypeError):
+        layers.values["DEPLOY_HOST"] = "x"
+
+
+def test_interpolation_uses_earlier_layers_then_environ(tmp_path):
+    _project(tmp_path, {".env": "REGISTRY=ghcr.io/acme\n",
+                        "backend/.env": "BACKEND_IMAGE_NAME=${REGISTRY}/backend\nTAG=${BUILD_TAG:-dev}\nHOME_DIR=${HOME}\n"})
+    values = load_env_layers(tmp_path, environ={"HOME": "/home/ci"}).values
+    assert values["BACKEND_IMAGE_NAME"] == "ghcr.io/acme/backend"
+    assert values["TAG"] == "dev"
+    assert values["HOME_DIR"] == "/home/ci"
+
+
+def test_parsed_files_are_cached_by_content(tmp_path):
+    first = tmp_path / "a.env"
+    second = tmp_path / "b.env"
+    first.write_text("KEY=value\nBARE\n")
+    second.write_text("KEY=value\nBARE\n")
+    assert parse_env_file(first) is parse_env_file(second)
+    assert dict(parse_env_file(first)) == {"KEY": "value"}
+
+
+def test_missing_layers_raise(tmp_path):
+    with pytest.raises(EnvConfigError):
+        load_env_layers(tmp_path)
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_validate_against_mapping():
+    config = validate_environment(mode="prod", deploy="ssh", env={"DEPLOY_HOST": "h", "DEPLOY_USER": "u"})
+    assert config["DEPLOY_HOST"] == "h"
+    with pytest.raises(EnvConfigError):
+        validate_environment(mode="prod", deploy="ssh")
+
+
+def test_concurrent_projects_do_not_leak(tmp_path):
+    roots = []
+    for index in range(8):
+        root = tmp_path / f"project{index}"
+        root.mkdir()
+        _project(root, {".env": f"DEPLOY_HOST=host{index}\nDEPLOY_USER=user{index}\n"})
+        roots.append(root)
+
+    def run(root):
+        return validate_environment(mode="prod", env=load_env_layers(root).values)["DEPLOY_HOST"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(run, roots)) == [f"host{index}" for index in range(8)]
@@ -0,0 +1,25 @@
+from deployfilegen.analyzer.profile import FrontendProfile
+from deployfilegen.generators.frontend import generate_frontend_dockerfile, generate_nginx_config
+
+
+def test_vite_nginx_config_caches_hashed_assets():
+    config = generate_nginx_config(FrontendProfile(path=None, framework="vite"))
+    assert "listen 8080;" in config
+    assert "gzip_static on;" in config
+    assert "location /assets/ {" in config
+    assert 'Cache-Control "public, max-age=31536000, immutable"' in config
+    assert "try_files $uri $uri/ /index.html;" in config
+    assert "location /static/" not in config
+
+
+def test_cra_nginx_config_uses_static_dir():
+    config = generate_nginx_config(FrontendProfile(path=None, framework="cra"))
+    assert "location /static/ {" in config
+    assert "location /assets/" not in config
+
+
+def test_prod_dockerfile_precompresses_and_installs_config():
+    dockerfile = generate_frontend_dockerfile("prod", profile=FrontendProfile(path=None, framework="vite"))
+    assert r"-exec gzip -9 -k -f {} \; -exec brotli -q 11 -f {} \;" in dockerfile
+    assert "find dist -type f" in dockerfile
+    assert "\nCOPY nginx.conf /etc/nginx/conf.d/default.conf" in dockerfile
@@ -0,0 +1,63 @@
+import asyncio
+
+from deployfilegen.analyzer.profile import BackendProfile, FrontendProfile
+from deployfilegen.generators.backend import HEALTH_PATH, generate_backend_dockerfile, generate_gunicorn_config
+from deployfilegen.generators.frontend import generate_frontend_dockerfile, generate_nginx_config
+
+
+class _Worker:
+    def __init__(self, app):
+        self.wsgi = app
+
+
+def _load_hook(server):
+    namespace = {}
+    exec(generate_gunicorn_config(BackendProfile(path=None, server=server)), namespace)
+    return namespace["post_worker_init"]
+
+
+def test_wsgi_health_bypasses_django():
+    calls = []
+
+    def django(environ, start_response):
+        calls.append(environ["PATH_INFO"])
+        start_response("404 Not Found", [])
+        return [b""]
+
+    worker = _Worker(django)
+    _load_hook("wsgi")(worker)
+    statuses = []
+    body = worker.wsgi({"PATH_INFO": HEALTH_PATH}, lambda status, headers: statuses.append(status))
+    assert body == [b"ok"] and statuses == ["200 OK"]
+    assert calls == []
+    worker.wsgi({"PATH_INFO": "/api/"}, lambda status, headers: None)
+    assert calls == ["/api/"]
+
+
+def test_asgi_health_bypasses_django():
+    calls, sent = [], []
+
+    async def django(scope, receive, send):
+        calls.append(scope["path"])
+
+    async def send(message):
+        sent.append(message)
+
+    worker = _Worker(django)
+    _load_hook("asgi")(worker)
+    asyncio.run(worker.wsgi({"type": "http", "path": HEALTH_PATH}, None, send))
+    assert sent[0]["status"] == 200 and sent[1]["body"] == b"ok"
+    assert calls == []
+    asyncio.run(worker.wsgi({"type": "lifespan", "path": ""}, None, send))
+    assert len(calls) == 1
+
+
+def test_images_probe_health_paths_without_curl():
+    backend = generate_backend_dockerfile("prod", profile=BackendProfile(path=None))
+    assert "curl" not in backend
+    assert f"http://127.0.0.1:8000{HEALTH_PATH}" in backend
+
+    frontend = generate_frontend_dockerfile("prod", profile=FrontendProfile(path=None, framework="vite"))
+    assert "curl" not in frontend
+    assert "wget -q --spider http://127.0.0.1:8080/healthz" in frontend
+    assert "location = /healthz" in generate_nginx_config(FrontendProfile(path=None, framework="vite"))
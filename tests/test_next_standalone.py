@@ -0,0 +1,60 @@
+import json
+
+from deployfilegen.analyzer.profile import ProjectProfile, analyze_frontend
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.generators.frontend import generate_frontend_dockerfile
+
+
+def _next_app(tmp_path, config=None):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / "package.json").write_text(json.dumps({"dependencies": {"next": "15"}}))
+    (frontend / "package-lock.json").write_text("{}")
+    if config is not None:
+        (frontend / "next.config.mjs").write_text(config)
+    return frontend
+
+
+def test_detects_standalone_output(tmp_path):
+    frontend = _next_app(tmp_path, "export default { output: 'standalone' };\n")
+    assert analyze_frontend(frontend).next_standalone is True
+
+
+def test_missing_standalone_output(tmp_path):
+    frontend = _next_app(tmp_path, "export default { reactStrictMode: true };\n")
+    assert analyze_frontend(frontend).next_standalone is False
+
+
+def test_next_prod_dockerfile_runs_standalone_server(tmp_path):
+    frontend = _next_app(tmp_path, "module.exports = { output: \"standalone\" }\n")
+    dockerfile = generate_frontend_dockerfile("prod", profile=analyze_frontend(frontend))
+    assert "/app/.next/standalone ./" in dockerfile
+    assert "/app/.next/static ./.next/static" in dockerfile
+    assert 'CMD ["node", "server.js"]' in dockerfile
+    assert "ENV PORT=8080" in dockerfile
+    assert "HEALTHCHECK" in dockerfile
+    assert "nginx" not in dockerfile
+    assert "WARNING" not in dockerfile
+
+
+def test_next_healthcheck_probes_static_file_not_a_page(tmp_path):
+    frontend = _next_app(tmp_path, "module.exports = { output: \"standalone\" }\n")
+    dockerfile = generate_frontend_dockerfile("prod", profile=analyze_frontend(frontend))
+    assert "printf 'ok\\n' > public/healthz.txt && npm run build" in dockerfile
+    assert "fetch('http://127.0.0.1:8080/healthz.txt')" in dockerfile
+    assert "8080/'" not in dockerfile
+
+
+def test_next_prod_dockerfile_flags_missing_config(tmp_path):
+    frontend = _next_app(tmp_path)
+    dockerfile = generate_frontend_dockerfile("prod", profile=analyze_frontend(frontend))
+    assert "# WARNING: next.config does not set output: 'standalone'" in dockerfile
+
+
+def test_no_nginx_conf_for_next(tmp_path):
+    frontend = _next_app(tmp_path, "export default { output: 'standalone' };\n")
+    profile = ProjectProfile(root=tmp_path, frontend=analyze_frontend(frontend))
+    artifacts = render_artifacts(profile, {}, GenerationOptions(docker_only=True, frontend_only=True))
+    assert "frontend/Dockerfile" in artifacts
+    assert "frontend/nginx.conf" not in artifacts
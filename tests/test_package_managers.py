@@ -0,0 +1,56 @@
+import pytest
+
+from deployfilegen.analyzer.profile import analyze_frontend, detect_package_manager
+from deployfilegen.generators.frontend import generate_frontend_dockerfile
+
+
+def _frontend(tmp_path, package_json='{"devDependencies": {"vite": "5"}, "scripts": {"dev": "vite"}}', files=()):
+    (tmp_path / "package.json").write_text(package_json)
+    for name in files:
+        (tmp_path / name).write_text("")
+    return tmp_path
+
+
+@pytest.mark.parametrize("lockfile, manager", [
+    ("package-lock.json", "npm"),
+    ("pnpm-lock.yaml", "pnpm"),
+    ("yarn.lock", "yarn"),
+    ("bun.lockb", "bun"),
+])
+def test_lockfile_selects_package_manager(tmp_path, lockfile, manager):
+    info = detect_package_manager(_frontend(tmp_path, files=[lockfile]))
+    assert info["package_manager"] == manager
+    assert info["lockfile"] == lockfile
+
+
+def test_yarn_berry_detected_from_yarnrc(tmp_path):
+    info = detect_package_manager(_frontend(tmp_path, files=["yarn.lock", ".yarnrc.yml"]))
+    assert info["package_manager"] == "yarn-berry"
+    assert info["install_config_files"] == (".yarnrc.yml",)
+
+
+def test_package_manager_field_is_fallback_without_lockfile(tmp_path):
+    frontend = _frontend(tmp_path, package_json='{"packageManager": "pnpm@9.1.0"}')
+    info = detect_package_manager(frontend, {"packageManager": "pnpm@9.1.0"})
+    assert info == {"package_manager": "pnpm", "lockfile": None, "install_config_files": ()}
+
+
+def test_pnpm_dockerfile_uses_frozen_install_and_store_cache(tmp_path):
+    profile = analyze_frontend(_frontend(tmp_path, files=["pnpm-lock.yaml", ".npmrc"]))
+    prod = generate_frontend_dockerfile("prod", profile=profile)
+    assert "COPY package.json pnpm-lock.yaml .npmrc ./" in prod
+    assert "--mount=type=cache,target=/pnpm/store" in prod
+    assert "pnpm install --frozen-lockfile" in prod
+    assert "RUN pnpm run build" in prod
+    assert "package-lock.json" not in prod
+
+    dev = generate_frontend_dockerfile("dev", profile=profile)
+    assert 'CMD ["pnpm", "exec", "vite", "--host", "0.0.0.0"' in dev
+
+
+def test_npm_without_lockfile_falls_back_to_install(tmp_path):
+    profile = analyze_frontend(_frontend(tmp_path))
+    prod = generate_frontend_dockerfile("prod", profile=profile)
+    assert "COPY package.json ./" in prod
+    assert "npm install --legacy-peer-deps" in prod
+    assert "--mount=type=cache,target=/root/.npm" in prod
@@ -0,0 +1,73 @@
+import dataclasses
+from unittest.mock import patch
+
+import pytest
+
+from deployfilegen.analyzer import profile as profile_module
+from deployfilegen.analyzer.profile import analyze_project
+from deployfilegen.generators.backend import generate_backend_dockerfile
+from deployfilegen.generators.compose import generate_docker_compose
+from deployfilegen.generators.frontend import generate_frontend_dockerfile, get_frontend_dev_port
+from deployfilegen.utils.logger import capture_warnings
+
+VITE_APP = {"devDependencies": {"vite": "5"}, "scripts": {"dev": "vite", "build": "vite build"}}
+
+
+def test_analyze_project_builds_full_profile(make_project):
+    root = make_project(package_json=VITE_APP)
+    profile = analyze_project(root, env_files=[root / ".env"])
+
+    assert profile.backend.project_name == "shop"
+    assert profile.frontend.framework == "vite"
+    assert profile.frontend.dev_port == 5173
+    assert profile.frontend.scripts == ("dev", "build")
+    assert profile.env_files == (root / ".env",)
+
+
+def test_profile_is_immutable(make_project):
+    profile = analyze_project(make_project(package_json=VITE_APP))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        profile.frontend = None
+
+
+def test_overrides_are_applied_during_analysis(make_project):
+    profile = analyze_project(make_project(package_json=VITE_APP), override_project_name="custom",
+                              override_port=4000, override_cmd="serve")
+    assert profile.backend.project_name == "custom"
+    assert profile.frontend.dev_port == 4000
+    assert profile.frontend.dev_cmd == "serve"
+
+
+def test_generators_reuse_profile_without_rereading_manifests(make_project):
+    root = make_project(package_json=VITE_APP)
+    with patch.object(profile_module, "read_package_json", wraps=profile_module.read_package_json) as read_pkg, \
+         patch.object(profile_module, "read_django_project_name",
+                      wraps=profile_module.read_django_project_name) as read_manage:
+        profile = analyze_project(root, env_files=[root / ".env"])
+        generate_backend_dockerfile("prod", profile=profile.backend)
+        generate_frontend_dockerfile("prod", profile=profile.frontend)
+        generate_frontend_dockerfile("dev", profile=profile.frontend)
+        get_frontend_dev_port(profile=profile.frontend)
+        compose = generate_docker_compose("dev", {}, profile=profile)
+
+    assert read_pkg.call_count == 1
+    assert read_manage.call_count == 1
+    assert '"5173:5173"' in compose
+    assert "./.env" in compose
+
+
+def test_non_object_package_json_is_ignored(make_project):
+    with capture_warnings() as warnings:
+        profile = analyze_project(make_project(package_json=[1, 2]))
+    assert any("expected a JSON object, got list" in warning for warning in warnings)
+    assert profile.frontend.scripts == ()
+
+
+def test_package_json_sections_that_are_not_objects_are_ignored(make_project):
+    package_json = {"dependencies": None, "devDependencies": ["vite"], "optionalDependencies": "sharp",
+                    "scripts": None, "engines": ["node"], "packageManager": 9}
+    profile = analyze_project(make_project(package_json=package_json))
+    assert profile.frontend.framework == "unknown"
+    assert profile.frontend.scripts == ()
+    assert profile.frontend.native_modules == ()
+    assert profile.frontend.package_manager == "npm"
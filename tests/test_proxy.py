@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from deployfilegen.analyzer.profile import BackendProfile, FrontendProfile, ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.generators.compose import generate_docker_compose
+from deployfilegen.generators.proxy import PROXY_CONFIG_PATH, generate_proxy_config
+
+
+def _profile(tmp_path, server="wsgi"):
+    return ProjectProfile(root=tmp_path, backend=BackendProfile(path=tmp_path / "backend", server=server))
+
+
+def test_proxy_config_serves_static_and_media():
+    config = generate_proxy_config()
+    assert "alias /app/static/;" in config
+    assert "alias /app/media/;" in config
+    assert "keepalive 32;" in config
+    assert "location ~ ^/(api|admin)(/|$)" in config
+    assert "location /ws/" not in config
+
+
+def test_proxy_config_adds_websockets_for_asgi(tmp_path):
+    config = generate_proxy_config(_profile(tmp_path, server="asgi"))
+    assert "location /ws/" in config
+    assert "proxy_set_header Upgrade $http_upgrade;" in config
+
+
+def test_proxy_config_keeps_static_for_cra_bundles(tmp_path):
+    profile = ProjectProfile(root=tmp_path, backend=BackendProfile(path=tmp_path / "backend"),
+                             frontend=FrontendProfile(path=tmp_path / "frontend", framework="cra"))
+    for cold_start in (False, True):
+        config = generate_proxy_config(profile, cold_start=cold_start)
+        # /static/js and /static/css fall through to the frontend container
+        assert "location /static/" not in config
+        assert "location /django-static/" in config
+        assert 'STATIC_URL = "/django-static/"' in config
+    assert "alias /app/static/;" in generate_proxy_config(profile)
+
+    vite = ProjectProfile(root=tmp_path, backend=BackendProfile(path=tmp_path / "backend"),
+                          frontend=FrontendProfile(path=tmp_path / "frontend", framework="vite"))
+    assert "location /static/" in generate_proxy_config(vite)
+
+
+def test_compose_proxy_publishes_only_nginx():
+    compose = generate_docker_compose("prod", {}, proxy=True)
+    assert "  proxy:\n" in compose
+    assert f"./{PROXY_CONFIG_PATH}:/etc/nginx/conf.d/default.conf:ro" in compose
+    assert "static_volume:/app/static:ro" in compose
+    assert compose.count("ports:") == 1
+    assert '"8000:8000"' not in compose
+
+
+def test_render_artifacts_emits_proxy_config(tmp_path):
+    profile = _profile(tmp_path)
+    with_proxy = render_artifacts(profile, {}, GenerationOptions(proxy=True, compose_only=True))
+    without = render_artifacts(profile, {}, GenerationOptions(compose_only=True))
+    assert PROXY_CONFIG_PATH in with_proxy
+    assert PROXY_CONFIG_PATH not in without
+    dev = render_artifacts(profile, {}, GenerationOptions(mode="dev", proxy=True, compose_only=True))
+    assert PROXY_CONFIG_PATH not in dev
+
+
+def test_proxy_routes_only_to_detected_services(tmp_path):
+    profile = _profile(tmp_path)
+    config = generate_proxy_config(profile)
+    assert "upstream frontend" not in config
+    assert "location / {\n        proxy_pass http://backend;" in config
+    compose = generate_docker_compose("prod", {}, profile=profile, proxy=True)
+    assert "  frontend:" not in compose
+    assert "    depends_on:\n      - backend\n    networks:" in compose
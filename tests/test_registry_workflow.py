@@ -0,0 +1,65 @@
+import pytest
+
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import GenerationError
+from deployfilegen.generators.compose import generate_docker_compose
+from deployfilegen.generators.github import generate_github_workflow
+
+
+def test_changes_job_filters_by_component_path():
+    workflow = generate_github_workflow({}, deploy="registry")
+    assert "dorny/paths-filter@v3" in workflow
+    assert "- 'backend/**'" in workflow
+    assert "- 'frontend/**'" in workflow
+
+
+def test_build_matrix_comes_from_changed_components():
+    workflow = generate_github_workflow({}, deploy="registry")
+    assert "service: ${{ fromJSON(needs.changes.outputs.services) }}" in workflow
+    assert "if: needs.changes.outputs.services != '[]'" in workflow
+    assert "context: ./${{ matrix.service }}" in workflow
+
+
+def test_deploy_restarts_only_changed_services():
+    workflow = generate_github_workflow({}, deploy="registry")
+    assert "needs: [changes, build-and-push]" in workflow
+    assert "pull $SERVICES" in workflow
+    assert "up -d --no-deps $SERVICES" in workflow
+    assert "_IMAGE_TAG" in workflow
+
+
+def test_registry_compose_uses_per_service_tags():
+    compose = generate_docker_compose("prod", {}, deploy="registry")
+    assert "${BACKEND_IMAGE_NAME}:${BACKEND_IMAGE_TAG:-${IMAGE_TAG:-latest}}" in compose
+    assert "${FRONTEND_IMAGE_NAME}:${FRONTEND_IMAGE_TAG:-${IMAGE_TAG:-latest}}" in compose
+
+
+def test_single_platform_builds_natively_without_qemu():
+    workflow = generate_github_workflow({}, deploy="registry", platforms=("linux/arm64",))
+    assert "setup-qemu-action" not in workflow
+    assert "runs-on: ubuntu-24.04-arm" in workflow
+    assert "platforms: linux/arm64" in workflow
+    assert "imagetools create" not in workflow
+
+
+def test_multi_platform_pushes_by_digest_and_merges():
+    workflow = generate_github_workflow({}, deploy="registry", platforms=("linux/amd64", "linux/arm64"))
+    assert "setup-qemu-action" not in workflow
+    assert "runs-on: ${{ matrix.runner }}" in workflow
+    assert "runner: ubuntu-24.04-arm" in workflow
+    assert "push-by-digest=true" in workflow
+    assert "docker buildx imagetools create" in workflow
+    assert "needs: [changes, merge]" in workflow
+
+
+def test_qemu_only_for_platforms_without_native_runner():
+    workflow = generate_github_workflow({}, deploy="registry", platforms=("linux/amd64", "linux/arm/v7"))
+    assert "if: matrix.emulated" in workflow
+    assert "emulated: true" in workflow
+
+
+def test_platforms_option_is_validated():
+    assert GenerationOptions(platforms="linux/amd64, linux/arm64,linux/amd64").platform_list == (
+        "linux/amd64", "linux/arm64")
+    with pytest.raises(GenerationError):
+        GenerationOptions(platforms="windows/amd64")
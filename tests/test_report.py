@@ -0,0 +1,80 @@
+import json
+import os
+
+from typer.testing import CliRunner
+
+from deployfilegen.analyzer.dockerfile import estimate_image, parse_dockerfile
+from deployfilegen.cli import app
+
+runner = CliRunner()
+
+DOCKERFILE = """# syntax=docker/dockerfile:1
+FROM python:3.11-slim as builder
+RUN pip wheel -r requirements.txt
+
+# Stage 2
+FROM python:3.11-slim
+WORKDIR /app
+RUN apt-get update \\
+    && apt-get install -y libpq5
+COPY --from=builder /app/wheels /wheels
+COPY . .
+CMD ["gunicorn"]
+"""
+
+
+def test_parse_dockerfile_stages_and_continuations():
+    stages = parse_dockerfile(DOCKERFILE)
+    assert [stage.name for stage in stages] == ["builder", None]
+    run = stages[1].instructions[1]
+    assert run.keyword == "RUN"
+    assert run.args == "apt-get update && apt-get install -y libpq5"
+
+
+def test_estimate_honours_dockerignore(tmp_path):
+    (tmp_path / "Dockerfile").write_text(DOCKERFILE)
+    (tmp_path / ".dockerignore").write_text("venv/\n*.pyc\n")
+    (tmp_path / "app.py").write_text("x" * 100)
+    (tmp_path / "cache.pyc").write_text("x" * 1000)
+    (tmp_path / "venv").mkdir()
+    (tmp_path / "venv" / "big.so").write_text("x" * 5000)
+
+    estimate = estimate_image(tmp_path / "Dockerfile")
+    assert estimate.base == "python:3.11-slim"
+    assert estimate.base_mb == 125
+    copy_context = [layer for layer in estimate.layers if layer.instruction == "COPY . ."][0]
+    # Dockerfile (+ .dockerignore) and app.py only
+    expected = sum((tmp_path / name).stat().st_size for name in ("Dockerfile", ".dockerignore", "app.py"))
+    assert copy_context.size_bytes == expected
+    assert estimate.unknown_layers == 2  # RUN and COPY --from
+
+
+def test_report_command_json(tmp_path):
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "Dockerfile").write_text(DOCKERFILE)
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        result = runner.invoke(app, ["report", "--json"])
+        text = runner.invoke(app, ["report"])
+    finally:
+        os.chdir(old_cwd)
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data[0]["dockerfile"] == "backend/Dockerfile"
+    assert text.exit_code == 0
+    assert "Estimated:" in text.stdout
+
+
+def test_report_covers_discovered_services(tmp_path):
+    (tmp_path / "apps" / "web").mkdir(parents=True)
+    (tmp_path / "apps" / "web" / "package.json").write_text(json.dumps({"scripts": {"dev": "vite"}}))
+    (tmp_path / "apps" / "web" / "Dockerfile").write_text(DOCKERFILE)
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        result = runner.invoke(app, ["report", "--json"])
+    finally:
+        os.chdir(old_cwd)
+    assert result.exit_code == 0
+    assert [entry["dockerfile"] for entry in json.loads(result.stdout)] == ["apps/web/Dockerfile"]
@@ -0,0 +1,60 @@
+import pytest
+
+from deployfilegen.analyzer.profile import ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.exceptions import GenerationError
+from deployfilegen.generators.bundle import render_artifacts
+from deployfilegen.generators.github import generate_github_workflow
+from deployfilegen.generators.scripts import ROLLOUT_SCRIPT_PATH, generate_rollout_script
+
+
+def test_rollout_scales_up_waits_for_health_then_retires_old():
+    script = generate_rollout_script()
+    scale = script.index('--scale "$service=$((count * 2))"')
+    health = script.index('if ! wait_healthy "$cid"')
+    stop = script.index('docker stop --time "$STOP_GRACE" $old')
+    assert scale < health < stop
+    assert script.count("reload_proxy\n") == 2
+    assert "nginx -s reload" in script
+
+
+def test_rollout_takes_old_containers_out_of_upstream_before_stopping():
+    script = generate_rollout_script()
+    assert 'docker network disconnect "$net" "$cid"' in script
+    assert "{{range $net, $_ := .NetworkSettings.Networks}}{{$net}} {{end}}" in script
+    detach = script.index("  detach $old\n")
+    reload = script.index("  reload_proxy\n", detach)
+    stop = script.index('docker stop --time "$STOP_GRACE" $old')
+    assert detach < reload < stop
+    assert "reload_proxy\ndone" not in script
+
+
+def test_rollout_rolls_back_unhealthy_replacement():
+    script = generate_rollout_script()
+    assert 'docker rm -f $new' in script
+    assert "unhealthy|exited|dead) return 1" in script
+
+
+def test_rolling_requires_proxy():
+    with pytest.raises(GenerationError):
+        GenerationOptions(rolling=True)
+    GenerationOptions(rolling=True, proxy=True)
+
+
+def test_workflows_run_rollout_script():
+    ssh = generate_github_workflow({}, deploy="ssh", rolling=True)
+    assert f"bash {ROLLOUT_SCRIPT_PATH}" in ssh
+    assert "up -d --remove-orphans" not in ssh
+
+    registry = generate_github_workflow({}, deploy="registry", rolling=True)
+    assert f"bash {ROLLOUT_SCRIPT_PATH} $SERVICES" in registry
+    assert "appleboy/scp-action" in registry
+    assert "up -d --no-deps $SERVICES" not in registry
+
+
+def test_rollout_script_emitted_with_rolling(tmp_path):
+    profile = ProjectProfile(root=tmp_path)
+    artifacts = render_artifacts(profile, {}, GenerationOptions(github_only=True, deploy="registry",
+                                                                proxy=True, rolling=True))
+    assert ROLLOUT_SCRIPT_PATH in artifacts
+    assert ROLLOUT_SCRIPT_PATH not in render_artifacts(profile, {}, GenerationOptions(github_only=True))
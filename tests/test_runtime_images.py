@@ -0,0 +1,41 @@
+from deployfilegen.analyzer.profile import BackendProfile, ProjectProfile
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.backend import generate_backend_dockerfile
+from deployfilegen.generators.bundle import render_artifacts
+
+
+def _runner(options=None):
+    dockerfile = generate_backend_dockerfile("prod", profile=BackendProfile(path=None), options=options)
+    return dockerfile[dockerfile.index("# Stage 2"):]
+
+
+def test_slim_runner_installs_runtime_libs_only():
+    runner = _runner()
+    assert "libpq5" in runner
+    assert "libpq-dev" not in runner
+    assert "gcc" not in runner
+
+
+def test_slim_runner_copies_app_with_owner():
+    runner = _runner()
+    assert "COPY --chown=appuser:appgroup . ." in runner
+    assert "chown -R" not in runner
+    # Wheels are bind-mounted, never stored as a layer
+    assert "COPY --from=builder /app/wheels" not in runner
+
+
+def test_distroless_runner():
+    runner = _runner(GenerationOptions(runtime="distroless"))
+    assert "FROM gcr.io/distroless/python3-debian12:nonroot" in runner
+    assert "ENV PYTHONPATH=/opt/deps" in runner
+    assert "COPY --chown=nonroot:nonroot . ." in runner
+    assert 'CMD ["python3", "-m", "gunicorn", "config.wsgi:application"' in runner
+    assert "entrypoint.sh\"]" not in runner
+
+
+def test_distroless_skips_entrypoint_script(tmp_path):
+    profile = ProjectProfile(root=tmp_path, backend=BackendProfile(path=tmp_path / "backend"))
+    slim = render_artifacts(profile, {}, GenerationOptions(docker_only=True))
+    distroless = render_artifacts(profile, {}, GenerationOptions(docker_only=True, runtime="distroless"))
+    assert "backend/entrypoint.sh" in slim
+    assert "backend/entrypoint.sh" not in distroless
@@ -0,0 +1,121 @@
+import json
+
+from deployfilegen.analyzer.profile import BackendProfile, FrontendProfile, analyze_backend, analyze_frontend
+from deployfilegen.analyzer.runtimes import node_from_range, python_from_specifier
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.backend import generate_backend_dockerfile
+from deployfilegen.generators.frontend import generate_frontend_dockerfile
+
+
+def test_python_from_specifier():
+    assert python_from_specifier(">=3.9") == "3.11"
+    assert python_from_specifier(">=3.12,<3.14") == "3.13"
+    assert python_from_specifier("<3.11") == "3.10"
+    assert python_from_specifier("==3.12.*") == "3.12"
+    assert python_from_specifier(">=4") is None
+
+
+def test_node_from_range():
+    assert node_from_range(">=18") == "22"
+    assert node_from_range("^20.11.0") == "20"
+    assert node_from_range(">=18 <21") == "20"
+    assert node_from_range("18.x || 20.x") == "20"
+    assert node_from_range(">=30") is None
+
+
+def test_python_version_files_take_priority(tmp_path):
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    (backend / "manage.py").write_text("")
+    (backend / "pyproject.toml").write_text('[project]\nrequires-python = ">=3.13"\n')
+    assert analyze_backend(backend).python_version == "3.14"
+    (tmp_path / "runtime.txt").write_text("python-3.10.14\n")
+    assert analyze_backend(backend).python_version == "3.10"
+    (backend / ".python-version").write_text("3.12.4\n")
+    assert analyze_backend(backend).python_version == "3.12"
+
+
+def test_node_version_from_nvmrc_and_engines(tmp_path):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / "package.json").write_text(json.dumps({"engines": {"node": ">=18 <21"}}))
+    assert analyze_frontend(frontend).node_version == "20"
+    (tmp_path / ".nvmrc").write_text("lts/hydrogen\n")
+    assert analyze_frontend(frontend).node_version == "18"
+
+
+def test_pinned_versions_are_used_as_is(tmp_path):
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    (backend / ".python-version").write_text("3.14.0\n")
+    assert analyze_backend(backend).python_version == "3.14"
+    (backend / ".python-version").write_text("3.15\n")
+    assert analyze_backend(backend).python_version == "3.15"
+    (backend / ".python-version").write_text("3.6\n")
+    assert analyze_backend(backend).python_version == "3.11"
+
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / ".nvmrc").write_text("v25.1.0\n")
+    assert analyze_frontend(frontend).node_version == "25"
+    (frontend / ".nvmrc").write_text("16\n")
+    assert analyze_frontend(frontend).node_version == "22"
+
+
+def test_native_modules_from_package_json_and_lockfile(tmp_path):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / "package.json").write_text(json.dumps({"dependencies": {"vite": "5", "bcrypt": "5"}}))
+    assert analyze_frontend(frontend).native_modules == ("bcrypt",)
+
+    (frontend / "package.json").write_text(json.dumps({"dependencies": {"vite": "5"}}))
+    (frontend / "package-lock.json").write_text(json.dumps(
+        {"packages": {"node_modules/better-sqlite3": {"version": "11.0.0"}}}))
+    profile = analyze_frontend(frontend)
+    assert profile.native_modules == ("better-sqlite3",)
+    assert profile.node_variant == "slim"
+
+
+def test_backend_images_follow_python_version():
+    dockerfile = generate_backend_dockerfile("prod", profile=BackendProfile(path=None, python_version="3.12"))
+    assert "FROM python:3.12-slim-bookworm as builder" in dockerfile
+    assert "FROM python:3.12-slim-bookworm\n" in dockerfile
+    dev = generate_backend_dockerfile("dev", profile=BackendProfile(path=None, python_version="3.13"))
+    assert "FROM python:3.13-slim-bookworm" in dev
+
+
+def test_distroless_builder_matches_distroless_python():
+    dockerfile = generate_backend_dockerfile("prod", profile=BackendProfile(path=None, python_version="3.12"),
+                                             options=GenerationOptions(runtime="distroless", installer="uv"))
+    assert "FROM python:3.11-slim-bookworm as builder" in dockerfile
+    assert "/opt/venv/lib/python3.11/site-packages" in dockerfile
+
+
+def test_frontend_uses_debian_slim_for_native_modules():
+    alpine = generate_frontend_dockerfile("prod", profile=FrontendProfile(path=None, framework="vite", node_version="20"))
+    assert "FROM node:20-alpine as builder" in alpine
+    assert "apk add --no-cache brotli" in alpine
+
+    slim = generate_frontend_dockerfile("prod", profile=FrontendProfile(
+        path=None, framework="vite", package_manager="bun", native_modules=("bcrypt",)))
+    assert "FROM node:22-slim as builder" in slim
+    assert "apt-get install -y --no-install-recommends brotli" in slim
+    assert "oven/bun:1-slim" in slim
+
+    next_slim = generate_frontend_dockerfile("prod", profile=FrontendProfile(
+        path=None, framework="next", native_modules=("canvas",)))
+    assert next_slim.count("FROM node:22-slim") == 2
+
+
+def test_ci_test_jobs_use_detected_versions(tmp_path):
+    from deployfilegen.analyzer.profile import ProjectProfile
+    from deployfilegen.generators.github import generate_github_workflow
+
+    profile = ProjectProfile(
+        root=tmp_path,
+        backend=BackendProfile(path=tmp_path / "backend", python_version="3.12"),
+        frontend=FrontendProfile(path=tmp_path / "frontend", scripts=("test",), node_version="20"),
+    )
+    workflow = generate_github_workflow({}, profile=profile, with_tests=True)
+    assert 'python-version: "3.12"' in workflow
+    assert 'node-version: "20"' in workflow
@@ -0,0 +1,157 @@
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from deployfilegen.server import LatencyMetrics, RenderService, create_server
+
+ENV = "DEPLOY_HOST=1.2.3.4\nDEPLOY_USER=ubuntu\n"
+MANAGE_PY = "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shop.settings')"
+
+
+@pytest.fixture
+def server():
+    server = create_server(port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    connection.request(method, path, body=json.dumps(body) if body is not None else None)
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    return response.status, data
+
+
+def test_render_project_path_and_warm_cache(server, make_project):
+    root = make_project("shop")
+    status, first = _request(server, "POST", "/render", {"project": str(root)})
+    assert status == 200
+    assert "backend/Dockerfile" in first["artifacts"] and not first["cached"]
+    assert not (root / ".deployfilegen").exists()
+
+    status, second = _request(server, "POST", "/render", {"project": str(root)})
+    assert second["cached"] and second["artifacts"] == first["artifacts"]
+
+    (root / "backend" / "requirements.txt").write_text("django\npsycopg2\n")
+    status, changed = _request(server, "POST", "/render", {"project": str(root)})
+    assert not changed["cached"]
+    assert "libpq-dev" in changed["artifacts"]["backend/Dockerfile"]
+
+    status, metrics = _request(server, "GET", "/metrics")
+    assert metrics["endpoints"]["/render"]["requests"] == 3
+    assert metrics["cache"] == {"hits": 1, "misses": 2}
+    assert metrics["endpoints"]["/render"]["p95_ms"] >= metrics["endpoints"]["/render"]["p50_ms"]
+
+
+def test_render_uploaded_manifests(server):
+    files = {"backend/manage.py": MANAGE_PY, "backend/requirements.txt": "django\n", ".env": ENV}
+    status, body = _request(server, "POST", "/render", {"files": files, "options": {"mode": "prod"}})
+    assert status == 200
+    assert "- ./.env" in body["artifacts"]["docker-compose.prod.yml"]
+
+
+def test_bad_requests(server, tmp_path, make_project):
+    assert _request(server, "POST", "/render", {"files": {"../etc/passwd": "x"}})[0] == 400
+    assert _request(server, "POST", "/render", {"project": str(tmp_path), "options": {"colour": 1}})[0] == 400
+    status, body = _request(server, "POST", "/render", {"project": str(make_project("shop")),
+                                                        "options": {"deploy": "registry"}})
+    assert status == 422 and "DOCKER_USERNAME" in body["error"]
+    assert _request(server, "GET", "/nope")[0] == 404
+    assert _request(server, "GET", "/healthz")[1]["status"] == "ok"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_unix_socket(tmp_path):
+    path = tmp_path / "render.sock"
+    server = create_server(unix_socket=path, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(path))
+        client.sendall(b"GET /healthz HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        response = b""
+        while chunk := client.recv(4096):
+            response += chunk
+        client.close()
+        assert response.startswith(b"HTTP/1.1 200")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not path.exists()
+
+
+def test_busy_server_rejects_with_503():
+    server = create_server(port=0, workers=1, max_pending=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # An idle connection occupies the only worker while it waits for a request line
+    idle = socket.create_connection(server.server_address)
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            status, body = _request(server, "GET", "/healthz")
+            if status == 503:
+                break
+            time.sleep(0.01)
+        assert status == 503 and "busy" in body["error"]
+    finally:
+        idle.close()
+        server.shutdown()
+        server.server_close()
+    assert server.service.metrics.snapshot()["rejected"] >= 1
+
+
+def _raw(server, request):
+    client = socket.create_connection(server.server_address, timeout=10)
+    client.sendall(request)
+    response = b""
+    while chunk := client.recv(4096):
+        response += chunk
+    client.close()
+    return response
+
+
+def test_content_length_is_validated(server):
+    assert _raw(server, b"POST /render HTTP/1.1\r\nHost: x\r\n\r\n").startswith(b"HTTP/1.1 411")
+    for value in (b"abc", b"-5"):
+        response = _raw(server, b"POST /render HTTP/1.1\r\nHost: x\r\nContent-Length: " + value + b"\r\n\r\n")
+        assert response.startswith(b"HTTP/1.1 400")
+
+
+def test_idle_keep_alive_connections_release_their_worker(monkeypatch):
+    monkeypatch.setattr("deployfilegen.server._RenderHandler.timeout", 0.2)
+    server = create_server(port=0, workers=1, max_pending=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        idle = socket.create_connection(server.server_address)
+        time.sleep(0.5)
+        assert _request(server, "GET", "/healthz")[0] == 200
+        idle.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_latency_percentiles():
+    metrics = LatencyMetrics()
+    for ms in range(1, 101):
+        metrics.record("/render", ms / 1000, ok=ms != 100)
+    snapshot = metrics.snapshot()["endpoints"]["/render"]
+    assert snapshot["p50_ms"] == 50 and snapshot["p99_ms"] == 99 and snapshot["max_ms"] == 100
+    assert snapshot["errors"] == 1
+
+
+def test_service_is_usable_without_a_server(make_project):
+    response = RenderService().render({"project": str(make_project("shop"))})
+    assert "backend/Dockerfile" in response["artifacts"]
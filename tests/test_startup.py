@@ -0,0 +1,95 @@
+"""Startup budget for the lazy-loading CLI entry point.
+
+Each case runs the real entry point in a fresh interpreter under
+``-X importtime`` and checks both which modules were imported and how long
+the imports took.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from deployfilegen import __version__
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time (microseconds) allowed for the entry module itself.
+VERSION_IMPORT_BUDGET_US = 50_000
+# Self time allowed for all deployfilegen.* modules combined on the heaviest path.
+PACKAGE_IMPORT_BUDGET_US = 50_000
+# The same for --help and template, which import no generators or env loader.
+LIGHT_COMMAND_IMPORT_BUDGET_US = 20_000
+
+GENERATOR_MODULES = {
+    "deployfilegen.generators.backend",
+    "deployfilegen.generators.frontend",
+    "deployfilegen.generators.compose",
+    "deployfilegen.generators.github",
+}
+
+
+def _run_entry_point(args, cwd):
+    """Runs deployfilegen.cli:main with args; returns (stdout, {module: (self_us, cumulative_us)})."""
+    code = (
+        "import sys\n"
+        f"sys.argv = ['deployfilegen'] + {list(args)!r}\n"
+        "from deployfilegen.cli import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(REPO_ROOT), "PATH": ""},
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return proc.stdout, timings
+
+
+def _package_self_us(timings) -> int:
+    return sum(self_us for name, (self_us, _) in timings.items() if name.startswith("deployfilegen"))
+
+
+def test_version_skips_typer(tmp_path):
+    stdout, timings = _run_entry_point(["--version"], tmp_path)
+    assert stdout.strip() == __version__
+    assert "typer" not in timings
+    assert "dotenv" not in timings
+    assert timings["deployfilegen.cli"][1] < VERSION_IMPORT_BUDGET_US
+
+
+def test_help_does_not_import_generators(tmp_path):
+    stdout, timings = _run_entry_point(["--help"], tmp_path)
+    assert "init" in stdout
+    assert "dotenv" not in timings
+    assert not GENERATOR_MODULES & timings.keys()
+    assert _package_self_us(timings) < LIGHT_COMMAND_IMPORT_BUDGET_US
+
+
+def test_template_imports_only_what_it_uses(tmp_path):
+    stdout, timings = _run_entry_point(["template"], tmp_path)
+    assert "Generated boilerplate .env file" in stdout
+    assert "dotenv" not in timings
+    assert not GENERATOR_MODULES & timings.keys()
+    assert _package_self_us(timings) < LIGHT_COMMAND_IMPORT_BUDGET_US
+
+
+def test_init_stays_within_package_budget(tmp_path):
+    (tmp_path / ".env").write_text("DEPLOY_HOST=1.2.3.4\nDEPLOY_USER=ubuntu\n")
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "manage.py").write_text("django")
+    (tmp_path / "frontend").mkdir()
+    (tmp_path / "frontend" / "package.json").write_text("{}")
+
+    stdout, timings = _run_entry_point(["init"], tmp_path)
+    assert "generated successfully" in stdout
+    assert GENERATOR_MODULES <= timings.keys()
+    assert _package_self_us(timings) < PACKAGE_IMPORT_BUDGET_US
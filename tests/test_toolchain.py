@@ -0,0 +1,87 @@
+from deployfilegen.analyzer.profile import BackendProfile, analyze_backend
+from deployfilegen.analyzer.requirements import analyze_toolchain, parse_requirement_lines
+from deployfilegen.config.options import GenerationOptions
+from deployfilegen.generators.backend import generate_backend_dockerfile
+
+
+def _backend(tmp_path, requirements):
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    (backend / "requirements.txt").write_text(requirements)
+    return backend
+
+
+def _stages(dockerfile):
+    index = dockerfile.index("# Stage 2")
+    return dockerfile[:index], dockerfile[index:]
+
+
+def test_parse_requirement_lines_expands_extras_and_vcs():
+    names, vcs = parse_requirement_lines(
+        "Django>=5\npsycopg[binary,pool]==3.2\n# comment\n-r base.txt\n"
+        "mylib @ git+https://github.com/org/mylib.git\n"
+    )
+    assert {"django", "psycopg", "psycopg-binary", "mylib"} <= names
+    assert vcs
+
+
+def test_binary_wheels_need_no_toolchain(tmp_path):
+    report = analyze_toolchain(_backend(tmp_path, "django\npsycopg2-binary\npillow\n"))
+    assert report.build_packages == ()
+    assert report.runtime_packages == ()
+    assert not report.needs_compiler
+
+
+def test_psycopg2_needs_compiler_and_suggests_binary(tmp_path):
+    report = analyze_toolchain(_backend(tmp_path, "django\npsycopg2==2.9.9\n"))
+    assert report.build_packages == ("gcc", "libpq-dev")
+    assert report.runtime_packages == ("libpq5",)
+    assert report.suggestions == (("psycopg2", "psycopg2-binary or psycopg[binary]"),)
+
+
+def test_pure_psycopg_needs_libpq_at_runtime_only(tmp_path):
+    plain = analyze_toolchain(_backend(tmp_path, "psycopg\n"))
+    assert plain.build_packages == ()
+    assert plain.runtime_packages == ("libpq5",)
+    (tmp_path / "backend" / "requirements.txt").write_text("psycopg[binary]\n")
+    assert analyze_toolchain(tmp_path / "backend").runtime_packages == ()
+
+
+def test_lockfiles_reveal_transitive_source_builds(tmp_path):
+    backend = _backend(tmp_path, "django\n")
+    (backend / "poetry.lock").write_text('[[package]]\nname = "mysqlclient"\nversion = "2.2.4"\n')
+    report = analyze_toolchain(backend)
+    assert "default-libmysqlclient-dev" in report.build_packages
+    assert report.runtime_packages == ("libmariadb3",)
+
+
+def test_pyproject_dependencies_are_checked(tmp_path):
+    backend = _backend(tmp_path, "")
+    (backend / "pyproject.toml").write_text('[project]\nname = "app"\ndependencies = ["uWSGI>=2"]\n')
+    assert analyze_toolchain(backend).build_packages == ("gcc",)
+
+
+def test_builder_skips_toolchain_when_not_needed(tmp_path):
+    backend = _backend(tmp_path, "django\npsycopg[binary]\n")
+    (backend / "manage.py").write_text("")
+    builder, runner = _stages(generate_backend_dockerfile("prod", profile=analyze_backend(backend)))
+    assert "apt-get" not in builder
+    assert "no compiler toolchain needed" in builder
+    assert "apt-get" not in runner
+
+
+def test_builder_installs_toolchain_for_source_builds(tmp_path):
+    backend = _backend(tmp_path, "django\npsycopg2\n")
+    (backend / "manage.py").write_text("")
+    builder, runner = _stages(generate_backend_dockerfile("prod", profile=analyze_backend(backend)))
+    assert "apt-get install -y --no-install-recommends gcc libpq-dev" in builder
+    assert "--no-install-recommends libpq5" in runner
+
+
+def test_unanalyzed_profile_keeps_default_toolchain():
+    options = GenerationOptions()
+    builder, runner = _stages(generate_backend_dockerfile("prod", profile=BackendProfile(path=None), options=options))
+    assert "gcc libpq-dev" in builder
+    assert "libpq5" in runner
+    dev = generate_backend_dockerfile("dev", profile=BackendProfile(path=None, build_packages=(), runtime_packages=()))
+    assert "apt-get" not in dev
@@ -0,0 +1,84 @@
+import os
+
+from typer.testing import CliRunner
+
+from deployfilegen.cli import app
+from deployfilegen.utils.writer import FileWriter
+
+runner = CliRunner()
+
+
+def test_identical_content_is_not_rewritten(tmp_path):
+    target = tmp_path / "backend" / "Dockerfile"
+    writer = FileWriter(force=True, project_root=tmp_path)
+    assert writer.write(target, "FROM python\n") is True
+    writer.save_manifest()
+    mtime = target.stat().st_mtime_ns
+
+    writer = FileWriter(force=True, project_root=tmp_path)
+    assert writer.write(target, "FROM python\n") is False
+    assert writer.unchanged == ["backend/Dockerfile"]
+    assert target.stat().st_mtime_ns == mtime
+
+    assert writer.write(target, "FROM python:3.12\n") is True
+    assert target.read_text() == "FROM python:3.12\n"
+
+
+def test_existing_file_kept_without_force(tmp_path):
+    target = tmp_path / "Dockerfile"
+    target.write_text("hand written\n")
+    writer = FileWriter(project_root=tmp_path)
+    assert writer.write(target, "generated\n") is False
+    assert target.read_text() == "hand written\n"
+
+
+def test_overwrite_preserves_file_mode_and_leaves_no_temp_files(tmp_path):
+    target = tmp_path / "entrypoint.sh"
+    target.write_text("old\n")
+    os.chmod(target, 0o755)
+    FileWriter(force=True).write(target, "new\n")
+    assert target.stat().st_mode & 0o777 == 0o755
+    assert [p.name for p in tmp_path.iterdir()] == ["entrypoint.sh"]
+
+
+def test_check_mode_reports_diff_without_writing(tmp_path):
+    target = tmp_path / "docker-compose.dev.yml"
+    target.write_text("services: {}\n")
+    writer = FileWriter(force=True, project_root=tmp_path, check=True)
+    assert writer.write(target, "services:\n  backend: {}\n") is False
+    assert writer.write(tmp_path / "new.yml", "x\n") is False
+    assert target.read_text() == "services: {}\n"
+    assert not (tmp_path / "new.yml").exists()
+    assert [key for key, _ in writer.diffs] == ["docker-compose.dev.yml", "new.yml"]
+    assert writer.overwrites == ["docker-compose.dev.yml"]
+    assert "+  backend: {}" in writer.diffs[0][1]
+
+
+def test_init_check_exit_codes(tmp_path):
+    (tmp_path / ".env").write_text("DEPLOY_HOST=1.2.3.4\nDEPLOY_USER=ubuntu\n")
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "manage.py").write_text("django")
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        drift = runner.invoke(app, ["init", "--mode", "dev", "--check"])
+        assert drift.exit_code == 1
+        assert "+++ b/backend/Dockerfile" in drift.stdout
+        assert not (tmp_path / "backend" / "Dockerfile").exists()
+        assert "Re-run without --check to update." in drift.stdout
+
+        assert runner.invoke(app, ["init", "--mode", "dev"]).exit_code == 0
+        clean = runner.invoke(app, ["init", "--mode", "dev", "--check"])
+        assert clean.exit_code == 0
+        assert "up to date" in clean.stdout
+
+        # A hand-edited file is out of date, but a plain re-run keeps it
+        (tmp_path / "backend" / "Dockerfile").write_text("FROM python:3.12\n")
+        edited = runner.invoke(app, ["init", "--mode", "dev", "--check"])
+        assert edited.exit_code == 1
+        assert "re-run with --force (without --check) to overwrite them" in edited.stdout
+        assert "Re-run without --check to update" not in edited.stdout
+        forced = runner.invoke(app, ["init", "--mode", "dev", "--check", "--force"])
+        assert "Re-run without --check to update." in forced.stdout
+    finally:
+        os.chdir(old_cwd)